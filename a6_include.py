@@ -5,9 +5,15 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+import contextlib
+import functools
+import gc
+from bisect import bisect_left
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
+
 class DynamicArrayException(Exception):
     pass
 
@@ -19,6 +25,8 @@ class DynamicArray:
     append, pop, swap, get_at_index, set_at_index, length
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
@@ -96,6 +104,135 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+def hash_function_builtin(key: str) -> int:
+    """
+    Hash function backed by Python's builtin hash (SipHash-1-3 for str).
+    Runs in C, and CPython caches the hash inside each str object,
+    so repeated lookups with the same key object never rehash it.
+    """
+    return hash(key)
+
+
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+MASK_64 = 0xffffffffffffffff
+
+
+def hash_function_fnv1a(key: str) -> int:
+    """64-bit FNV-1a over the UTF-8 bytes of key. Deterministic across processes."""
+    hash = FNV_OFFSET_BASIS
+    for byte in key.encode():
+        hash = ((hash ^ byte) * FNV_PRIME) & MASK_64
+    return hash
+
+
+def _rotl(x: int, bits: int) -> int:
+    """Rotate a 64-bit integer left by bits."""
+    return ((x << bits) | (x >> (64 - bits))) & MASK_64
+
+
+def _sipround(v0: int, v1: int, v2: int, v3: int) -> tuple:
+    """One SipRound over the four 64-bit state words."""
+    v0 = (v0 + v1) & MASK_64
+    v1 = _rotl(v1, 13) ^ v0
+    v0 = _rotl(v0, 32)
+    v2 = (v2 + v3) & MASK_64
+    v3 = _rotl(v3, 16) ^ v2
+    v0 = (v0 + v3) & MASK_64
+    v3 = _rotl(v3, 21) ^ v0
+    v2 = (v2 + v1) & MASK_64
+    v1 = _rotl(v1, 17) ^ v2
+    v2 = _rotl(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """SipHash-2-4 of data under the 128-bit key (k0, k1), as a 64-bit integer."""
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+
+    # full 8-byte words, then the tail padded with the message length in the top byte
+    length = len(data)
+    tail = length - length % 8
+    words = [int.from_bytes(data[i:i + 8], 'little') for i in range(0, tail, 8)]
+    words.append(((length & 0xff) << 56) | int.from_bytes(data[tail:], 'little'))
+
+    for m in words:
+        v3 ^= m
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0 ^= m
+
+    v2 ^= 0xff
+    for _ in range(4):
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def make_siphash(seed: int = 0) -> callable:
+    """
+    Return a SipHash-2-4 hash function for str keys, keyed by a 128-bit seed.
+    Maps seeded with a secret are resistant to crafted colliding key sets,
+    and different seeds give independent hash functions.
+    """
+    k0, k1 = seed & MASK_64, (seed >> 64) & MASK_64
+
+    def hash_function_siphash(key: str) -> int:
+        return siphash24(k0, k1, key.encode())
+
+    return hash_function_siphash
+
+
+def cached_hash_function(function: callable, maxsize: int = 1 << 16) -> callable:
+    """
+    Wrap a pure-Python hash function in an LRU cache, so that hot keys are only hashed once.
+    Worth it for hash_function_fnv1a / make_siphash on skewed workloads;
+    hash_function_builtin is already cached by the str object itself.
+    """
+    return functools.lru_cache(maxsize=maxsize)(function)
+
+
+def as_list(items) -> list:
+    """
+    Return items (a DynamicArray, list, or any other iterable) as a plain list.
+    Lists and DynamicArrays are returned without copying, so the result must not be modified.
+    """
+    if isinstance(items, DynamicArray):
+        return items._data
+    if isinstance(items, list):
+        return items
+    return list(items)
+
+
+def hash_keys(keys, function: callable = hash_function_builtin) -> list:
+    """
+    Hash a whole batch of keys (any iterable: list, DynamicArray, NumPy array of str)
+    in one call and return the list of hash values.
+    The loop runs inside map(), so builtin-backed hashing never enters the interpreter per key.
+    """
+    return list(map(function, as_list(keys)))
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector for the duration of the with block, for bulk work that
+    allocates millions of objects in one burst: each allocation threshold crossed would otherwise
+    start a collection, and the older generations make them full passes over the whole heap.
+    Reference cycles created in the block are only collected once the collector runs again.
+    The collector is re-enabled afterwards only if it was enabled before.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +240,18 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # no per-instance __dict__: maps hold millions of nodes
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        hash is the full (un-reduced) hash of key, kept so it never has to be recomputed.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +263,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -144,6 +290,9 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    # no per-instance __dict__: the SC map holds one list per bucket
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,20 +317,30 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash_value: int = None) -> None:
+        """Insert new node at front of the list, storing the key's hash if given."""
+        self._head = SLNode(key, value, self._head, hash_value)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """
+        Link an existing node in at the front of the list.
+        Used when rehashing so nodes are moved rather than reallocated.
+        """
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash_value: int = None) -> bool:
         """
         Remove first node with matching key.
+        If the key's hash is given, nodes with a different stored hash are skipped without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash_value is None or node.hash == hash_value) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,11 +351,21 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash_value: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match
+        If the key's hash is given, nodes with a different stored hash are skipped without comparing keys.
+        """
         node = self._head
+        if hash_value is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
+
         while node:
-            if node.key == key:
+            if node.hash == hash_value and node.key == key:
                 return node
             node = node.next
         return node
@@ -206,14 +375,167 @@ class LinkedList:
         return self._size
 
 
+# a CompactBucket longer than this switches to sorted (tree-bin) mode,
+# and one that shrinks below UNTREEIFY_THRESHOLD switches back
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
+
+
+class CompactBucket:
+    """
+    Hash map bucket with the same interface as LinkedList (insert, insert_node, remove, contains,
+    length, iterator), backed by Python lists instead of a chain of nodes.
+    While short, it keeps each node's hash in a parallel list, so contains/remove find candidates with
+    list.index in C instead of following next pointers. Past TREEIFY_THRESHOLD nodes it keeps them
+    sorted by key instead, with lookups by binary search, so that keys sharing one hash (e.g. anagrams
+    under hash_function_1) cost O(log n) rather than O(n). Keys must be orderable (str) in that mode.
+    """
+
+    # _keys is None in list mode; in sorted mode it holds the keys in order, _nodes follows the same
+    # order and _hashes is None. Empty buckets share one empty tuple until their first insert.
+    __slots__ = ('_hashes', '_nodes', '_keys')
+
+    def __init__(self) -> None:
+        """Initialize new, empty bucket in list mode."""
+        self._hashes = ()
+        self._nodes = ()
+        self._keys = None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'CB [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the bucket's nodes."""
+        return iter(self._nodes)
+
+    def insert(self, key: str, value: object, hash_value: int = None) -> None:
+        """Insert new node, storing the key's hash if given."""
+        self.insert_node(SLNode(key, value, None, hash_value))
+
+    def insert_node(self, node: SLNode) -> None:
+        """
+        Add an existing node (whose key is not in the bucket) to the bucket.
+        Used when rehashing so nodes are moved rather than reallocated.
+        """
+        node.next = None
+        if self._keys is not None:
+            idx = bisect_left(self._keys, node.key)
+            self._keys.insert(idx, node.key)
+            self._nodes.insert(idx, node)
+            return
+
+        if not self._nodes:
+            self._hashes = []
+            self._nodes = []
+        self._hashes.append(node.hash)
+        self._nodes.append(node)
+        if len(self._nodes) > TREEIFY_THRESHOLD:
+            self._treeify()
+
+    def _index(self, key: str, hash_value: int) -> int:
+        """
+        Return the index of the node with matching key, or -1 if no match.
+        In list mode, only nodes whose stored hash equals hash_value have their keys compared
+        (every node, if hash_value is None).
+        """
+        nodes = self._nodes
+        if self._keys is not None:
+            idx = bisect_left(self._keys, key)
+            if idx < len(nodes) and self._keys[idx] == key:
+                return idx
+            return -1
+
+        hashes = self._hashes
+        if hash_value is None:
+            for idx in range(len(nodes)):
+                if nodes[idx].key == key:
+                    return idx
+            return -1
+
+        if hash_value not in hashes:
+            return -1
+        for idx in range(hashes.index(hash_value), len(nodes)):
+            if hashes[idx] == hash_value and nodes[idx].key == key:
+                return idx
+        return -1
+
+    def remove(self, key: str, hash_value: int = None) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        hashes = self._hashes
+        if hashes is not None and hash_value is not None:
+            # list mode fast path: the first node with the same hash is almost always the one
+            if hash_value not in hashes:
+                return False
+            idx = hashes.index(hash_value)
+            if self._nodes[idx].key != key:
+                idx = self._index(key, hash_value)
+        else:
+            idx = self._index(key, hash_value)
+        if idx < 0:
+            return False
+
+        self._nodes.pop(idx)
+        if self._keys is None:
+            self._hashes.pop(idx)
+        else:
+            self._keys.pop(idx)
+            if len(self._nodes) < UNTREEIFY_THRESHOLD:
+                self._untreeify()
+        return True
+
+    def contains(self, key: str, hash_value: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match
+        """
+        hashes = self._hashes
+        if hashes is not None and hash_value is not None:
+            # list mode fast path, as in remove
+            if hash_value not in hashes:
+                return None
+            node = self._nodes[0] if hashes[0] == hash_value else self._nodes[hashes.index(hash_value)]
+            if node.key == key:
+                return node
+
+        idx = self._index(key, hash_value)
+        if idx < 0:
+            return None
+        return self._nodes[idx]
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+    def _treeify(self) -> None:
+        """Switch to sorted mode: order the nodes by key and drop the hash list."""
+        self._nodes.sort(key=lambda node: node.key)
+        self._keys = [node.key for node in self._nodes]
+        self._hashes = None
+
+    def _untreeify(self) -> None:
+        """Switch back to list mode, rebuilding the hash list."""
+        self._hashes = [node.hash for node in self._nodes]
+        self._keys = None
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # no per-instance __dict__: the OA map holds one entry per live slot
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        hash is the full (un-reduced) hash of key, kept so it never has to be recomputed.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -221,3 +543,172 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+class RobinHoodEntry(HashEntry):
+
+    __slots__ = ('distance',)
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for a Robin Hood probed hash map.
+        distance is the number of slots between the entry and its home bucket (hash % capacity).
+        """
+        super().__init__(key, value, hash)
+        self.distance = 0
+
+
+class CuckooEntry(HashEntry):
+
+    __slots__ = ('hash2',)
+
+    def __init__(self, key: str, value: object, hash: int = None, hash2: int = None) -> None:
+        """
+        Initialize an entry for a cuckoo hash map.
+        hash2 is the key's hash under the map's second hash function, kept so that evicting
+        the entry to its other bucket never has to rehash the key.
+        """
+        super().__init__(key, value, hash)
+        self.hash2 = hash2
+
+
+# ---------- Views over either HashMap (keys / values / items)  ---------- #
+
+class MapView:
+    """
+    Live view of a hash map, as returned by its keys / values / items methods.
+    Every iteration gets its own generator over the map's table (see the map's _iter_entries),
+    so nested or interleaved iterations never share a cursor, and nothing is copied.
+    An iterator raises RuntimeError if an entry is added or removed, or the table is resized,
+    while it is in use. Changing the value of an existing key is allowed, but note that put checks
+    the load factor before it looks the key up, so even an overwrite can start a resize.
+    """
+
+    __slots__ = ('_map',)
+
+    def __init__(self, hash_map) -> None:
+        """Initialize the view over hash_map."""
+        self._map = hash_map
+
+    def __len__(self) -> int:
+        """Return size of the map."""
+        return self._map.get_size()
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return type(self).__name__ + '([' + ', '.join(repr(item) for item in self) + '])'
+
+
+class KeysView(MapView):
+
+    __slots__ = ()
+
+    def __iter__(self):
+        """Return an iterator over the keys."""
+        return (entry.key for entry in self._map._iter_entries())
+
+    def __contains__(self, key: str) -> bool:
+        """Look key up in the map."""
+        return self._map.contains_key(key)
+
+
+class ValuesView(MapView):
+
+    __slots__ = ()
+
+    def __iter__(self):
+        """Return an iterator over the values."""
+        return (entry.value for entry in self._map._iter_entries())
+
+
+class ItemsView(MapView):
+
+    __slots__ = ()
+
+    def __iter__(self):
+        """Return an iterator over the (key, value) tuples."""
+        return ((entry.key, entry.value) for entry in self._map._iter_entries())
+
+    def __contains__(self, item: tuple) -> bool:
+        """Look the key of item up in the map and compare its value."""
+        key, value = item
+        return self._map.contains_key(key) and self._map.get(key) == value
+
+
+# ---------- Sampled operation stats of either HashMap  ---------- #
+
+class OperationStats:
+    """
+    Counters behind a hash map's stats(). Every single-key operation is counted, and one in every
+    sample of them is measured: the map walks its probe sequence (or chain) for the key once more,
+    and records its length and whether the key was present. Resizes are counted and timed.
+    """
+
+    # histogram buckets per operation: lengths 0 .. HISTOGRAM_SIZE - 2, then one for anything longer
+    HISTOGRAM_SIZE = 32
+
+    OPERATIONS = ('get', 'put', 'remove')
+
+    __slots__ = ('sample', 'countdown', 'measured', 'hits', 'lengths', 'maxima', 'histograms', 'resizes',
+                 'resize_seconds')
+
+    def __init__(self, sample: int) -> None:
+        """Initialize counters that measure one in every sample operations."""
+        self.sample = sample
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        # operations left until the next measured one (counted down by the map itself, to save a call)
+        self.countdown = self.sample
+        self.measured = dict.fromkeys(self.OPERATIONS, 0)
+        self.hits = dict.fromkeys(self.OPERATIONS, 0)
+        self.lengths = dict.fromkeys(self.OPERATIONS, 0)
+        self.maxima = dict.fromkeys(self.OPERATIONS, 0)
+        self.histograms = {operation: [0] * self.HISTOGRAM_SIZE for operation in self.OPERATIONS}
+        self.resizes = 0
+        self.resize_seconds = 0.0
+
+    def record(self, operation: str, length: int, found: bool) -> None:
+        """Record a measured operation: length buckets examined, and whether the key was present."""
+        self.measured[operation] += 1
+        if found:
+            self.hits[operation] += 1
+        self.lengths[operation] += length
+        if length > self.maxima[operation]:
+            self.maxima[operation] = length
+        self.histograms[operation][min(length, self.HISTOGRAM_SIZE - 1)] += 1
+
+    def record_resize(self, seconds: float) -> None:
+        """Count a resize that took seconds (0 when it is only started, for an incremental resize)."""
+        self.resizes += 1
+        self.resize_seconds += seconds
+
+    def as_dict(self, unit: str) -> dict:
+        """
+        Return the counters as a dict of plain values. unit names the measured length
+        ('probes' or 'chain_length'). Histograms are lists indexed by length,
+        trimmed after the last non-zero count; the last of HISTOGRAM_SIZE entries counts longer lengths too.
+        """
+        measured_total = sum(self.measured.values())
+        out = {
+            'sample': self.sample,
+            'operations': measured_total * self.sample + self.sample - self.countdown,
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+        }
+        for operation in self.OPERATIONS:
+            measured = self.measured[operation]
+            hits = self.hits[operation]
+            histogram = self.histograms[operation]
+            last = max((length for length in range(len(histogram)) if histogram[length]), default=-1)
+            out[operation] = {
+                'measured': measured,
+                'hits': hits,
+                'misses': measured - hits,
+                'hit_ratio': hits / measured if measured else None,
+                'mean_' + unit: self.lengths[operation] / measured if measured else None,
+                'max_' + unit: self.maxima[operation],
+                unit + '_histogram': histogram[:last + 1],
+            }
+        return out
@@ -0,0 +1,85 @@
+# Description: Event-loop lag while a map grows from empty to n keys inside an asyncio service.
+#              A ticker task asks to wake up every millisecond and records how late each wake-up
+#              is, while a writer task fills the map (yielding every chunk of puts). Compared:
+#              the plain map (stop-the-world resize inside one put), the map in incremental mode
+#              called directly, and AsyncHashMap, which finishes resizes in a background task.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_async_lag [n]
+
+import asyncio
+import gc
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from hash_map_async import AsyncHashMap
+
+TICK = 0.001
+CHUNK = 256
+
+
+async def ticker(lags: list, done: list) -> None:
+    """Sleeps TICK at a time until done, recording how late each wake-up was, in ms."""
+    loop = asyncio.get_running_loop()
+    while not done:
+        expected = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def fill_direct(m, keys: list) -> None:
+    """Calls m.put directly, yielding every CHUNK puts."""
+    for start in range(0, len(keys), CHUNK):
+        for key in keys[start:start + CHUNK]:
+            m.put(key, 0)
+        await asyncio.sleep(0)
+
+
+async def fill_async(amap: AsyncHashMap, keys: list) -> None:
+    """Awaits amap.put, yielding every CHUNK puts, then waits for the last resize."""
+    for start in range(0, len(keys), CHUNK):
+        for key in keys[start:start + CHUNK]:
+            await amap.put(key, 0)
+        await asyncio.sleep(0)
+    await amap.wait_resized()
+
+
+async def measure(fill, target, keys: list) -> tuple:
+    """Runs fill(target, keys) next to the ticker; returns (fill seconds, sorted lags in ms)."""
+    lags, done = [], []
+    tick_task = asyncio.create_task(ticker(lags, done))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await fill(target, keys)
+    elapsed = time.perf_counter() - start
+    done.append(True)
+    await tick_task
+    return elapsed, sorted(lags)
+
+
+def main(n: int) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    cases = (
+        ('SC plain', fill_direct, lambda: hash_map_sc.HashMap(11, hash)),
+        ('SC incremental', fill_direct, lambda: hash_map_sc.HashMap(11, hash, incremental=True)),
+        ('SC AsyncHashMap', fill_async, lambda: AsyncHashMap(hash_map_sc.HashMap(11, hash, incremental=True))),
+        ('OA plain', fill_direct, lambda: hash_map_oa.HashMap(11, hash)),
+        ('OA incremental', fill_direct, lambda: hash_map_oa.HashMap(11, hash, incremental=True)),
+        ('OA AsyncHashMap', fill_async, lambda: AsyncHashMap(hash_map_oa.HashMap(11, hash, incremental=True))),
+    )
+
+    print(f"{n} puts, ticker every {TICK * 1000:g} ms")
+    print(f"{'map':<18}{'fill s':>8}{'ticks':>7}{'p50 lag ms':>12}{'p99 lag ms':>12}{'max lag ms':>12}")
+    for name, fill, factory in cases:
+        gc.collect()
+        gc.disable()
+        elapsed, lags = asyncio.run(measure(fill, factory(), keys))
+        gc.enable()
+        print(f"{name:<18}{elapsed:>8.2f}{len(lags):>7}{lags[len(lags) // 2]:>12.2f}"
+              f"{lags[min(len(lags) - 1, int(len(lags) * 0.99))]:>12.2f}{lags[-1]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,59 @@
+# Description: Batch APIs (put_many / get_many / contains_many / remove_many)
+#              against the equivalent loops of single-key calls, for both HashMaps.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_batch [n]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def single(m, pairs: list, keys: list) -> tuple:
+    def put_all():
+        for key, value in pairs:
+            m.put(key, value)
+
+    def get_all():
+        for key in keys:
+            m.get(key)
+
+    def contains_all():
+        for key in keys:
+            m.contains_key(key)
+
+    def remove_all():
+        for key in keys:
+            m.remove(key)
+
+    return timed(put_all), timed(get_all), timed(contains_all), timed(remove_all)
+
+
+def batch(m, pairs: list, keys: list) -> tuple:
+    pairs, keys = DynamicArray(pairs), DynamicArray(keys)
+    return (timed(m.put_many, pairs), timed(m.get_many, keys),
+            timed(m.contains_many, keys), timed(m.remove_many, keys))
+
+
+def main(n: int) -> None:
+    pairs = [('key' + str(i), i) for i in range(n)]
+    keys = [key for key, _ in pairs]
+
+    print(f"{'map':<4}{'api':<8}{'put (s)':>10}{'get (s)':>10}{'contains (s)':>14}{'remove (s)':>12}")
+    for name, map_class in (('SC', hash_map_sc.HashMap), ('OA', hash_map_oa.HashMap)):
+        for api, run in (('single', single), ('batch', batch)):
+            times = run(map_class(11, hash), pairs, keys)
+            print(f"{name:<4}{api:<8}" + ''.join(f"{t:>{w}.3f}" for t, w in zip(times, (10, 10, 14, 12))))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
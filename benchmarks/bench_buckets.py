@@ -0,0 +1,58 @@
+# Description: Separate chaining map with LinkedList buckets against CompactBucket buckets
+#              (parallel lists, sorted once a chain is long). Worst case: anagram keys under
+#              hash_function_1, which all share one hash and so one chain. Typical case:
+#              distinct keys under the builtin hash.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_buckets [anagrams] [n]
+
+import itertools
+import sys
+import time
+
+import hash_map_sc
+from a6_include import hash_function_1
+
+
+def run(keys: list, misses: list, function, buckets: str) -> tuple:
+    """Return the seconds taken to put, get, miss and remove keys."""
+    m = hash_map_sc.HashMap(11, function, buckets=buckets)
+    times = []
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    times.append(time.perf_counter() - start)
+
+    for batch in (keys, misses):
+        start = time.perf_counter()
+        for key in batch:
+            m.get(key)
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        m.remove(key)
+    times.append(time.perf_counter() - start)
+    return times
+
+
+def main(anagrams: int, n: int) -> None:
+    # permutations of one word: same letters, so hash_function_1 (sum of ords) gives them all the same hash
+    words = [''.join(p) for p in itertools.islice(itertools.permutations('abcdefghij'), 2 * anagrams)]
+    cases = (
+        ('anagrams, hash_function_1', words[:anagrams], words[anagrams:], hash_function_1),
+        ('distinct keys, builtin hash', ['key' + str(i) for i in range(n)],
+         ['miss' + str(i) for i in range(n)], hash),
+    )
+
+    for label, keys, misses, function in cases:
+        print(f"{label} ({len(keys)} keys)")
+        print(f"  {'buckets':<13}{'put (s)':>9}{'get (s)':>9}{'miss (s)':>10}{'remove (s)':>12}")
+        for buckets in ('linked_list', 'compact'):
+            times = run(keys, misses, function, buckets)
+            print(f"  {buckets:<13}" + ''.join(f"{t:>{w}.3f}" for t, w in zip(times, (9, 9, 10, 12))))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 6)
@@ -0,0 +1,49 @@
+# Description: Per-entry memory and lookup throughput of the compact, array-backed
+#              open addressing map against the HashEntry-based one.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_compact_oa [n]
+
+import sys
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_oa_compact
+
+
+def build(map_class, keys: list, values: list):
+    """Return a map holding keys/values, and the bytes traced while building it."""
+    tracemalloc.start()
+    m = map_class(11, hash)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return m, current
+
+
+def lookups_per_second(m, keys: list, misses: list) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    for key in misses:
+        m.get(key)
+    return (len(keys) + len(misses)) / (time.perf_counter() - start)
+
+
+def main(n: int) -> None:
+    # keys and values exist before tracing starts, so only the map's own storage is counted
+    keys = ['key' + str(i) for i in range(n)]
+    values = list(range(n))
+    misses = ['miss' + str(i) for i in range(n)]
+
+    print(f"{'layout':<12}{'capacity':>10}{'bytes/entry':>14}{'lookups/s':>14}")
+    for name, map_class in (('HashEntry', hash_map_oa.HashMap), ('compact', hash_map_oa_compact.HashMap)):
+        m, traced = build(map_class, keys, values)
+        rate = lookups_per_second(m, keys, misses)
+        print(f"{name:<12}{m.get_capacity():>10}{traced / n:>14.1f}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
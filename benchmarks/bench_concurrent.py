@@ -0,0 +1,145 @@
+# Description: Multi-threaded stress test and throughput of the lock-striped concurrent map
+#              against hash_map_sc.HashMap behind a single global lock. The stress phase checks
+#              that concurrent increments are never lost and that lock-free readers never miss
+#              a key while writers force resizes. The throughput phase runs read-heavy and
+#              write-heavy mixes on 1 to 8 threads. Run it under both a regular (GIL) build
+#              and a free-threaded build (e.g. python3.13t): only the latter lets stripes
+#              actually run in parallel, the GIL build shows the locking overhead alone.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_concurrent [ops_per_thread]
+
+import random
+import sys
+import threading
+import time
+
+import hash_map_concurrent
+import hash_map_sc
+
+THREADS = (1, 2, 4, 8)
+KEYS = 10000
+
+
+class GlobalLockMap:
+    """hash_map_sc.HashMap with every operation behind one lock: the baseline striping is measured against."""
+
+    def __init__(self) -> None:
+        self._map = hash_map_sc.HashMap(11, hash)
+        self._lock = threading.Lock()
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key):
+        with self._lock:
+            return self._map.get(key)
+
+    def remove(self, key) -> None:
+        with self._lock:
+            self._map.remove(key)
+
+    def increment(self, key, delta: int = 1) -> int:
+        with self._lock:
+            return self._map.increment(key, delta)
+
+
+def run_threads(count: int, target) -> float:
+    """Runs target(thread_index) on count threads started together; returns the wall time in seconds."""
+    barrier = threading.Barrier(count + 1)
+
+    def worker(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def stress(ops: int) -> None:
+    """Fails loudly if an increment is lost or a reader misses a key that was present throughout."""
+    threads = 8
+
+    m = hash_map_concurrent.HashMap(11, hash, stripes=4)
+    run_threads(threads, lambda index: [m.increment('key' + str(i % 97)) for i in range(ops)])
+    total = sum(value for _, value in m.get_keys_and_values()._data)
+    assert total == threads * ops, (total, threads * ops)
+    assert m.get_size() == 97
+
+    # half the threads insert fresh keys (forcing resizes), half read the preloaded ones
+    m = hash_map_concurrent.HashMap(11, hash)
+    for i in range(1000):
+        m.put('stable' + str(i), i)
+    misses = []
+
+    def mixed(index):
+        if index % 2:
+            for i in range(ops):
+                m.put('fresh' + str(index) + '_' + str(i), i)
+        else:
+            for i in range(ops):
+                if m.get('stable' + str(i % 1000)) != i % 1000:
+                    misses.append(i)
+
+    run_threads(threads, mixed)
+    assert not misses, len(misses)
+    assert m.get_size() == 1000 + threads // 2 * ops, m.get_size()
+    print(f"stress: {threads} threads x {ops} ops, no lost increments, no missed reads "
+          f"({m.get_capacity()} buckets after resizes)")
+
+
+def throughput(factory, threads: int, ops: int, read_share: float) -> float:
+    """Operations per second of threads threads each running ops random get / put / remove calls."""
+    m = factory()
+    keys = ['key' + str(i) for i in range(KEYS)]
+    for i, key in enumerate(keys):
+        m.put(key, i)
+
+    plans = []
+    for index in range(threads):
+        rng = random.Random(index)
+        plan = []
+        for _ in range(ops):
+            roll = rng.random()
+            op = 0 if roll < read_share else (1 if roll < (1 + read_share) / 2 else 2)
+            plan.append((op, keys[rng.randrange(KEYS)]))
+        plans.append(plan)
+
+    def work(index):
+        get, put, remove = m.get, m.put, m.remove
+        for op, key in plans[index]:
+            if op == 0:
+                get(key)
+            elif op == 1:
+                put(key, 0)
+            else:
+                remove(key)
+
+    return threads * ops / run_threads(threads, work)
+
+
+def main(ops: int) -> None:
+    gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled (free-threaded)'}")
+    stress(ops)
+
+    maps = (('global lock', GlobalLockMap),
+            ('striped x16', lambda: hash_map_concurrent.HashMap(11, hash)),
+            ('striped x64', lambda: hash_map_concurrent.HashMap(11, hash, stripes=64)))
+    for label, read_share in (('90% get', 0.9), ('50% get', 0.5)):
+        print(f"\n{label}, ops/s by thread count")
+        print(f"{'map':<14}" + ''.join(f"{str(t) + ' thr':>12}" for t in THREADS))
+        for name, factory in maps:
+            row = [throughput(factory, threads, ops, read_share) for threads in THREADS]
+            print(f"{name:<14}" + ''.join(f"{rate:>12,.0f}" for rate in row))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
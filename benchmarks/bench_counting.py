@@ -0,0 +1,49 @@
+# Description: Counting the elements of a large DynamicArray with both HashMaps:
+#              the contains_key / get / put pattern (three hashes and probes per element)
+#              against increment (one of each), which find_mode now uses.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_counting [n] [distinct]
+
+import random
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray
+
+
+def count_triple(m, da: DynamicArray) -> None:
+    for idx in range(da.length()):
+        key = da[idx]
+        if m.contains_key(key):
+            m.put(key, m.get(key) + 1)
+        else:
+            m.put(key, 1)
+
+
+def count_increment(m, da: DynamicArray) -> None:
+    for idx in range(da.length()):
+        m.increment(da[idx])
+
+
+def main(n: int, distinct: int) -> None:
+    words = ['word' + str(i) for i in range(distinct)]
+    rng = random.Random(0)
+    da = DynamicArray(rng.choices(words, k=n))
+
+    print(f"{n:,} elements, {distinct:,} distinct")
+    print(f"{'map':<4}{'pattern':<20}{'seconds':>9}{'elements/s':>14}")
+    for name, map_class in (('SC', hash_map_sc.HashMap), ('OA', hash_map_oa.HashMap)):
+        for pattern, count in (('contains/get/put', count_triple), ('increment', count_increment)):
+            m = map_class(11, hash)
+            start = time.perf_counter()
+            count(m, da)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<4}{pattern:<20}{elapsed:>9.2f}{n / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
@@ -0,0 +1,89 @@
+# Description: Worst-case lookup latency of the cuckoo map against the open addressing map
+#              (quadratic and Robin Hood probing): the most buckets any single hit / miss
+#              examines, and per-lookup latency percentiles, with every map filled to the
+#              same number of keys. The cuckoo map is run with its default SipHash second
+#              hash and with a C-backed seeded builtin hash.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_cuckoo [n]
+
+import gc
+import sys
+import time
+
+import hash_map_cuckoo
+import hash_map_oa
+from benchmarks.bench_robin_hood import (hit_probes_quadratic, hit_probes_robin_hood,
+                                         miss_probes_quadratic, miss_probes_robin_hood)
+
+
+def seeded_builtin_hash(key: str) -> int:
+    """A second hash for the cuckoo map that runs in C: builtin hash of the key paired with a seed."""
+    return hash((0x5eed, key))
+
+
+def hit_probes_cuckoo(m, key: str) -> int:
+    """Buckets examined by a successful lookup: 1 or 2, plus the stash scanned for a stashed key."""
+    capacity = m.get_capacity()
+    entry = m._buckets[hash(key) % capacity]
+    if entry is not None and entry.key == key:
+        return 1
+    if m._buckets[m._second_hash_function(key) % capacity].key == key:
+        return 2
+    return 2 + m.get_stash_size()
+
+
+def miss_probes_cuckoo(m, key: str) -> int:
+    """A failed lookup always examines both buckets and the whole stash."""
+    return 2 + m.get_stash_size()
+
+
+MAPS = (
+    ('OA quadratic', lambda: hash_map_oa.HashMap(11, hash),
+     hit_probes_quadratic, miss_probes_quadratic),
+    ('OA robin_hood 0.9', lambda: hash_map_oa.HashMap(11, hash, probing='robin_hood', max_load=0.9),
+     hit_probes_robin_hood, miss_probes_robin_hood),
+    ('cuckoo siphash', lambda: hash_map_cuckoo.HashMap(11, hash),
+     hit_probes_cuckoo, miss_probes_cuckoo),
+    ('cuckoo builtin', lambda: hash_map_cuckoo.HashMap(11, hash, second_function=seeded_builtin_hash),
+     hit_probes_cuckoo, miss_probes_cuckoo),
+)
+
+
+def latencies(m, keys: list) -> list:
+    """Latency of m.get for every key, in microseconds."""
+    clock = time.perf_counter_ns
+    result = []
+    for key in keys:
+        start = clock()
+        m.get(key)
+        result.append((clock() - start) / 1000)
+    return sorted(result)
+
+
+def main(n: int) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    misses = ['miss' + str(i) for i in range(n)]
+
+    # a GC pass during a single get would dominate the tail percentiles
+    gc.disable()
+    print(f"{'map':<19}{'load':>6}{'max hit':>9}{'max miss':>10}"
+          f"{'p50 us':>9}{'p99 us':>9}{'p99.9 us':>10}{'max us':>9}")
+    for name, factory, hit_probes, miss_probes in MAPS:
+        m = factory()
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+        max_hit = max(hit_probes(m, key) for key in keys)
+        max_miss = max(miss_probes(m, key) for key in misses)
+        ordered = latencies(m, keys + misses)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        print(f"{name:<19}{m.table_load():>6.2f}{max_hit:>9}{max_miss:>10}"
+              f"{pct(0.5):>9.2f}{pct(0.99):>9.2f}{pct(0.999):>10.2f}{ordered[-1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
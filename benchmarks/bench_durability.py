@@ -0,0 +1,93 @@
+# Description: Throughput of DurableHashMap under each durability setting, vs. the open addressing
+#              map with no log: n puts of new keys, then n / 4 overwrites and n / 4 removes.
+#              'always' fsyncs each operation, so it runs a smaller share of the workload and its
+#              rate is extrapolated. Also reports the log size, the time to recover the map from
+#              the log alone, and a compaction: the pause seen by the caller (copying the entries
+#              and starting a new log) and the background time to write the snapshot, and the
+#              recovery time from that snapshot. Results depend on how fast the disk under
+#              directory (default: a temporary directory) makes an fsync.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_durability [n] [directory]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import hash_map_oa
+from a6_include import hash_function_fnv1a
+from hash_map_durable import DurableHashMap
+
+ALWAYS_SHARE = 50
+
+
+def workload(m, n: int) -> int:
+    """Runs the put / overwrite / remove workload on m; returns the number of operations."""
+    for i in range(n):
+        m.put('key' + str(i), {'id': i, 'name': 'name' + str(i)})
+    for i in range(0, n // 2, 2):
+        m.put('key' + str(i), {'id': -i})
+        m.remove('key' + str(i + 1))
+    return n + n // 2
+
+
+def open_map(path: str, **kwargs) -> DurableHashMap:
+    """Opens the durable map at path with compaction left to the benchmark."""
+    return DurableHashMap(path, 11, hash_function_fnv1a, compact_bytes=None, **kwargs)
+
+
+def main(n: int, directory: str = None) -> None:
+    root = tempfile.mkdtemp(dir=directory)
+    cases = (('no log', None),
+             ('os', {'sync': 'os'}),
+             ('group 100 ms', {'sync': 'group', 'flush_interval': 0.1}),
+             ('group 10 ms', {'sync': 'group', 'flush_interval': 0.01}),
+             ('group 1 ms', {'sync': 'group', 'flush_interval': 0.001}),
+             ('always', {'sync': 'always'}))
+
+    print(f"{n} puts + {n // 4} overwrites + {n // 4} removes, logs in {root}")
+    print(f"{'sync':<14}{'ops/s':>10}{'log MB':>8}{'recover s':>11}")
+    for name, kwargs in cases:
+        size = max(4, n // ALWAYS_SHARE) if name == 'always' else n
+        path = os.path.join(root, name.replace(' ', '_'))
+        start = time.perf_counter()
+        if kwargs is None:
+            ops = workload(hash_map_oa.HashMap(11, hash_function_fnv1a), size)
+        else:
+            m = open_map(path, **kwargs)
+            ops = workload(m, size)
+            m.flush()
+        elapsed = time.perf_counter() - start
+        if kwargs is None:
+            print(f"{name:<14}{ops / elapsed:>10.0f}")
+            continue
+        m.close()
+        log_bytes = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+        start = time.perf_counter()
+        open_map(path, sync='os').close()
+        recover_time = time.perf_counter() - start
+        print(f"{name:<14}{ops / elapsed:>10.0f}{log_bytes / 2 ** 20:>8.1f}{recover_time:>11.2f}"
+              + (f"  ({size} puts, extrapolated)" if size != n else ""))
+
+    path = os.path.join(root, 'os')
+    m = open_map(path, sync='os')
+    start = time.perf_counter()
+    m.compact()
+    pause = time.perf_counter() - start
+    m._compaction.join()
+    background = time.perf_counter() - start
+    m.close()
+    start = time.perf_counter()
+    open_map(path, sync='os').close()
+    recover_time = time.perf_counter() - start
+    print(f"\ncompaction of {m.get_size()} entries: caller pause {pause:.3f} s, snapshot written after "
+          f"{background:.2f} s; recovery from the snapshot {recover_time:.2f} s")
+
+    shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,67 @@
+# Description: Distribution, collision and speed comparison of the hash functions in a6_include.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_hash_functions [n]
+
+import itertools
+import sys
+import time
+
+from a6_include import (hash_function_1, hash_function_2, hash_function_builtin,
+                        hash_function_fnv1a, hash_keys, make_siphash)
+
+FUNCTIONS = (
+    ('hash_function_1', hash_function_1),
+    ('hash_function_2', hash_function_2),
+    ('builtin', hash_function_builtin),
+    ('fnv1a', hash_function_fnv1a),
+    ('siphash', make_siphash(0x5eed)),
+)
+
+# prime table size the keys are bucketed into (~ SC load factor 1)
+CAPACITY_FACTOR = 1
+
+
+def key_sets(n: int) -> dict:
+    """Sequential ids, anagram-heavy short keys, and long URL-like keys."""
+    anagrams = [''.join(p) for p in itertools.permutations('abcdefghij', 6)]
+    return {
+        'sequential': ['key' + str(i) for i in range(n)],
+        'anagrams': anagrams[:n],
+        'urls': [f'https://example.com/catalog/{i % 97}/item/{i}?session={i * 7919}' for i in range(n)],
+    }
+
+
+def next_prime(n: int) -> int:
+    n |= 1
+    while any(n % f == 0 for f in range(3, int(n ** 0.5) + 1, 2)):
+        n += 2
+    return n
+
+
+def measure(keys: list, function) -> tuple:
+    """Return (ns per key, distinct hash values, colliding keys, longest chain) for keys."""
+    start = time.perf_counter()
+    hashes = hash_keys(keys, function)
+    ns_per_key = (time.perf_counter() - start) * 1e9 / len(keys)
+
+    capacity = next_prime(len(keys) * CAPACITY_FACTOR)
+    chains = {}
+    for value in hashes:
+        index = value % capacity
+        chains[index] = chains.get(index, 0) + 1
+    distinct = len(set(hashes))
+    return ns_per_key, distinct, len(keys) - distinct, max(chains.values())
+
+
+def main(n: int) -> None:
+    for set_name, keys in key_sets(n).items():
+        print(f"\n{set_name} ({len(keys)} keys, {next_prime(len(keys) * CAPACITY_FACTOR)} buckets)")
+        print(f"{'function':<18}{'ns/key':>10}{'distinct':>10}{'collisions':>12}{'max chain':>11}")
+        for name, function in FUNCTIONS:
+            ns, distinct, collisions, longest = measure(keys, function)
+            print(f"{name:<18}{ns:>10.0f}{distinct:>10}{collisions:>12}{longest:>11}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,100 @@
+# Description: Cost of a health check that reads empty_buckets() on maps of growing capacity:
+#              the original O(capacity) scan over every bucket (reimplemented here) vs. the
+#              counters now kept up to date by put / remove / resize, and the stats() snapshot
+#              that carries the same occupancy figures. Also the share of a once-per-second
+#              health check in one CPU second, and a check of incremental maps caught mid-resize,
+#              which the counters answer without completing the migration.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_health_check [largest n]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_builtin
+
+
+def scan_sc(m) -> int:
+    """
+    The original separate chaining empty_buckets: checks the length of every LinkedList
+    (of the new table during an incremental resize, where a placeholder counts as empty).
+    """
+    count = 0
+    for idx in range(m._capacity):
+        if m._buckets[idx] is None or m._buckets[idx].length() == 0:
+            count += 1
+    return count
+
+
+def scan_oa(m) -> int:
+    """The original open addressing empty_buckets: checks every slot for None or a tombstone."""
+    count = 0
+    for idx in range(m._capacity):
+        if m._buckets[idx] is None or m._buckets[idx].is_tombstone:
+            count += 1
+    return count
+
+
+def per_call(function, m) -> float:
+    """Seconds per call of function(m), timed over enough calls to take about 0.2 s."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function(m)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.2:
+            return elapsed / calls
+        calls *= 10
+
+
+def mid_resize(module, n: int):
+    """Returns an incremental map holding n entries whose next put starts a resize, after that put."""
+    m = module.HashMap(11, hash_function_builtin, incremental=True)
+    m.reserve(n)
+    capacity = m.get_capacity()
+    i = 0
+    while m.get_capacity() == capacity:
+        m.put('key' + str(i), i)
+        i += 1
+    return m
+
+
+def main(largest: int) -> None:
+    # powers of ten from 10000 up to largest, and largest itself
+    sizes = []
+    n = 10000
+    while n < largest:
+        sizes.append(n)
+        n *= 10
+    sizes.append(largest)
+
+    print(f"{'map':<4}{'n':>10}{'capacity':>10}{'scan us':>12}{'counter us':>12}{'stats() us':>12}{'scan/s share':>14}")
+    for label, module, scan in (('SC', hash_map_sc, scan_sc), ('OA', hash_map_oa, scan_oa)):
+        for n in sizes:
+            m = module.HashMap(11, hash_function_builtin)
+            m.put_many([('key' + str(i), i) for i in range(n)])
+            # some churn, so the open addressing table holds tombstones
+            m.remove_many(['key' + str(i) for i in range(0, n, 10)])
+            assert scan(m) == m.empty_buckets()
+
+            scan_time = per_call(scan, m)
+            counter_time = per_call(module.HashMap.empty_buckets, m)
+            stats_time = per_call(module.HashMap.stats, m)
+            print(f"{label:<4}{n:>10}{m.get_capacity():>10}{scan_time * 1e6:>12.1f}{counter_time * 1e6:>12.2f}"
+                  f"{stats_time * 1e6:>12.2f}{scan_time:>13.2%}")
+
+    print("\nincremental maps mid-resize (the counters must not complete the migration)")
+    for label, module, scan in (('SC', hash_map_sc, scan_sc), ('OA', hash_map_oa, scan_oa)):
+        m = mid_resize(module, largest)
+        counter_time = per_call(module.HashMap.empty_buckets, m)
+        stats_time = per_call(module.HashMap.stats, m)
+        assert m.stats()['resizing'] and scan(m) == m.empty_buckets()
+        print(f"{label:<4}{m.get_size():>10}{m.get_capacity():>10}{'':>12}{counter_time * 1e6:>12.2f}"
+              f"{stats_time * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,90 @@
+# Description: Accuracy against memory of the streaming frequency estimators in heavy_hitters.py
+#              on a Zipf-distributed stream: Space-Saving at several capacities and Count-Min
+#              sketches at several error targets, next to exact counting in a HashMap.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_heavy_hitters [n] [distinct]
+
+import random
+import sys
+import time
+import tracemalloc
+
+import hash_map_sc
+from heavy_hitters import CountMinSketch, SpaceSaving
+
+
+def measure(build, items: list) -> tuple:
+    """
+    Return (structure, traced bytes, seconds) for a structure built by feeding items to build().
+    Timing and memory come from separate builds, since tracemalloc slows allocation down.
+    """
+    start = time.perf_counter()
+    build(items)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    structure = build(items)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, traced, elapsed
+
+
+def exact(items: list):
+    m = hash_map_sc.HashMap(11, hash)
+    for key in items:
+        m.increment(key)
+    return m
+
+
+def space_saving(capacity: int):
+    def build(items: list):
+        summary = SpaceSaving(capacity)
+        for key in items:
+            summary.add(key)
+        return summary
+    return build
+
+
+def count_min(epsilon: float):
+    def build(items: list):
+        sketch = CountMinSketch.from_error(epsilon, 0.01)
+        for key in items:
+            sketch.add(key)
+        return sketch
+    return build
+
+
+def main(n: int, distinct: int) -> None:
+    rng = random.Random(0)
+    words = ['user' + str(i) for i in range(distinct)]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(distinct)]
+    items = rng.choices(words, weights, k=n)
+
+    counts, traced, elapsed = measure(exact, items)
+    truth = sorted(counts.get_keys_and_values()._data, key=lambda pair: -pair[1])
+    true_top = {key for key, _ in truth[:10]}
+    print(f"{n:,} items, {distinct:,} distinct; true mode {truth[0][0]} x {truth[0][1]}")
+    print(f"{'estimator':<24}{'KB':>9}{'seconds':>9}  accuracy")
+    print(f"{'exact HashMap':<24}{traced / 1024:>9.0f}{elapsed:>9.2f}  exact")
+
+    for capacity in (10, 100, 1000, 10000):
+        summary, traced, elapsed = measure(space_saving(capacity), items)
+        top = summary.top(10)._data
+        recall = len(true_top & {key for key, _, _ in top}) / len(true_top)
+        mode_key, mode_count, mode_error = top[0]
+        print(f"{'space_saving k=' + str(capacity):<24}{traced / 1024:>9.0f}{elapsed:>9.2f}"
+              f"  mode {'ok' if mode_key == truth[0][0] else 'WRONG'} {mode_count} (+-{mode_error}),"
+              f" top-10 recall {recall:.0%}")
+
+    for epsilon in (0.01, 0.001, 0.0001):
+        sketch, traced, elapsed = measure(count_min(epsilon), items)
+        over = [sketch.estimate(key) - count for key, count in truth[:100]]
+        print(f"{'count_min eps=' + str(epsilon):<24}{traced / 1024:>9.0f}{elapsed:>9.2f}"
+              f"  top-100 overcount mean {sum(over) / len(over):.1f} max {max(over)}"
+              f" (bound {sketch.error_bound()})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
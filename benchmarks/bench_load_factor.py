@@ -0,0 +1,82 @@
+# Description: Memory / throughput tradeoff of the resize policy (max_load, growth_factor)
+#              for both HashMaps, and memory returned by shrinking (min_load) after mass deletion.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_load_factor [n]
+
+import sys
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_sc
+
+SWEEP = (
+    ('SC', hash_map_sc.HashMap, (0.5, 1.0, 2.0, 4.0)),
+    ('OA', hash_map_oa.HashMap, (0.25, 0.35, 0.5)),
+)
+GROWTH_FACTORS = (1.5, 2.0, 3.0)
+
+
+def fill(map_class, keys: list, **policy) -> tuple:
+    """
+    Return (map, traced bytes, put seconds) for a map filled with keys.
+    Timing and memory come from separate fills, since tracemalloc slows allocation down.
+    """
+    start = time.perf_counter()
+    m = map_class(11, hash, **policy)
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    traced_map = map_class(11, hash, **policy)
+    for i, key in enumerate(keys):
+        traced_map.put(key, i)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return m, traced, elapsed
+
+
+def sweep(n: int) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    misses = ['miss' + str(i) for i in range(n)]
+
+    print(f"{'map':<4}{'max_load':>9}{'growth':>8}{'capacity':>10}{'B/entry':>9}{'puts/s':>12}{'gets/s':>12}")
+    for name, map_class, max_loads in SWEEP:
+        for max_load in max_loads:
+            for growth_factor in GROWTH_FACTORS:
+                m, traced, put_time = fill(map_class, keys, max_load=max_load, growth_factor=growth_factor)
+                start = time.perf_counter()
+                for key in keys:
+                    m.get(key)
+                for key in misses:
+                    m.get(key)
+                get_rate = 2 * n / (time.perf_counter() - start)
+                print(f"{name:<4}{max_load:>9}{growth_factor:>8}{m.get_capacity():>10}{traced / n:>9.0f}"
+                      f"{n / put_time:>12,.0f}{get_rate:>12,.0f}")
+
+
+def shrink(n: int) -> None:
+    """Fill, delete 95% of the keys, and compare the memory still held with and without min_load."""
+    keys = ['key' + str(i) for i in range(n)]
+
+    print(f"\n{'map':<4}{'min_load':>9}{'capacity':>10}{'retained MB':>13}")
+    for name, map_class, max_loads in SWEEP:
+        max_load = max_loads[-1]
+        for min_load in (0.0, max_load / 4):
+            tracemalloc.start()
+            m = map_class(11, hash, max_load=max_load, min_load=min_load)
+            for i, key in enumerate(keys):
+                m.put(key, i)
+            for key in keys[: n * 95 // 100]:
+                m.remove(key)
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<4}{min_load:>9.3f}{m.get_capacity():>10}{retained / 2 ** 20:>13.1f}")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sweep(size)
+    shrink(size)
@@ -0,0 +1,61 @@
+# Description: Bytes per entry (tracemalloc) of both HashMaps with the slotted
+#              SLNode / LinkedList / HashEntry / DynamicArray classes,
+#              against __dict__-based copies of the same classes.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_memory [n]
+
+import sys
+import tracemalloc
+
+import a6_include
+import hash_map_oa
+import hash_map_sc
+
+
+def unslotted(cls):
+    """Return a copy of cls without __slots__, i.e. with a per-instance __dict__."""
+    namespace = {name: attr for name, attr in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, (), namespace)
+
+
+SLOTTED = {name: getattr(a6_include, name)
+           for name in ('DynamicArray', 'SLNode', 'LinkedList', 'LinkedListIterator', 'HashEntry')}
+UNSLOTTED = {name: unslotted(cls) for name, cls in SLOTTED.items()}
+
+
+def use_classes(classes: dict) -> None:
+    """Point a6_include and both map modules at the given set of classes."""
+    for name, cls in classes.items():
+        for module in (a6_include, hash_map_sc, hash_map_oa):
+            if hasattr(module, name):
+                setattr(module, name, cls)
+
+
+def bytes_per_entry(map_class, keys: list, values: list) -> float:
+    tracemalloc.start()
+    m = map_class(11, hash)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(keys)
+
+
+def main(n: int) -> None:
+    # keys and values exist before tracing starts, so only the map's own storage is counted
+    keys = ['key' + str(i) for i in range(n)]
+    values = list(range(n))
+
+    print(f"{'map':<4}{'__dict__ (B/entry)':>20}{'__slots__ (B/entry)':>21}")
+    for name, map_class in (('SC', hash_map_sc.HashMap), ('OA', hash_map_oa.HashMap)):
+        use_classes(UNSLOTTED)
+        before = bytes_per_entry(map_class, keys, values)
+        use_classes(SLOTTED)
+        after = bytes_per_entry(map_class, keys, values)
+        print(f"{name:<4}{before:>20.1f}{after:>21.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,42 @@
+# Description: Scaling of the sharded, process-parallel frequency count (find_mode_parallel / top_k)
+#              with the number of worker processes. With one worker the count runs in-process,
+#              which is the baseline for the speedup column.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_parallel_mode [n] [distinct] [max workers]
+
+import os
+import random
+import sys
+import time
+
+import hash_map_sc
+from a6_include import DynamicArray
+
+
+def main(n: int, distinct: int, max_workers: int) -> None:
+    words = ['word' + str(i) for i in range(distinct)]
+    da = DynamicArray(random.Random(0).choices(words, k=n))
+
+    print(f"{n:,} elements, {distinct:,} distinct, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7}{'find_mode (s)':>15}{'speedup':>9}{'top_k (s)':>11}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        modes, frequency = hash_map_sc.find_mode_parallel(da, workers, hash)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+
+        start = time.perf_counter()
+        hash_map_sc.top_k(da, 10, workers, hash)
+        top_time = time.perf_counter() - start
+
+        print(f"{workers:>7}{elapsed:>15.2f}{baseline / elapsed:>9.2f}{top_time:>11.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 2 * (os.cpu_count() or 1))
@@ -0,0 +1,63 @@
+# Description: Latency histogram of put() for both HashMaps,
+#              stop-the-world resizing vs. incremental resizing.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_put_latency [n]
+
+import gc
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+
+# upper bounds (microseconds) of the histogram buckets
+BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 1000, 10000, 100000)
+
+
+def put_latencies(m, n: int) -> list:
+    """Insert n keys into m, returning the latency of every put in microseconds."""
+    clock = time.perf_counter_ns
+    latencies = []
+    for i in range(n):
+        key = 'key' + str(i)
+        start = clock()
+        m.put(key, i)
+        latencies.append((clock() - start) / 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    """Print percentiles and a coarse histogram of latencies."""
+    ordered = sorted(latencies)
+    n = len(ordered)
+
+    def pct(p):
+        return ordered[min(n - 1, int(n * p))]
+
+    print(f"{name:<18} p50 {pct(0.5):8.1f}us  p99 {pct(0.99):8.1f}us  "
+          f"p99.9 {pct(0.999):8.1f}us  max {ordered[-1]:10.1f}us")
+
+    counts = [0] * (len(BOUNDS_US) + 1)
+    for latency in ordered:
+        idx = 0
+        while idx < len(BOUNDS_US) and latency > BOUNDS_US[idx]:
+            idx += 1
+        counts[idx] += 1
+    labels = [f"<={bound}us" for bound in BOUNDS_US] + [f">{BOUNDS_US[-1]}us"]
+    print('    ' + '  '.join(f"{label}:{count}" for label, count in zip(labels, counts) if count))
+
+
+def main(n: int) -> None:
+    # cyclic GC passes over millions of live objects would show up as spikes of their own,
+    # unrelated to resizing, so collection is paused while measuring
+    gc.disable()
+    for name, m in (('SC stop-the-world', hash_map_sc.HashMap(11, hash)),
+                    ('SC incremental', hash_map_sc.HashMap(11, hash, incremental=True)),
+                    ('OA stop-the-world', hash_map_oa.HashMap(11, hash)),
+                    ('OA incremental', hash_map_oa.HashMap(11, hash, incremental=True))):
+        report(name, put_latencies(m, n))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,81 @@
+# Description: Benchmark of resize_table for both HashMaps.
+#              Compares the bulk rehash (nodes/entries moved in place)
+#              against the original rehash that re-inserts through put().
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_resize [n ...]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, LinkedList
+
+
+class PutRehashSC(hash_map_sc.HashMap):
+    """SC HashMap using the original put()-based resize_table."""
+
+    def resize_table(self, new_capacity: int) -> None:
+        if new_capacity < 1:
+            return
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+        new_buckets = DynamicArray()
+        for _ in range(new_capacity):
+            new_buckets.append(LinkedList())
+        old_buckets = self._buckets
+        self._buckets = new_buckets
+        self._capacity = new_capacity
+        self._size = 0
+        for idx in range(old_buckets.length()):
+            for node in old_buckets[idx]:
+                self.put(node.key, node.value)
+
+
+class PutRehashOA(hash_map_oa.HashMap):
+    """OA HashMap using the original put()-based resize_table."""
+
+    def resize_table(self, new_capacity: int) -> None:
+        if new_capacity < self._size:
+            return
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+        new_buckets = DynamicArray()
+        for _ in range(new_capacity):
+            new_buckets.append(None)
+        old_buckets = self._buckets
+        self._buckets = new_buckets
+        self._capacity = new_capacity
+        self._size = 0
+        for idx in range(old_buckets.length()):
+            entry = old_buckets[idx]
+            if entry and not entry.is_tombstone:
+                self.put(entry.key, entry.value)
+
+
+def time_resize(map_class, n: int) -> float:
+    """
+    Fill a map with n keys, then time a single doubling of its capacity.
+    The builtin hash is used so that key distribution does not dominate the timing.
+    """
+    m = map_class(n * 2 + 1, hash)
+    for i in range(n):
+        m.put('key' + str(i), i)
+    start = time.perf_counter()
+    m.resize_table(m.get_capacity() * 2)
+    return time.perf_counter() - start
+
+
+def main(sizes) -> None:
+    print(f"{'map':<4}{'n':>10}{'put rehash (s)':>18}{'bulk rehash (s)':>18}{'speedup':>10}")
+    for name, old, new in (('SC', PutRehashSC, hash_map_sc.HashMap),
+                           ('OA', PutRehashOA, hash_map_oa.HashMap)):
+        for n in sizes:
+            old_time = time_resize(old, n)
+            new_time = time_resize(new, n)
+            print(f"{name:<4}{n:>10}{old_time:>18.3f}{new_time:>18.3f}{old_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6])
@@ -0,0 +1,96 @@
+# Description: Probe lengths (mean / max, hits and misses) and lookup-miss throughput of the
+#              open addressing map with Robin Hood probing against quadratic probing,
+#              at fixed load factors from 0.3 to 0.9. Quadratic probing is limited to
+#              max_load 0.5, so it is only measured up to there.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_robin_hood [capacity]
+
+import sys
+import time
+
+import hash_map_oa
+
+LOADS = (0.3, 0.5, 0.7, 0.8, 0.9)
+
+
+def hit_probes_quadratic(m, key: str) -> int:
+    """Number of buckets a successful lookup of key examines."""
+    buckets = m._buckets
+    capacity = m.get_capacity()
+    initial_index = hash(key) % capacity
+    iter_index = initial_index
+    count = 0
+    while buckets[iter_index].key != key:
+        count += 1
+        iter_index = (initial_index + count ** 2) % capacity
+    return count + 1
+
+
+def miss_probes_quadratic(m, key: str) -> int:
+    """Number of buckets a failed lookup of key examines (including the empty bucket that ends it)."""
+    buckets = m._buckets
+    capacity = m.get_capacity()
+    initial_index = hash(key) % capacity
+    iter_index = initial_index
+    count = 0
+    while count < capacity and buckets[iter_index] is not None:
+        count += 1
+        iter_index = (initial_index + count ** 2) % capacity
+    return count + 1
+
+
+def hit_probes_robin_hood(m, key: str) -> int:
+    """A Robin Hood entry's probe distance is stored, so a hit examines distance + 1 buckets."""
+    return m._buckets[m._index_robin_hood(m._buckets, m.get_capacity(), key, hash(key))].distance + 1
+
+
+def miss_probes_robin_hood(m, key: str) -> int:
+    """Number of buckets a failed lookup examines before the early exit (see _index_robin_hood)."""
+    buckets = m._buckets
+    capacity = m.get_capacity()
+    iter_index = hash(key) % capacity
+    distance = 0
+    while buckets[iter_index] is not None and buckets[iter_index].distance >= distance:
+        distance += 1
+        iter_index = (iter_index + 1) % capacity
+    return distance + 1
+
+
+PROBING = (
+    ('quadratic', 0.5, hit_probes_quadratic, miss_probes_quadratic),
+    ('robin_hood', 0.95, hit_probes_robin_hood, miss_probes_robin_hood),
+)
+
+
+def main(capacity: int) -> None:
+    misses = ['miss' + str(i) for i in range(capacity // 2)]
+
+    print(f"{'probing':<12}{'load':>6}{'hit mean':>10}{'hit max':>9}{'miss mean':>11}{'miss max':>10}"
+          f"{'misses/s':>12}")
+    for name, max_load, hit_probes, miss_probes in PROBING:
+        for load in LOADS:
+            if load > max_load:
+                print(f"{name:<12}{load:>6}{'n/a (max_load is limited to ' + str(max_load) + ')':>52}")
+                continue
+
+            # a fixed capacity, filled to exactly the target load without resizing
+            m = hash_map_oa.HashMap(capacity, hash, probing=name, max_load=max_load)
+            keys = ['key' + str(i) for i in range(int(load * m.get_capacity()))]
+            for i, key in enumerate(keys):
+                m.put(key, i)
+
+            hits = [hit_probes(m, key) for key in keys]
+            lengths = [miss_probes(m, key) for key in misses]
+
+            start = time.perf_counter()
+            for key in misses:
+                m.get(key)
+            rate = len(misses) / (time.perf_counter() - start)
+
+            print(f"{name:<12}{load:>6}{sum(hits) / len(hits):>10.2f}{max(hits):>9}"
+                  f"{sum(lengths) / len(lengths):>11.2f}{max(lengths):>10}{rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200003)
@@ -0,0 +1,98 @@
+# Description: Memory and lookup throughput of 1, 4 and 16 reader processes that all need the
+#              same table: each holding a private copy of hash_map_oa.HashMap (unpickled from
+#              the parent's), vs. all attaching to one hash_map_shared.HashMap. For each reader
+#              it records RSS and PSS (proportional set size: shared pages split between the
+#              processes mapping them) after its lookups; Linux only (/proc).
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_shared_memory [n] [lookups_per_reader]
+
+import gc
+import multiprocessing
+import pickle
+import sys
+import time
+
+import hash_map_oa
+import hash_map_shared
+from a6_include import hash_function_fnv1a
+
+READERS = (1, 4, 16)
+
+
+def memory_kb() -> tuple:
+    """(RSS, PSS) of this process in kB."""
+    with open('/proc/self/status') as status:
+        rss = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+    with open('/proc/self/smaps_rollup') as rollup:
+        pss = next(int(line.split()[1]) for line in rollup if line.startswith('Pss:'))
+    return rss, pss
+
+
+def private_reader(pickled: bytes, keys: list, barrier, results) -> None:
+    """Loads its own copy of the map, then looks up keys."""
+    m = pickle.loads(pickled)
+    barrier.wait()
+    for key in keys:
+        m.get(key)
+    results.put(memory_kb())
+
+
+def shared_reader(name: str, keys: list, barrier, results) -> None:
+    """Attaches to the shared map, then looks up keys."""
+    m = hash_map_shared.HashMap.attach(name)
+    barrier.wait()
+    for key in keys:
+        m.get(key)
+    results.put(memory_kb())
+    m.close()
+
+
+def run(target, argument, readers: int, keys: list) -> tuple:
+    """Runs readers processes of target; returns (lookups/s over all readers, mean RSS MB, total PSS MB)."""
+    barrier = multiprocessing.Barrier(readers + 1)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=(argument, keys, barrier, results))
+                 for _ in range(readers)]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    memory = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    rss = sum(rss for rss, _ in memory) / readers / 1024
+    pss = sum(pss for _, pss in memory) / 1024
+    return readers * len(keys) / elapsed, rss, pss
+
+
+def main(n: int, lookups: int) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    lookup_keys = [keys[(i * 7919) % n] for i in range(lookups)]
+
+    # both maps use FNV-1a: builtin hash of str differs between unrelated processes
+    private = hash_map_oa.HashMap(11, hash_function_fnv1a)
+    shared = hash_map_shared.HashMap(11)
+    for i, key in enumerate(keys):
+        private.put(key, i)
+        shared.put(key, i)
+    pickled = pickle.dumps(private, pickle.HIGHEST_PROTOCOL)
+    del private
+    gc.collect()
+
+    print(f"{n} keys, {lookups} lookups per reader")
+    print(f"{'map':<16}{'readers':>8}{'lookups/s':>12}{'RSS/reader MB':>15}{'total PSS MB':>14}")
+    for readers in READERS:
+        for name, target, argument in (('private copy', private_reader, pickled),
+                                       ('shared memory', shared_reader, shared.get_name())):
+            rate, rss, pss = run(target, argument, readers, lookup_keys)
+            print(f"{name:<16}{readers:>8}{rate:>12,.0f}{rss:>15.1f}{pss:>14.1f}")
+
+    shared.close()
+    shared.unlink()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20000)
@@ -0,0 +1,96 @@
+# Description: Cold-start time of a map of n entries after a restart: re-inserting an exported
+#              list of pairs (pickle) through put or from_items, vs. HashMap.load of a binary
+#              snapshot, vs. opening the snapshot memory-mapped and read-only. Also reports the
+#              save time and file size of each format, and the time of the first 1000 lookups.
+#              Maps use FNV-1a, since builtin hash of str changes between runs and a snapshot's
+#              stored hashes are only reusable with a deterministic hash function. Files are read
+#              from the page cache (warm), not from disk.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_snapshot [n]
+
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import hash_map_oa
+import hash_map_sc
+import hash_map_snapshot
+from a6_include import hash_function_fnv1a
+
+LOOKUPS = 1000
+
+
+def timed(function):
+    """Returns (result of function(), seconds it took)."""
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def first_lookups(m, keys: list) -> float:
+    """Seconds taken by get on each of keys."""
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    return time.perf_counter() - start
+
+
+def main(n: int) -> None:
+    directory = tempfile.mkdtemp()
+    pairs_path = os.path.join(directory, 'pairs.pickle')
+    snapshot_path = os.path.join(directory, 'map.snap')
+    lookup_keys = ['key' + str(i * 7919 % n) for i in range(LOOKUPS)]
+
+    print(f"{n} entries")
+    print(f"{'map':<4}{'cold start':<18}{'save s':>8}{'file MB':>9}{'start s':>9}{'1k gets ms':>12}")
+    for label, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        m = module.HashMap(11, hash_function_fnv1a)
+        m.put_many([('key' + str(i), {'id': i, 'name': 'name' + str(i)}) for i in range(n)])
+
+        def export():
+            with open(pairs_path, 'wb') as file:
+                pickle.dump(m.get_keys_and_values()._data, file, pickle.HIGHEST_PROTOCOL)
+
+        _, export_time = timed(export)
+        _, save_time = timed(lambda: m.save(snapshot_path))
+        del m
+
+        def reinsert_put():
+            with open(pairs_path, 'rb') as file:
+                pairs = pickle.load(file)
+            rebuilt = module.HashMap(11, hash_function_fnv1a)
+            for key, value in pairs:
+                rebuilt.put(key, value)
+            return rebuilt
+
+        def reinsert_from_items():
+            with open(pairs_path, 'rb') as file:
+                return module.HashMap.from_items(pickle.load(file), hash_function_fnv1a)
+
+        cases = (('pickle + put', export_time, pairs_path, reinsert_put),
+                 ('pickle + from_items', export_time, pairs_path, reinsert_from_items),
+                 ('load', save_time, snapshot_path, lambda: module.HashMap.load(snapshot_path, hash_function_fnv1a)),
+                 ('mmap', save_time, snapshot_path, lambda: hash_map_snapshot.HashMap(snapshot_path, hash_function_fnv1a)))
+        for name, write_time, path, start in cases:
+            started, start_time = timed(start)
+            # a full collection over the objects just built would otherwise land in the lookups
+            gc.collect()
+            lookups = first_lookups(started, lookup_keys)
+            print(f"{label:<4}{name:<18}{write_time:>8.2f}{os.path.getsize(path) / 2 ** 20:>9.1f}"
+                  f"{start_time:>9.3f}{lookups * 1000:>12.2f}")
+            if name == 'mmap':
+                started.close()
+            del started
+
+    os.remove(pairs_path)
+    os.remove(snapshot_path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,78 @@
+# Description: Cost of leaving stats on: throughput of a get / put / remove mix on both maps with
+#              stats off and with stats_sample 1 (every operation measured), 16 and 256. Then
+#              prints the stats() of a sampled run under a weak and a strong hash function, which
+#              is where the probe / chain length histograms show why lookups got slow.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_stats [n]
+
+import gc
+import random
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_1, hash_function_builtin
+
+SAMPLES = (0, 1, 16, 256)
+REPEATS = 3
+
+
+def workload(m, keys: list, operations: list) -> float:
+    """Fills m with keys, then runs operations (op, key) on it; returns the seconds the operations took."""
+    m.put_many([(key, 0) for key in keys])
+    start = time.perf_counter()
+    for op, key in operations:
+        if op == 0:
+            m.get(key)
+        elif op == 1:
+            m.put(key, 1)
+        else:
+            m.remove(key)
+    return time.perf_counter() - start
+
+
+def mixed_operations(n: int, count: int, rng: random.Random) -> list:
+    """Returns count (op, key) pairs over keys 'key0' .. : 80% get (a fifth of them misses), 15% put, 5% remove."""
+    operations = []
+    for _ in range(count):
+        draw = rng.random()
+        key = 'key' + str(rng.randrange(n * 5 // 4))
+        operations.append((0 if draw < 0.8 else 1 if draw < 0.95 else 2, key))
+    return operations
+
+
+def main(n: int) -> None:
+    rng = random.Random(1)
+    keys = ['key' + str(i) for i in range(n)]
+    operations = mixed_operations(n, 2 * n, rng)
+
+    print(f"{n} keys, {len(operations)} operations (80% get, 15% put, 5% remove), best of {REPEATS}")
+    print(f"{'map':<4}" + "".join(f"{'off' if s == 0 else 'sample ' + str(s):>14}" for s in SAMPLES))
+    for label, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        best = dict.fromkeys(SAMPLES, float('inf'))
+        # runs are interleaved, so that drift in the machine's speed does not favour one setting
+        for _ in range(REPEATS):
+            for sample in SAMPLES:
+                gc.collect()
+                m = module.HashMap(11, hash_function_builtin, stats_sample=sample)
+                best[sample] = min(best[sample], workload(m, keys, operations))
+        print(f"{label:<4}" + "".join(f"{len(operations) / best[sample]:>10.0f} op/s" for sample in SAMPLES))
+
+    small = n // 10
+    operations = mixed_operations(small, 2 * small, rng)
+    for label, module, unit in (('SC', hash_map_sc, 'chain_length'), ('OA', hash_map_oa, 'probes')):
+        for function in (hash_function_1, hash_function_builtin):
+            m = module.HashMap(11, function, stats_sample=16)
+            workload(m, keys[:small], operations)
+            stats = m.stats()
+            get = stats['get']
+            print(f"\n{label} {function.__name__}: load {stats['load']:.2f}, {stats['resizes']} resizes "
+                  f"({stats['resize_seconds'] * 1000:.1f} ms), get hit ratio {get['hit_ratio']:.2f}, "
+                  f"mean {unit} {get['mean_' + unit]:.1f}, max {get['max_' + unit]}")
+            print(f"  get {unit} histogram: {get[unit + '_histogram']}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
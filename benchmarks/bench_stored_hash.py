@@ -0,0 +1,101 @@
+# Description: Benchmark of storing each key's hash in SLNode / HashEntry,
+#              on long keys (URLs and 200+ byte ids).
+#              Compares against subclasses that recompute hashes on resize
+#              and compare keys without checking the stored hash first.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_stored_hash [n]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a
+
+
+class RecomputeSC(hash_map_sc.HashMap):
+    """SC HashMap that ignores stored hashes."""
+
+    def _rehash(self, old_buckets) -> None:
+        for idx in range(old_buckets.length()):
+            for node in old_buckets[idx]:
+                self._buckets[self._hash_function(node.key) % self._capacity].insert_node(node)
+
+    def get(self, key: str):
+        node = self._find_bucket(self._hash_function(key)).contains(key)
+        return node.value if node else None
+
+
+class RecomputeOA(hash_map_oa.HashMap):
+    """OA HashMap that ignores stored hashes."""
+
+    def _rehash(self, old_buckets) -> None:
+        buckets, capacity = self._buckets, self._capacity
+        for idx in range(old_buckets.length()):
+            entry = old_buckets[idx]
+            if entry and not entry.is_tombstone:
+                initial_index = self._hash_function(entry.key) % capacity
+                iter_index, count = initial_index, 0
+                while buckets[iter_index] is not None:
+                    count += 1
+                    iter_index = (initial_index + count ** 2) % capacity
+                buckets[iter_index] = entry
+
+    def _probe(self, buckets, capacity, key, hash_value):
+        initial_index = hash_value % capacity
+        iter_index, count = initial_index, 0
+        while count < capacity and buckets[iter_index] is not None:
+            entry = buckets[iter_index]
+            if entry.key == key and not entry.is_tombstone:
+                return entry
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+        return None
+
+
+def long_keys(n: int) -> dict:
+    """URL keys and 200+ byte ids that share long common prefixes."""
+    prefix = 'tenant-0042/' + 'x' * 200 + '/'
+    return {
+        'urls': [f'https://cdn.example.com/assets/v2/images/catalog/{i % 1000}/{i}.png' for i in range(n)],
+        'ids': [prefix + format(i, '016x') for i in range(n)],
+    }
+
+
+def run(map_class, keys: list, misses: list, function) -> tuple:
+    """Return (seconds for one resize, seconds for a hit+miss lookup pass)."""
+    m = map_class(len(keys), function)
+    for i, key in enumerate(keys):
+        m.put(key, i)
+
+    start = time.perf_counter()
+    m.resize_table(m.get_capacity() * 2)
+    resize_time = time.perf_counter() - start
+
+    # squeeze the table back down so buckets hold collisions worth comparing
+    m.resize_table(1)
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    for key in misses:
+        m.get(key)
+    return resize_time, time.perf_counter() - start
+
+
+def main(n: int) -> None:
+    print(f"{'map':<4}{'keys':<6}{'hash':<10}{'resize (s)':>22}{'lookups (s)':>24}")
+    print(f"{'':<20}{'recompute':>11}{'stored':>11}{'recompute':>12}{'stored':>12}")
+    for set_name, keys in long_keys(n).items():
+        misses = [key + '?' for key in keys]
+        for function_name, function in (('fnv1a', hash_function_fnv1a), ('builtin', hash)):
+            for name, old, new in (('SC', RecomputeSC, hash_map_sc.HashMap),
+                                   ('OA', RecomputeOA, hash_map_oa.HashMap)):
+                old_resize, old_lookup = run(old, keys, misses, function)
+                new_resize, new_lookup = run(new, keys, misses, function)
+                print(f"{name:<4}{set_name:<6}{function_name:<10}"
+                      f"{old_resize:>11.3f}{new_resize:>11.3f}{old_lookup:>12.3f}{new_lookup:>12.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
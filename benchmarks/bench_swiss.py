@@ -0,0 +1,44 @@
+# Description: Lookup throughput of the Swiss-table map (group probing over control bytes)
+#              against the quadratic open addressing map: single get() calls and
+#              batched get_many / contains_many, over an even mix of hits and misses.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_swiss [n]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_swiss
+from a6_include import DynamicArray
+
+
+def rate(function, *args, count: int) -> float:
+    """Lookups per second of one call to function(*args) covering count keys."""
+    start = time.perf_counter()
+    function(*args)
+    return count / (time.perf_counter() - start)
+
+
+def main(n: int) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    lookups = DynamicArray(keys + ['miss' + str(i) for i in range(n)])
+    count = lookups.length()
+
+    print(f"{'map':<8}{'capacity':>10}{'load':>6}{'get/s':>13}{'get_many/s':>13}{'contains_many/s':>17}")
+    for name, map_class in (('OA', hash_map_oa.HashMap), ('swiss', hash_map_swiss.HashMap)):
+        m = map_class(11, hash)
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+        def get_all():
+            for idx in range(count):
+                m.get(lookups[idx])
+
+        print(f"{name:<8}{m.get_capacity():>10}{m.table_load():>6.2f}{rate(get_all, count=count):>13,.0f}"
+              f"{rate(m.get_many, lookups, count=count):>13,.0f}"
+              f"{rate(m.contains_many, lookups, count=count):>17,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
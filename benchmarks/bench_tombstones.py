@@ -0,0 +1,74 @@
+# Description: Churn benchmark for the open addressing map's tombstone handling.
+#              A stable working set is kept live while sessions of keys are inserted
+#              and removed again; probe lengths of lookup misses are tracked per round,
+#              with automatic compaction off and on. Without compaction, tombstones end up in
+#              every free bucket and each put walks the whole table, so an arm is stopped once
+#              the mean miss probe passes PROBE_LIMIT.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_tombstones [live] [rounds]
+
+import sys
+import time
+
+import hash_map_oa
+
+SESSION = 500       # keys inserted then removed per round
+SAMPLES = 2000      # miss lookups whose probe lengths are sampled per report
+CHECK_SAMPLES = 200  # miss lookups sampled after every round, to stop a degraded arm
+PROBE_LIMIT = 32    # mean miss probe length that stops an arm
+
+
+def probe_length(m, key: str) -> int:
+    """Number of occupied (live or tombstone) buckets a miss for key walks past."""
+    buckets = m._buckets
+    capacity = m.get_capacity()
+    initial_index = hash(key) % capacity
+    iter_index = initial_index
+    count = 0
+    while count < capacity and buckets[iter_index] is not None:
+        count += 1
+        iter_index = (initial_index + count ** 2) % capacity
+    return count
+
+
+def report(m, r: int, samples: int) -> float:
+    """Prints the capacity, tombstones and miss probe lengths after round r; returns the mean probe length."""
+    lengths = [probe_length(m, 'miss' + str(i)) for i in range(samples)]
+    mean = sum(lengths) / samples
+    print(f"  round {r:>5}  capacity {m.get_capacity():>7}  tombstones {m.get_tombstones():>7}"
+          f"  miss probes mean {mean:7.2f} max {max(lengths):>6}")
+    return mean
+
+
+def churn(m, live: int, rounds: int) -> None:
+    for i in range(live):
+        m.put('live' + str(i), i)
+
+    start = time.perf_counter()
+    for r in range(rounds):
+        session = ['s' + str(r) + '-' + str(i) for i in range(SESSION)]
+        for key in session:
+            m.put(key, r)
+        for key in session:
+            m.remove(key)
+
+        if r % max(1, rounds // 5) == 0 or r == rounds - 1:
+            report(m, r, SAMPLES)
+        elif sum(probe_length(m, 'miss' + str(i)) for i in range(CHECK_SAMPLES)) / CHECK_SAMPLES > PROBE_LIMIT:
+            report(m, r, SAMPLES)
+            print(f"  stopped after round {r}: mean miss probe over {PROBE_LIMIT}")
+            break
+    elapsed = time.perf_counter() - start
+    print(f"  {(r + 1) * SESSION * 2 / elapsed:,.0f} put+remove ops/s")
+
+
+def main(live: int, rounds: int) -> None:
+    for label, ratio in (('no compaction', None), ('max_tombstone_ratio=0.25', 0.25)):
+        print(label)
+        churn(hash_map_oa.HashMap(11, hash, max_tombstone_ratio=ratio), live, rounds)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,293 @@
+# Description: asyncio facade over the separate chaining and open addressing HashMaps.
+#              The wrapped map runs in incremental mode, so a put that crosses the load factor
+#              threshold only starts a resize; AsyncHashMap then finishes the migration in a
+#              background task that yields to the event loop every max_pause seconds. Lookups
+#              keep working during the migration (they consult both tables), and batch
+#              operations yield between chunks of keys as well. The map is driven through its
+#              public stepping API (is_resizing, migrate, start_resize, capacity_for).
+
+import asyncio
+import time
+
+from a6_include import DynamicArray, as_list, hash_function_1
+import hash_map_sc
+
+
+class AsyncHashMap:
+    def __init__(self, hash_map=None, chunk_size: int = 512, migrate_chunk: int = 256,
+                 max_pause: float = 0.002) -> None:
+        """
+        Initialize the facade over hash_map, a hash_map_sc or hash_map_oa HashMap created with incremental=True
+        (by default a new separate chaining HashMap(11, hash_function_1, incremental=True)).
+        Batch operations handle chunk_size keys between yields to the event loop. The background migration
+        moves migrate_chunk old buckets at a time, and yields once it has run for max_pause seconds, which bounds
+        how long it holds up other tasks whatever the cost of a bucket.
+        The wrapped map must only be used through the facade while the facade is in use.
+        """
+        if hash_map is None:
+            hash_map = hash_map_sc.HashMap(11, hash_function_1, incremental=True)
+        if not hash_map.is_incremental():
+            raise ValueError("hash_map must be created with incremental=True")
+        if chunk_size < 1 or migrate_chunk < 1:
+            raise ValueError("chunk_size and migrate_chunk must be at least 1")
+        if max_pause <= 0:
+            raise ValueError("max_pause must be positive")
+
+        self._map = hash_map
+        self._chunk_size = chunk_size
+        self._migrate_chunk = migrate_chunk
+        self._max_pause = max_pause
+
+        # background task finishing the incremental resize in progress, if any
+        self._migration = None
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    def table_load(self) -> float:
+        """
+        Return load factor of map
+        """
+        return self._map.table_load()
+
+    def get_map(self) -> object:
+        """
+        Return the wrapped HashMap
+        """
+        return self._map
+
+    def is_resizing(self) -> bool:
+        """
+        Return True while an incremental resize is in progress
+        """
+        return self._map.is_resizing()
+
+    # ------------------------------------------------------------------ #
+
+    def _schedule_migration(self) -> None:
+        """
+        Starts the background migration task if a resize is in progress and no task is running yet.
+        """
+
+        if self._map.is_resizing() and (self._migration is None or self._migration.done()):
+            self._migration = asyncio.get_running_loop().create_task(self._migrate())
+
+    async def _migrate(self) -> None:
+        """
+        Migrates migrate_chunk old buckets at a time until the resize in progress (and any started
+        meanwhile) is complete, yielding to the event loop every max_pause seconds.
+        """
+
+        hash_map = self._map
+        clock = time.perf_counter
+        while hash_map.is_resizing():
+            deadline = clock() + self._max_pause
+            while hash_map.migrate(self._migrate_chunk) and clock() < deadline:
+                pass
+            await asyncio.sleep(0)
+
+    async def wait_resized(self) -> None:
+        """
+        Waits until no resize is in progress.
+        """
+
+        self._schedule_migration()
+        while self._migration is not None and not self._migration.done():
+            await self._migration
+            self._schedule_migration()
+
+    async def _make_room(self) -> None:
+        """
+        Waits for the resize in progress, if the next put would start another: the map would
+        first complete the one in progress synchronously, all in that put.
+        Any put grows the table at max_load, even one that only overwrites a key.
+        """
+
+        hash_map = self._map
+        while hash_map.is_resizing() and hash_map.capacity_for(hash_map.get_size() + 1) > hash_map.get_capacity():
+            await self.wait_resized()
+
+    async def put(self, key: str, value: object) -> None:
+        """
+        Puts key / value in the map. If this starts a resize, it is completed in the background.
+        """
+
+        await self._make_room()
+        self._map.put(key, value)
+        self._schedule_migration()
+
+    async def get(self, key: str) -> object:
+        """
+        Returns value of key, or None if key is absent.
+        """
+
+        return self._map.get(key)
+
+    async def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key exists in map, returns Boolean.
+        """
+
+        return self._map.contains_key(key)
+
+    async def remove(self, key: str) -> None:
+        """
+        Removes key from the map (if present). If this starts a shrink or compaction, it is completed in the background.
+        """
+
+        self._map.remove(key)
+        self._schedule_migration()
+
+    async def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns value of key, first putting default if key is absent.
+        """
+
+        await self._make_room()
+        value = self._map.setdefault(key, default)
+        self._schedule_migration()
+        return value
+
+    async def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of key (an absent key counts as 0) and returns the new value.
+        """
+
+        await self._make_room()
+        value = self._map.increment(key, delta)
+        self._schedule_migration()
+        return value
+
+    async def put_many(self, pairs) -> None:
+        """
+        Puts every (key, value) pair of pairs (a DynamicArray or any iterable of pairs), chunk_size pairs at a time.
+        A chunk goes through the map's put_many while it fits without a resize and no resize is in progress,
+        and through single puts (which start and advance resizes incrementally) otherwise.
+        """
+
+        pairs = as_list(pairs)
+        hash_map = self._map
+        for start in range(0, len(pairs), self._chunk_size):
+            chunk = pairs[start:start + self._chunk_size]
+            if (not hash_map.is_resizing()
+                    and hash_map.capacity_for(hash_map.get_size() + len(chunk)) <= hash_map.get_capacity()):
+                hash_map.put_many(chunk)
+            else:
+                for key, value in chunk:
+                    await self._make_room()
+                    hash_map.put(key, value)
+            self._schedule_migration()
+            await asyncio.sleep(0)
+
+    async def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with the value of each key in keys (None where absent), in order,
+        looking up chunk_size keys at a time.
+        """
+
+        return DynamicArray(await self._lookup_many(keys, 'get_many', self._map.get))
+
+    async def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with a Boolean for each key in keys, in order, checking chunk_size keys at a time.
+        """
+
+        return DynamicArray(await self._lookup_many(keys, 'contains_many', self._map.contains_key))
+
+    async def _lookup_many(self, keys, batch: str, single: callable) -> list:
+        """
+        Looks up keys chunk_size at a time with the map's batch method, or with single per key while a resize
+        is in progress (the batch methods would first complete it in one go).
+        """
+
+        keys = as_list(keys)
+        hash_map = self._map
+        results = []
+        for start in range(0, len(keys), self._chunk_size):
+            chunk = keys[start:start + self._chunk_size]
+            if not hash_map.is_resizing():
+                results.extend(getattr(hash_map, batch)(chunk)._data)
+            else:
+                results.extend(single(key) for key in chunk)
+            await asyncio.sleep(0)
+        return results
+
+    async def remove_many(self, keys) -> int:
+        """
+        Removes every key in keys that is present, chunk_size keys at a time. Returns the number of keys removed.
+        """
+
+        keys = as_list(keys)
+        hash_map = self._map
+        removed = 0
+        for start in range(0, len(keys), self._chunk_size):
+            for key in keys[start:start + self._chunk_size]:
+                size = hash_map.get_size()
+                hash_map.remove(key)
+                removed += size - hash_map.get_size()
+            self._schedule_migration()
+            await asyncio.sleep(0)
+        return removed
+
+    async def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the table to new_capacity (see the wrapped map's resize_table) incrementally,
+        and waits until the migration is complete.
+        """
+
+        await self.wait_resized()
+        if new_capacity < max(1, self._map.get_size()):
+            return
+        self._map.start_resize(new_capacity)
+        await self.wait_resized()
+
+    async def reserve(self, expected_size: int) -> None:
+        """
+        Grows the table once, if needed, so it can hold expected_size entries without another resize.
+        """
+
+        needed = self._map.capacity_for(expected_size)
+        if needed > self._map.get_capacity():
+            await self.resize_table(needed)
+
+    async def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array of (key, value) tuples, once any resize in progress is complete.
+        """
+
+        await self.wait_resized()
+        return self._map.get_keys_and_values()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import hash_map_oa
+
+    async def demo(amap, label):
+        print("\n" + label)
+        print("-" * len(label))
+        for i in range(200):
+            await amap.put('str' + str(i), i * 100)
+            if i % 50 == 49:
+                print(amap.get_size(), amap.get_capacity(), amap.is_resizing(), await amap.get('str' + str(i // 2)))
+        await amap.wait_resized()
+        print(amap.is_resizing(), round(amap.table_load(), 2))
+        await amap.put_many([('key' + str(i), i) for i in range(500)])
+        print(await amap.get_many(['key1', 'key499', 'missing']), await amap.contains_many(['key2', 'nope']))
+        print(await amap.remove_many(['key' + str(i) for i in range(0, 500, 2)]), amap.get_size())
+        await amap.resize_table(3000)
+        print(amap.get_capacity(), (await amap.get_keys_and_values()).length())
+
+    asyncio.run(demo(AsyncHashMap(chunk_size=64, migrate_chunk=16), "separate chaining"))
+    asyncio.run(demo(AsyncHashMap(hash_map_oa.HashMap(11, hash_function_1, incremental=True),
+                                  chunk_size=64, migrate_chunk=16), "open addressing"))
@@ -0,0 +1,346 @@
+# Description: Thread-safe Separate Chaining HashMap with lock striping.
+#              Same public API as hash_map_sc.HashMap (plus increment). Buckets are guarded by
+#              a fixed set of locks, bucket i by lock i % stripes, so writers to different stripes
+#              never wait for each other. A resize takes every lock, builds the new table from
+#              copies of the nodes and swaps it in, which leaves the old table intact:
+#              get / contains_key therefore run without any lock.
+
+import threading
+
+from a6_include import DynamicArray, LinkedList, hash_function_1, hash_function_2
+
+
+class HashMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 stripes: int = 16,
+                 max_load: float = 1.0) -> None:
+        """
+        Initialize new thread-safe HashMap that uses
+        separate chaining for collision resolution, with stripes locks over the buckets.
+        The table doubles once the load factor reaches max_load.
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        if max_load <= 0:
+            raise ValueError("max_load must be positive")
+
+        self._hash_function = function
+        self._max_load = max_load
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        # number of entries in the buckets of each stripe, each only updated under its stripe's lock
+        self._counts = [0] * stripes
+
+        # (buckets, capacity), replaced as a whole so that readers always see a matching pair
+        self._table = self._new_table(self._next_prime(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        buckets, capacity = self._table
+        out = ''
+        for i in range(capacity):
+            out += str(i) + ': ' + str(buckets[i]) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map (exact when no writer is running)
+        """
+        return sum(self._counts)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _new_table(capacity: int) -> tuple:
+        """
+        Returns a (buckets, capacity) table of capacity empty LinkedLists.
+        """
+        buckets = DynamicArray()
+        for _ in range(capacity):
+            buckets.append(LinkedList())
+        return buckets, capacity
+
+    def _acquire(self, hash_value: int) -> tuple:
+        """
+        Locks the stripe of the bucket for hash_value in the current table.
+        Should a resize have swapped the table while waiting for the lock, retries on the new table.
+        Returns (bucket, stripe) with the stripe's lock held; the caller releases self._locks[stripe].
+        """
+
+        while True:
+            table = self._table
+            buckets, capacity = table
+            index = hash_value % capacity
+            stripe = index % len(self._locks)
+            lock = self._locks[stripe]
+            lock.acquire()
+            if self._table is table:
+                return buckets[index], stripe
+            lock.release()
+
+    def _acquire_all(self) -> None:
+        """
+        Locks every stripe, always in the same order so that two callers cannot deadlock.
+        """
+        for lock in self._locks:
+            lock.acquire()
+
+    def _release_all(self) -> None:
+        """
+        Unlocks every stripe.
+        """
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Under the lock of key's stripe: if node is present in key's bucket, updates value,
+        otherwise places new node there. Then grows the table if the load factor reached max_load.
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._acquire(hash_value)
+        try:
+            node = bucket.contains(key, hash_value)
+            if node:
+                node.value = value
+                return
+            bucket.insert(key, value, hash_value)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        if self.table_load() >= self._max_load:
+            self._grow()
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Atomically adds delta to the value of key, treating an absent key as 0, and returns the new value.
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._acquire(hash_value)
+        try:
+            node = bucket.contains(key, hash_value)
+            if node:
+                node.value += delta
+                return node.value
+            bucket.insert(key, delta, hash_value)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        if self.table_load() >= self._max_load:
+            self._grow()
+        return delta
+
+    def _grow(self) -> None:
+        """
+        Doubles the table, unless another thread already grew it while this one waited for the locks.
+        """
+
+        self._acquire_all()
+        try:
+            if self.table_load() >= self._max_load:
+                self._rebuild(self._table[1] * 2)
+        finally:
+            self._release_all()
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Moves every entry into a new table of the next prime >= new_capacity and swaps it in.
+        Must be called with every stripe locked. Entries are copied into new nodes rather than relinked,
+        so a lock-free reader still walking the old table sees unchanged chains.
+        """
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        old_buckets, old_capacity = self._table
+        buckets, capacity = self._new_table(new_capacity)
+        counts = [0] * len(self._locks)
+
+        for idx in range(old_capacity):
+            for node in old_buckets[idx]:
+                index = node.hash % capacity
+                buckets[index].insert(node.key, node.value, node.hash)
+                counts[index % len(counts)] += 1
+
+        self._table = (buckets, capacity)
+        self._counts = counts
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes table to new capacity (the next prime >= new_capacity), unless new_capacity < 1.
+        Writers wait while the table is rebuilt; readers keep using the old table until it is swapped.
+        """
+
+        if new_capacity < 1:
+            return
+
+        self._acquire_all()
+        try:
+            self._rebuild(new_capacity)
+        finally:
+            self._release_all()
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self.get_size() / self._table[1]
+
+    def empty_buckets(self) -> int:
+        """
+        Counts number of empty buckets in the current table.
+        """
+
+        buckets, capacity = self._table
+        count = 0
+        for idx in range(capacity):
+            if buckets[idx].length() == 0:
+                count += 1
+        return count
+
+    def _find(self, key: str):
+        """
+        Returns the node with key, or None, without taking any lock.
+        Chains are only ever changed by single reference assignments, so a reader sees each bucket either
+        before or after a concurrent write. If the table was swapped by a resize during the search,
+        the search is repeated on the new table, so a write finished before the resize is not missed.
+        """
+
+        hash_value = self._hash_function(key)
+        while True:
+            table = self._table
+            buckets, capacity = table
+            node = buckets[hash_value % capacity].contains(key, hash_value)
+            if self._table is table:
+                return node
+
+    def get(self, key: str) -> object:
+        """
+        Returns value of node with key (without locking), or None if key is absent.
+        """
+
+        node = self._find(key)
+        if node:
+            return node.value
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks (without locking) to see if key exists in map, returns Boolean.
+        """
+
+        return self._find(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Under the lock of key's stripe, removes key from its bucket (if present) and decrements size.
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._acquire(hash_value)
+        try:
+            if bucket.remove(key, hash_value):
+                self._counts[stripe] -= 1
+        finally:
+            self._locks[stripe].release()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array of (key, value) tuples, a consistent snapshot taken with every stripe locked.
+        """
+
+        self._acquire_all()
+        try:
+            buckets, capacity = self._table
+            da = DynamicArray()
+            for idx in range(capacity):
+                for node in buckets[idx]:
+                    da.append((node.key, node.value))
+            return da
+        finally:
+            self._release_all()
+
+    def clear(self) -> None:
+        """
+        Replaces the table with one of empty buckets of the same capacity, and sets size to 0.
+        """
+
+        self._acquire_all()
+        try:
+            self._table = self._new_table(self._table[1])
+            self._counts = [0] * len(self._locks)
+        finally:
+            self._release_all()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+
+    print("\nconcurrent increment")
+    print("--------------------")
+    m = HashMap(11, hash_function_2, stripes=4)
+    workers = [threading.Thread(target=lambda: [m.increment('key' + str(i % 50)) for i in range(5000)])
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print(m.get_size(), m.get('key0'), sum(value for _, value in m.get_keys_and_values()._data))
@@ -0,0 +1,382 @@
+# Description: Cuckoo HashMap. Same public API as hash_map_oa.HashMap, but every key has
+#              exactly two candidate buckets, one per hash function, so a lookup examines
+#              at most two buckets (plus a small stash of keys that could not be placed).
+#              Inserts evict the occupant of a full bucket to its other bucket, for a bounded
+#              number of kicks; a key still homeless after that goes to the stash, and the
+#              table grows once the stash overflows.
+
+from a6_include import CuckooEntry, DynamicArray, hash_function_1, hash_function_2, make_siphash
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, seed: int = 0, max_load: float = 0.45,
+                 max_kicks: int = 32, stash_size: int = 4, second_function: callable = None) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution.
+        function gives each key its first bucket; SipHash-2-4 keyed by seed (see make_siphash) its second.
+        second_function replaces the SipHash function; it must be independent of function, since two keys
+        with the same pair of buckets can only be told apart by the stash. The pure-Python SipHash costs
+        several microseconds per call, which a C-backed seeded hash (e.g. hash((seed, key))) avoids.
+        The table doubles once the load factor reaches max_load: two-choice cuckoo hashing with one entry
+        per bucket stops finding free buckets reliably around a load of 0.5.
+        An insert evicts at most max_kicks entries before the last one evicted goes to the stash,
+        and the table grows once the stash holds more than stash_size entries.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be in (0, 1)")
+        if max_kicks < 1:
+            raise ValueError("max_kicks must be at least 1")
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._stash = []
+
+        self._hash_function = function
+        self._second_hash_function = second_function or make_siphash(seed)
+        self._size = 0
+
+        self._max_load = max_load
+        self._max_kicks = max_kicks
+        self._stash_size = stash_size
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        for entry in self._stash:
+            out += 'stash: ' + str(entry) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_stash_size(self) -> int:
+        """
+        Return number of entries currently in the stash
+        """
+        return len(self._stash)
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash_value: int) -> CuckooEntry:
+        """
+        Returns the entry with key, or None.
+        Checks the first bucket, then the second, then the stash. The second (SipHash) hash is
+        only computed when the first bucket does not hold the key.
+        """
+
+        buckets = self._buckets
+        entry = buckets[hash_value % self._capacity]
+        if entry is not None and entry.hash == hash_value and entry.key == key:
+            return entry
+
+        hash2 = self._second_hash_function(key)
+        entry = buckets[hash2 % self._capacity]
+        if entry is not None and entry.hash2 == hash2 and entry.key == key:
+            return entry
+
+        for entry in self._stash:
+            if entry.key == key:
+                return entry
+        return None
+
+    def _place(self, entry: CuckooEntry) -> CuckooEntry:
+        """
+        Places entry (whose key is not in the table) into one of its two buckets.
+        If both are taken, entry takes its first bucket and the occupant is moved to its other bucket,
+        evicting that bucket's occupant in turn, for at most max_kicks evictions.
+        Returns None once every entry has a bucket, or else the entry left without one.
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+
+        iter_index = entry.hash % capacity
+        if buckets[iter_index] is None:
+            buckets[iter_index] = entry
+            return None
+
+        other_index = entry.hash2 % capacity
+        if buckets[other_index] is None:
+            buckets[other_index] = entry
+            return None
+
+        for _ in range(self._max_kicks):
+            entry, buckets[iter_index] = buckets[iter_index], entry
+
+            # the evicted entry moves to whichever of its buckets it was not in
+            first_index = entry.hash % capacity
+            iter_index = entry.hash2 % capacity if iter_index == first_index else first_index
+            if buckets[iter_index] is None:
+                buckets[iter_index] = entry
+                return None
+        return entry
+
+    def put(self, key: str, value: object) -> None:
+        """
+        If key is found in either of its buckets or the stash, updates value.
+        Otherwise, first checks to see if table load is >= max_load, and calls resize function
+        to double capacity if true. Then places a new entry (see _place); an entry left without a bucket
+        goes to the stash, and the table is doubled once the stash overflows.
+        """
+
+        # same lookup as _find, keeping the second hash for the new entry
+        buckets = self._buckets
+        hash_value = self._hash_function(key)
+        entry = buckets[hash_value % self._capacity]
+        if entry is not None and entry.hash == hash_value and entry.key == key:
+            entry.value = value
+            return
+
+        hash2 = self._second_hash_function(key)
+        entry = buckets[hash2 % self._capacity]
+        if entry is not None and entry.hash2 == hash2 and entry.key == key:
+            entry.value = value
+            return
+
+        for entry in self._stash:
+            if entry.key == key:
+                entry.value = value
+                return
+
+        if self.table_load() >= self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        homeless = self._place(CuckooEntry(key, value, hash_value, hash2))
+        self._size += 1
+        if homeless is not None:
+            self._stash.append(homeless)
+            if len(self._stash) > self._stash_size:
+                self.resize_table(self._capacity * 2)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes table to new_capacity.
+        First checks if given new_capacity is < current size (amount of elements), returns if true.
+        Sets new_capacity to next prime number of given new_capacity (if not already prime),
+        doubling further if needed to keep the load factor below max_load.
+        Every entry, stash included, is placed into the new table using its stored hashes.
+        Should the stash overflow while doing so, the table is rebuilt at double the capacity.
+        """
+
+        if new_capacity < self._size:
+            return
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        entries = [self._buckets[idx] for idx in range(self._capacity) if self._buckets[idx] is not None]
+        entries += self._stash
+
+        while True:
+            self._buckets = DynamicArray([None] * new_capacity)
+            self._capacity = new_capacity
+            self._stash = []
+
+            for entry in entries:
+                homeless = self._place(entry)
+                if homeless is not None:
+                    self._stash.append(homeless)
+                    if len(self._stash) > self._stash_size:
+                        break
+            else:
+                return
+            new_capacity = self._next_prime(new_capacity * 2)
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets (stashed entries do not occupy a bucket).
+        """
+
+        return self._capacity - self._size + len(self._stash)
+
+    def get(self, key: str) -> object:
+        """
+        If key found in one of its two buckets or the stash, returns its value.
+        Otherwise, returns None.
+        """
+
+        entry = self._find(key, self._hash_function(key))
+        if entry is None:
+            return None
+        return entry.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key is in one of its two buckets or the stash.
+        Returns Boolean.
+        """
+
+        if self._size == 0:
+            return False
+
+        return self._find(key, self._hash_function(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes key from its bucket or the stash, and decrements size.
+        A freed bucket is refilled from the stash if a stashed entry has it as one of its buckets.
+        """
+
+        entry = self._find(key, self._hash_function(key))
+        if entry is None:
+            return
+        self._size -= 1
+
+        capacity = self._capacity
+        for iter_index in (entry.hash % capacity, entry.hash2 % capacity):
+            if self._buckets[iter_index] is entry:
+                break
+        else:
+            self._stash.remove(entry)
+            return
+
+        self._buckets[iter_index] = None
+        for idx, stashed in enumerate(self._stash):
+            if stashed.hash % capacity == iter_index or stashed.hash2 % capacity == iter_index:
+                self._buckets[iter_index] = self._stash.pop(idx)
+                break
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array, which is a list of tuples with key/value pairs of each entry,
+        in bucket order followed by the stash.
+        """
+
+        da = DynamicArray()
+        for idx in range(self._capacity):
+            entry = self._buckets[idx]
+            if entry is not None:
+                da.append((entry.key, entry.value))
+        for entry in self._stash:
+            da.append((entry.key, entry.value))
+        return da
+
+    def clear(self) -> None:
+        """
+        Clears each bucket to be None, empties the stash, and sets the size data member to 0.
+        """
+
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._stash = []
+        self._size = 0
+
+    def __iter__(self):
+        """
+        Initializes a data member _iter_index to 0, so that iteration can be performed.
+        Returns self.
+        """
+
+        self._iter_index = 0
+        return self
+
+    def __next__(self):
+        """
+        Advances self._iter_index over the buckets and then the stash, returning each entry.
+        Raise StopIteration once all entries returned.
+        """
+
+        while self._iter_index < self._capacity:
+            entry = self._buckets[self._iter_index]
+            self._iter_index += 1
+            if entry is not None:
+                return entry
+
+        stash_index = self._iter_index - self._capacity
+        if stash_index < len(self._stash):
+            self._iter_index += 1
+            return self._stash[stash_index]
+        raise StopIteration
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity(), m.get_stash_size())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+
+    print("\nget_keys_and_values / resize")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
+
+    print("\n__iter__(), __next__()")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
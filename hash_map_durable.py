@@ -0,0 +1,486 @@
+# Description: Write-ahead log that makes an open addressing HashMap survive a crash.
+#              DurableHashMap applies every put / remove to a hash_map_oa.HashMap and appends it
+#              to a log file in a directory; sync decides how soon the log reaches the disk.
+#              Opening the directory again rebuilds the map from the latest snapshot (see
+#              hash_map_snapshot) and replays the log written since. Compaction starts a new log
+#              and writes the live entries to a new snapshot in a background thread, after which
+#              the log and snapshot it replaces are deleted.
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+import hash_map_oa
+import hash_map_snapshot
+from a6_include import DynamicArray, gc_paused, hash_function_1
+
+SYNC_MODES = ('always', 'group', 'os')
+
+PUT = 0
+REMOVE = 1
+CLEAR = 2
+
+# record: header (payload length, CRC-32 of the payload), then payload: operation, key length,
+# UTF-8 key and, for PUT, the pickled value
+_HEADER = struct.Struct('<II')
+_OPERATION = struct.Struct('<BI')
+
+
+def encode_record(operation: int, key: str = '', value: object = None) -> bytes:
+    """
+    Returns the log record of operation (PUT, REMOVE or CLEAR) on key.
+    """
+
+    key = key.encode()
+    payload = _OPERATION.pack(operation, len(key)) + key
+    if operation == PUT:
+        payload += pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def replay(path: str, hash_map) -> int:
+    """
+    Applies the records of the log at path to hash_map, in order. A record cut short or failing its
+    checksum (the tail of a write interrupted by a crash) ends the log: the file is truncated to the
+    records before it, so that appending can resume. A whole record with an operation other than
+    PUT / REMOVE / CLEAR raises ValueError rather than being guessed at. Returns the number of records applied.
+    """
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    offset = 0
+    applied = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+
+        operation, key_length = _OPERATION.unpack_from(payload)
+        key = payload[_OPERATION.size:_OPERATION.size + key_length].decode()
+        if operation == PUT:
+            hash_map.put(key, pickle.loads(payload[_OPERATION.size + key_length:]))
+        elif operation == REMOVE:
+            hash_map.remove(key)
+        elif operation == CLEAR:
+            hash_map.clear()
+        else:
+            raise ValueError(f"{path}: unknown log operation {operation} at offset {offset}")
+        applied += 1
+        offset = start + length
+
+    if offset < len(data):
+        with open(path, 'r+b') as file:
+            file.truncate(offset)
+            os.fsync(file.fileno())
+    return applied
+
+
+class DurableHashMap:
+    def __init__(self, directory: str, capacity: int = 11, function: callable = hash_function_1,
+                 sync: str = 'group', flush_interval: float = 0.01, group_bytes: int = 1 << 20,
+                 compact_bytes: int = 64 << 20, **kwargs) -> None:
+        """
+        Opens the durable map kept in directory (created if missing), recovering its contents from the
+        latest snapshot and log there. Other keyword arguments go to the hash_map_oa.HashMap constructor.
+        sync sets when a logged operation reaches the disk:
+        - 'always': the log is fsynced before every put / remove returns; nothing acknowledged is lost.
+        - 'group': records are buffered and a background thread writes and fsyncs them every flush_interval
+          seconds, so one fsync commits every operation of the interval; a crash loses at most the last
+          flush_interval seconds. The buffer is handed to the OS early once it holds group_bytes.
+        - 'os': every record is written to the OS before put / remove returns, without fsync; it survives
+          the process crashing, not the machine.
+        flush() commits everything logged so far in any mode. Once the log holds compact_bytes, the map is
+        compacted in the background (see compact); None leaves compaction to the caller.
+        Snapshots store each key's hash, which only saves work on recovery with a deterministic function
+        (not builtin hash of str); any function recovers correctly.
+        """
+        if sync not in SYNC_MODES:
+            raise ValueError("sync must be one of " + ", ".join(SYNC_MODES))
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if group_bytes < 1:
+            raise ValueError("group_bytes must be at least 1")
+        if compact_bytes is not None and compact_bytes < 1:
+            raise ValueError("compact_bytes must be at least 1 (or None)")
+
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._sync = sync
+        self._flush_interval = flush_interval
+        self._group_bytes = group_bytes
+        self._compact_bytes = compact_bytes
+
+        # _file_lock serializes writes to the log file, fsyncs and log rotation; _pending_lock only
+        # guards the buffer of records not yet written, so a put never waits for an fsync in 'group' mode
+        self._file_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending = []
+        self._pending_bytes = 0
+        self._unsynced = False
+
+        # first OSError raised in a background thread, re-raised to the caller by the next operation
+        self._error = None
+        self._compaction = None
+        self._closed = threading.Event()
+
+        self._map, self._generation = self._recover(capacity, function, kwargs)
+        self._log = open(self._path('log', self._generation), 'ab', buffering=0)
+        self._log_bytes = os.fstat(self._log.fileno()).st_size
+        self._sync_directory()
+
+        self._flusher = None
+        if sync == 'group':
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    def table_load(self) -> float:
+        """
+        Return load factor of map
+        """
+        return self._map.table_load()
+
+    def get_map(self) -> object:
+        """
+        Return the wrapped HashMap
+        """
+        return self._map
+
+    def get_log_bytes(self) -> int:
+        """
+        Return size of the current log in bytes, including records not yet written to it
+        """
+        return self._log_bytes
+
+    # ------------------------------------------------------------------ #
+
+    def _path(self, kind: str, generation: int) -> str:
+        """
+        Returns the path of the log or snapshot (kind) of generation.
+        """
+
+        return os.path.join(self._directory, kind + '.' + str(generation))
+
+    def _generations(self, kind: str) -> list:
+        """
+        Returns the sorted generations of the logs or snapshots (kind) in the directory.
+        """
+
+        generations = []
+        for name in os.listdir(self._directory):
+            prefix, _, suffix = name.partition('.')
+            if prefix == kind and suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+    def _sync_directory(self) -> None:
+        """
+        fsyncs the directory, so that files created, renamed or deleted in it survive a crash.
+        """
+
+        descriptor = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def _recover(self, capacity: int, function: callable, kwargs: dict) -> tuple:
+        """
+        Rebuilds the map: snapshot g holds every operation logged before log g, so the newest snapshot is
+        loaded and the logs from its generation on are replayed. Files older than that snapshot (left by
+        a crash during compaction) are deleted. Returns (map, generation of the log to append to).
+        """
+
+        for name in os.listdir(self._directory):
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(self._directory, name))
+
+        snapshots = self._generations('snapshot')
+        base = snapshots[-1] if snapshots else 0
+        if snapshots:
+            hash_map = hash_map_oa.HashMap.load(self._path('snapshot', base), function, **kwargs)
+        else:
+            hash_map = hash_map_oa.HashMap(capacity, function, **kwargs)
+
+        logs = self._generations('log')
+        # every logged put unpickles a value and may add a HashEntry
+        with gc_paused():
+            for generation in logs:
+                if generation >= base:
+                    replay(self._path('log', generation), hash_map)
+
+        for kind, generations in (('snapshot', snapshots), ('log', logs)):
+            for generation in generations:
+                if generation < base:
+                    os.remove(self._path(kind, generation))
+        return hash_map, max(logs + [base])
+
+    def _check_error(self) -> None:
+        """
+        Raises the error a background thread failed with, if any.
+        """
+
+        if self._error is not None:
+            raise self._error
+
+    def _append(self, record: bytes) -> None:
+        """
+        Logs record as sync requires. Called before the operation is applied to the map (write-ahead).
+        """
+
+        self._check_error()
+        if self._sync == 'group':
+            with self._pending_lock:
+                self._pending.append(record)
+                self._pending_bytes += len(record)
+                full = self._pending_bytes >= self._group_bytes
+            if full:
+                with self._file_lock:
+                    self._write_pending()
+            self._log_bytes += len(record)
+        else:
+            # under _file_lock, so that a compaction never swaps the log out from under the write
+            with self._file_lock:
+                self._log.write(record)
+                if self._sync == 'always':
+                    os.fsync(self._log.fileno())
+                else:
+                    self._unsynced = True
+                self._log_bytes += len(record)
+
+    def _compact_if_due(self) -> None:
+        """
+        Starts a compaction once the log holds compact_bytes. Called after the operation just logged
+        has been applied, since the compaction copies the map and retires the log holding the record.
+        """
+
+        if self._compact_bytes is not None and self._log_bytes >= self._compact_bytes:
+            self.compact()
+
+    def _write_pending(self) -> None:
+        """
+        Writes the buffered records to the log file (without fsync). Caller holds _file_lock.
+        """
+
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = []
+            self._pending_bytes = 0
+        if pending:
+            self._log.write(b''.join(pending))
+            self._unsynced = True
+
+    def flush(self) -> None:
+        """
+        Writes and fsyncs every operation logged so far.
+        """
+
+        self._check_error()
+        with self._file_lock:
+            self._write_pending()
+            if self._unsynced:
+                os.fsync(self._log.fileno())
+                self._unsynced = False
+
+    def _flush_periodically(self) -> None:
+        """
+        Group commit: flushes every flush_interval seconds until the map is closed.
+        """
+
+        while not self._closed.wait(self._flush_interval):
+            try:
+                self.flush()
+            except OSError as error:
+                self._error = error
+                return
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Logs key / value, then puts it in the map.
+        """
+
+        # a value that cannot be pickled raises here, before anything is logged or changed
+        self._append(encode_record(PUT, key, value))
+        self._map.put(key, value)
+        self._compact_if_due()
+
+    def get(self, key: str) -> object:
+        """
+        Returns value of key, or None if key is absent.
+        """
+
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key exists in map, returns Boolean.
+        """
+
+        return self._map.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Logs the removal of key, then removes it from the map, if key is present.
+        The removal is logged even when key is absent (replaying it changes nothing),
+        so that key is probed for once rather than checked for before logging.
+        """
+
+        self._append(encode_record(REMOVE, key))
+        self._map.remove(key)
+        self._compact_if_due()
+
+    def clear(self) -> None:
+        """
+        Logs the clear, then removes every entry.
+        """
+
+        self._append(encode_record(CLEAR))
+        self._map.clear()
+        self._compact_if_due()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array of (key, value) tuples.
+        """
+
+        return self._map.get_keys_and_values()
+
+    # ------------------------------------------------------------------ #
+
+    def compact(self, wait: bool = False) -> None:
+        """
+        Replaces the log with a snapshot of the live entries. The entries are copied and a new log is
+        started right away; a background thread then writes the snapshot and deletes the files it
+        replaces, while operations keep being logged to the new log. Does nothing if a compaction is
+        still running, unless wait is True, in which case it waits for that one and for its own.
+        Values are pickled by the background thread, so they must not be mutated in place meanwhile.
+        """
+
+        self._check_error()
+        if self._compaction is not None and self._compaction.is_alive():
+            if not wait:
+                return
+            self._compaction.join()
+            self._check_error()
+
+        entries = [(entry.key, entry.value, entry.hash) for entry in self._map]
+        generation = self._generation + 1
+        with self._file_lock:
+            self._write_pending()
+            os.fsync(self._log.fileno())
+            self._unsynced = False
+            self._log.close()
+            self._log = open(self._path('log', generation), 'ab', buffering=0)
+            self._log_bytes = 0
+        self._sync_directory()
+        self._generation = generation
+
+        self._compaction = threading.Thread(target=self._write_snapshot, args=(entries, generation))
+        self._compaction.start()
+        if wait:
+            self._compaction.join()
+            self._check_error()
+
+    def _write_snapshot(self, entries: list, generation: int) -> None:
+        """
+        Background part of compact: saves entries as snapshot generation, then deletes older files.
+        """
+
+        try:
+            hash_map_snapshot.save(self._path('snapshot', generation), entries)
+            self._sync_directory()
+            for kind in ('snapshot', 'log'):
+                for older in self._generations(kind):
+                    if older < generation:
+                        os.remove(self._path(kind, older))
+        except OSError as error:
+            self._error = error
+
+    def close(self) -> None:
+        """
+        Waits for any compaction, commits the log and closes it.
+        """
+
+        if self._compaction is not None:
+            self._compaction.join()
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self.flush()
+        finally:
+            self._log.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    from a6_include import hash_function_fnv1a
+
+    directory = tempfile.mkdtemp()
+    for sync in SYNC_MODES:
+        print("\nsync=" + sync)
+        print("-" * (5 + len(sync)))
+        path = os.path.join(directory, sync)
+        m = DurableHashMap(path, 11, hash_function_fnv1a, sync=sync)
+        for i in range(100):
+            m.put('str' + str(i), [i, 'value' + str(i)])
+        for i in range(0, 100, 3):
+            m.remove('str' + str(i))
+        m.flush()
+        print(m.get_size(), m.get('str4'), m.get('str3'), m.get_log_bytes())
+
+        # a process that stops without close: everything flushed is recovered from the log
+        recovered = DurableHashMap(path, 11, hash_function_fnv1a, sync=sync)
+        print(recovered.get_size(), recovered.get('str4'), recovered.contains_key('str3'))
+        m.close()
+
+        recovered.compact(wait=True)
+        recovered.put('after', 'compaction')
+        recovered.close()
+        print(sorted(os.listdir(path)))
+        reopened = DurableHashMap(path, 11, hash_function_fnv1a, sync=sync)
+        print(reopened.get_size(), reopened.get('after'), reopened.get('str98'))
+        reopened.close()
+
+    # a torn record at the end of the log is dropped on recovery
+    path = os.path.join(directory, 'torn')
+    m = DurableHashMap(path, sync='always')
+    m.put('kept', 1)
+    m.put('torn', 2)
+    m.close()
+    log = os.path.join(path, 'log.0')
+    with open(log, 'r+b') as file:
+        file.truncate(os.path.getsize(log) - 3)
+    m = DurableHashMap(path, sync='always')
+    print(m.get('kept'), m.get('torn'), m.get_size())
+    m.close()
+
+    try:
+        DurableHashMap(path, sync='sometimes')
+    except ValueError as error:
+        print('ValueError:', error)
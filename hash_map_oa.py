@@ -5,17 +5,59 @@
 # Due Date: 8/13/24
 # Description: Open Addressing HashMap
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+import time
+
+import hash_map_snapshot
+from a6_include import (DynamicArray, DynamicArrayException, HashEntry, ItemsView, KeysView, OperationStats,
+                        RobinHoodEntry, ValuesView, as_list, gc_paused, hash_keys, hash_function_1, hash_function_2)
+
+# placed in old-table slots whose entry has been moved by an incremental resize;
+# it is a tombstone, so probe sequences through the slot stay intact
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function,
+                 incremental: bool = False, migrate_step: int = 8,
+                 max_tombstone_ratio: float = 0.25,
+                 max_load: float = 0.5, min_load: float = 0.0, growth_factor: float = 2.0,
+                 probing: str = 'quadratic', stats_sample: int = 0) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        If incremental is True, growing the table does not rehash everything at once:
+        each later put/get/remove migrates up to migrate_step old slots into the new table.
+        Once tombstones make up max_tombstone_ratio of the buckets, remove compacts the table
+        (rehash at the same capacity); None turns automatic compaction off.
+        The table grows by growth_factor once the load factor reaches max_load, and remove shrinks it
+        by growth_factor (never below the initial capacity) once the load factor drops under min_load.
+        min_load 0 turns shrinking off. Quadratic probing only reaches about half of the buckets
+        from any start, so max_load above 0.5 can leave keys with no free bucket on their probe path.
+        probing='robin_hood' uses linear probing with Robin Hood displacement instead: each entry records
+        its probe distance, an insert takes the slot of any entry closer to its home bucket, lookup misses
+        stop as soon as they pass such an entry, and remove shifts the following entries back instead of
+        leaving a tombstone. Every bucket is reachable, so max_load may go up to (not including) 1.
+        Robin Hood probing cannot be combined with incremental resizing, since the backward shifts of
+        remove would move old-table entries across the migration cursor.
+        stats_sample N >= 1 turns on stats (see stats): one in every N get / put / remove is measured.
         """
+        if probing not in ('quadratic', 'robin_hood'):
+            raise ValueError("probing must be 'quadratic' or 'robin_hood'")
+        if probing == 'quadratic' and not 0 < max_load <= 0.5:
+            raise ValueError("max_load must be in (0, 0.5] for quadratic probing")
+        if probing == 'robin_hood':
+            if not 0 < max_load < 1:
+                raise ValueError("max_load must be in (0, 1) for Robin Hood probing")
+            if incremental:
+                raise ValueError("incremental resizing is not supported with Robin Hood probing")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if not 0 <= min_load < max_load / growth_factor:
+            raise ValueError("min_load must be in [0, max_load / growth_factor), or resizes would oscillate")
+        if stats_sample < 0:
+            raise ValueError("stats_sample must be at least 0")
+
         self._buckets = DynamicArray()
 
         # capacity must be a prime number
@@ -26,11 +68,39 @@ class HashMap:
         self._hash_function = function
         self._size = 0
 
+        # resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._growth_factor = growth_factor
+        self._min_capacity = self._capacity
+
+        # Robin Hood probing (linear, with backward-shift deletion) instead of quadratic probing
+        self._robin_hood = probing == 'robin_hood'
+
+        # tombstones currently in self._buckets (not counting the old table of an incremental resize)
+        self._tombstones = 0
+        self._max_tombstone_ratio = max_tombstone_ratio
+
+        # old buckets and migration cursor while an incremental resize is in progress
+        self._incremental = incremental
+        self._migrate_step = max(1, migrate_step)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+        # live entries still waiting in the old table, so that empty_buckets need not complete the resize
+        self._old_size = 0
+
+        # bumped whenever an entry is added or removed or the table is replaced, so that iterators fail fast
+        self._version = 0
+
+        # sampled operation stats, or None when off
+        self._stats = OperationStats(stats_sample) if stats_sample else None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_rehash()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -83,36 +153,104 @@ class HashMap:
         """
         return self._capacity
 
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstones in the table
+        """
+        return self._tombstones
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
         """
-        First checks to see if table load is >= 0.5, and calls resize function to double capacity if true.
+        First checks to see if table load is >= max_load, and calls resize function to grow capacity if true.
+        (In incremental mode, starts an incremental resize instead.)
         Perform quadratic probing to find HashEntry with key.
         If HashEntry found, updates value.
-        Otherwise, insert new entry at last checked index.
+        Otherwise, insert new entry at the first tombstone passed, or else the empty bucket that ended the probe.
         """
 
-        # Double capacity if table load >= 0.5
-        if self.table_load() >= 0.5:
-            self.resize_table(self._capacity * 2)
+        entry, hash_value, index = self._locate(key)
+        if entry:
+            entry.value = value
+            return
+        self._insert(key, value, hash_value, index)
+
+    def _locate(self, key: str) -> tuple:
+        """
+        First half of put, shared with setdefault / get_or_insert / update / increment:
+        migrates and grows the table as put does, then hashes key once and probes once.
+        Returns (entry, hash_value, index): the live HashEntry with key (an entry still waiting in the
+        old table of an incremental resize counts) or None, and if None, the bucket for a new entry.
+        """
+
+        if self._stats is not None:
+            self._sample('put', key)
+
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        # Grow capacity if table load >= max_load
+        if self.table_load() >= self._max_load:
+            # leave room for the entry about to be inserted as well
+            new_capacity = max(self._grown(self._capacity), self.capacity_for(self._size + 1))
+            if self._incremental:
+                self._start_rehash(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+
+        hash_value = self._hash_function(key)
+
+        if self._robin_hood:
+            entry, index = self._slot_robin_hood(key, hash_value)
+            return entry, hash_value, index
+
+        # an entry still waiting in the old table is updated where it is
+        if self._old_buckets is not None:
+            entry = self._probe(self._old_buckets, self._old_capacity, key, hash_value)
+            if entry:
+                return entry, hash_value, None
 
         # calculate hash index and initialize variables for quadratic probing
-        initial_index = self._hash_function(key) % self._capacity
+        initial_index = hash_value % self._capacity
         iter_index = initial_index
         count = 0
+        free_index = None
 
         # quadratic probing: while key not found, quadratically probe from initial hash index
-        while self._buckets[iter_index] and not self._buckets[iter_index].is_tombstone:
-            if self._buckets[iter_index].key == key:
-                self._buckets[iter_index].value = value
-                return
+        # the key may sit beyond a tombstone, so the probe only stops at an empty bucket
+        # (or once the probe sequence starts repeating, if tombstones have filled every empty bucket)
+        while count < self._capacity and self._buckets[iter_index]:
+            entry = self._buckets[iter_index]
+            if entry.is_tombstone:
+                if free_index is None:
+                    free_index = iter_index
+            elif entry.hash == hash_value and entry.key == key:
+                return entry, hash_value, None
             count += 1
             iter_index = (initial_index + (count ** 2)) % self._capacity  # quadratic probing
 
-        # if no key found, insert new HashEntry with key/value pair, and increment size
-        self._buckets[iter_index] = HashEntry(key, value)
+        # a new entry goes to the first tombstone passed, or else the empty bucket that ended the probe
+        if free_index is None:
+            free_index = iter_index
+        return None, hash_value, free_index
+
+    def _insert(self, key: str, value: object, hash_value: int, index: int) -> None:
+        """
+        Second half of put: stores a new entry for key at index (as returned by _locate), and increments size.
+        With Robin Hood probing, the entries from index on are displaced as needed.
+        """
+
+        if self._robin_hood:
+            entry = RobinHoodEntry(key, value, hash_value)
+            entry.distance = (index - hash_value % self._capacity) % self._capacity
+            self._place_robin_hood(entry, index)
+        else:
+            if self._buckets[index] is not None and self._buckets[index].is_tombstone:
+                self._tombstones -= 1
+            self._buckets[index] = HashEntry(key, value, hash_value)
         self._size += 1
+        self._version += 1
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -121,16 +259,25 @@ class HashMap:
         Sets new_capacity to next prime number of given new_capacity (if not already prime).
         Creates new_capacity amount of buckets containing None stored in a Dynamic Array ADT.
         Saves old buckets and updates data members to reflect new values.
-        Copies/inserts old buckets and entries into updated structure.
+        Moves old entries into updated structure (see _rehash).
+        Any incremental resize still in progress is completed first.
         """
 
+        self._finish_rehash()
+
         if new_capacity < self._size:
             return
+        start = time.perf_counter()
 
         # create new capacity of next prime number from given value
         if not self._is_prime(new_capacity):
             new_capacity = self._next_prime(new_capacity)
 
+        # keep growing until the entries fit under the load factor, so that
+        # the rehash itself never has to trigger a nested resize
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(self._grown(new_capacity))
+
         # append new_capacity amount of new empty buckets
         # each bucket is None, but will be a HashEntry, that is stored in a Dynamic Array ADT
         new_buckets = DynamicArray()
@@ -141,14 +288,292 @@ class HashMap:
         old_buckets = self._buckets
         self._buckets = new_buckets
         self._capacity = new_capacity
-        self._size = 0
 
-        # copy/insert old_buckets and entries
-        # 'put' function performs quadratic probing
+        self._rehash(old_buckets)
+        self._tombstones = 0
+        self._version += 1
+        if self._stats is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _rehash(self, old_buckets: DynamicArray) -> None:
+        """
+        Moves every live HashEntry from old_buckets into self._buckets.
+        Keys are already unique and the new table holds no tombstones, so each entry is placed in the
+        first empty slot of its quadratic probe sequence: no key comparison, no new HashEntry,
+        and no load factor check per entry. Each entry's stored hash is reused, so the hash function
+        is not called. Tombstones are dropped. Size is unchanged.
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+
+        if self._robin_hood:
+            for idx in range(old_buckets.length()):
+                entry = old_buckets[idx]
+                if entry:
+                    entry.distance = 0
+                    self._place_robin_hood(entry, entry.hash % capacity)
+            return
+
         for idx in range(old_buckets.length()):
             entry = old_buckets[idx]
             if entry and not entry.is_tombstone:
-                self.put(entry.key, entry.value)
+                initial_index = entry.hash % capacity
+                iter_index = initial_index
+                count = 0
+                while buckets[iter_index] is not None:
+                    count += 1
+                    iter_index = (initial_index + count ** 2) % capacity
+                buckets[iter_index] = entry
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize to the next prime >= new_capacity.
+        The current buckets become the old table and are migrated a few slots at a time by _migrate.
+        """
+
+        self._finish_rehash()
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(self._grown(new_capacity))
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._migrate_index = 0
+        self._old_size = self._size
+        self._tombstones = 0
+        self._version += 1
+        if self._stats is not None:
+            self._stats.record_resize(0.0)
+
+    def _migrate(self, step: int) -> None:
+        """
+        Moves the live entries of the next step old slots into the new table,
+        leaving a _MIGRATED tombstone behind in the old slot.
+        Ends the incremental resize once every old slot has been migrated.
+        """
+
+        start = time.perf_counter() if self._stats is not None else 0.0
+        old_buckets = self._old_buckets
+        buckets = self._buckets
+        capacity = self._capacity
+
+        stop = min(self._migrate_index + step, self._old_capacity)
+        for idx in range(self._migrate_index, stop):
+            entry = old_buckets[idx]
+            if entry and not entry.is_tombstone:
+                # a key lives in only one of the tables, so the first free slot can be taken
+                initial_index = entry.hash % capacity
+                iter_index = initial_index
+                count = 0
+                while buckets[iter_index] and not buckets[iter_index].is_tombstone:
+                    count += 1
+                    iter_index = (initial_index + count ** 2) % capacity
+                if buckets[iter_index] is not None:
+                    self._tombstones -= 1
+                buckets[iter_index] = entry
+                old_buckets[idx] = _MIGRATED
+                self._old_size -= 1
+        self._migrate_index = stop
+
+        if stop == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+        if self._stats is not None:
+            self._stats.resize_seconds += time.perf_counter() - start
+
+    def _finish_rehash(self) -> None:
+        """
+        Completes any incremental resize in progress.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def is_incremental(self) -> bool:
+        """
+        Return True if the map was created with incremental=True
+        """
+        return self._incremental
+
+    def is_resizing(self) -> bool:
+        """
+        Return True while an incremental resize is in progress
+        """
+        return self._old_buckets is not None
+
+    def migrate(self, step: int) -> bool:
+        """
+        Migrates up to step more old slots of the incremental resize in progress, if any, for a caller
+        that drives the migration in steps of its own (such as hash_map_async.AsyncHashMap) rather than
+        leaving it to later operations. Returns True while the resize is still in progress.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(max(1, step))
+        return self._old_buckets is not None
+
+    def start_resize(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize to new_capacity (rounded as by resize_table), in either mode,
+        returning without moving anything: later operations and migrate complete it.
+        Returns if new_capacity is < current size. A resize already in progress is completed first,
+        synchronously, so a caller that must not block waits until is_resizing() is False.
+        Not available with Robin Hood probing (see __init__).
+        """
+
+        if self._robin_hood:
+            raise ValueError("incremental resizing is not supported with Robin Hood probing")
+        if new_capacity < self._size:
+            return
+        self._start_rehash(new_capacity)
+
+    def _probe(self, buckets: DynamicArray, capacity: int, key: str, hash_value: int) -> HashEntry:
+        """
+        Performs quadratic probing on buckets for a live entry with key.
+        Stored hashes are compared first, so keys are only compared when the full hashes match.
+        Returns the HashEntry, or None if the probe reaches an empty bucket.
+        """
+
+        if self._robin_hood:
+            idx = self._index_robin_hood(buckets, capacity, key, hash_value)
+            return buckets[idx] if idx >= 0 else None
+
+        initial_index = hash_value % capacity
+        iter_index = initial_index
+        count = 0
+
+        while count < capacity and buckets[iter_index] is not None:
+            entry = buckets[iter_index]
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                return entry
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+        return None
+
+    def _find_entry(self, key: str) -> HashEntry:
+        """
+        Returns the live HashEntry with key, or None.
+        While an incremental resize is in progress, the old table is searched as well.
+        """
+
+        hash_value = self._hash_function(key)
+        entry = self._probe(self._buckets, self._capacity, key, hash_value)
+        if entry is None and self._old_buckets is not None:
+            entry = self._probe(self._old_buckets, self._old_capacity, key, hash_value)
+        return entry
+
+    # ------------------------- Robin Hood probing ------------------------- #
+
+    def _index_robin_hood(self, buckets: DynamicArray, capacity: int, key: str, hash_value: int) -> int:
+        """
+        Performs linear probing on buckets for the entry with key.
+        Entries along a probe path are ordered by probe distance, so a miss stops at the first empty bucket
+        or at the first entry closer to its home bucket than the probe is to the key's home bucket.
+        Returns the bucket index, or -1 if key is absent.
+        """
+
+        iter_index = hash_value % capacity
+        distance = 0
+
+        # bounded, since resize_table(size) can leave a completely full table
+        while distance < capacity:
+            entry = buckets[iter_index]
+            if entry is None or entry.distance < distance:
+                return -1
+            if entry.hash == hash_value and entry.key == key:
+                return iter_index
+            distance += 1
+            iter_index = (iter_index + 1) % capacity
+        return -1
+
+    def _slot_robin_hood(self, key: str, hash_value: int) -> tuple:
+        """
+        Probes for key as _index_robin_hood does, but without a bound (put only runs on a table with
+        free buckets). Returns (entry, iter_index): the entry with key and its bucket, or None and the bucket
+        where a new entry for key belongs (see _place_robin_hood).
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+        iter_index = hash_value % capacity
+        distance = 0
+
+        while True:
+            entry = buckets[iter_index]
+            if entry is None or entry.distance < distance:
+                return None, iter_index
+            if entry.hash == hash_value and entry.key == key:
+                return entry, iter_index
+            distance += 1
+            iter_index = (iter_index + 1) % capacity
+
+    def _put_robin_hood(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Updates the entry with key, or inserts a new RobinHoodEntry where the probe for key stopped,
+        displacing the entries after it as needed. No resize check.
+        """
+
+        entry, iter_index = self._slot_robin_hood(key, hash_value)
+        if entry:
+            entry.value = value
+            return
+        self._insert(key, value, hash_value, iter_index)
+
+    def _place_robin_hood(self, entry: RobinHoodEntry, iter_index: int) -> None:
+        """
+        Places entry (whose key is not in the table, and whose distance matches iter_index)
+        by linear probing from iter_index. Whenever the probe reaches an entry closer to its home bucket,
+        the two swap places and the probe continues with the displaced entry, until an empty bucket is found.
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+
+        while True:
+            current = buckets[iter_index]
+            if current is None:
+                buckets[iter_index] = entry
+                return
+            if current.distance < entry.distance:
+                buckets[iter_index] = entry
+                entry = current
+            entry.distance += 1
+            iter_index = (iter_index + 1) % capacity
+
+    def _remove_robin_hood(self, key: str, hash_value: int) -> int:
+        """
+        Removes the entry with key by backward-shift deletion: the entries after it are moved back one slot
+        (each one step closer to its home bucket) up to the next empty bucket or entry already at home,
+        so no tombstone is left behind. Returns 1 if key was removed, 0 if it was absent.
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+
+        iter_index = self._index_robin_hood(buckets, capacity, key, hash_value)
+        if iter_index < 0:
+            return 0
+
+        next_index = (iter_index + 1) % capacity
+        entry = buckets[next_index]
+        while entry is not None and entry.distance > 0:
+            entry.distance -= 1
+            buckets[iter_index] = entry
+            iter_index = next_index
+            next_index = (next_index + 1) % capacity
+            entry = buckets[next_index]
+        buckets[iter_index] = None
+
+        self._size -= 1
+        self._version += 1
+        return 1
 
     def table_load(self) -> float:
         """
@@ -159,15 +584,74 @@ class HashMap:
 
     def empty_buckets(self) -> int:
         """
-        Counts number of empty buckets, checking to see if each bucket (HashEntry) is None or is tombstone
-        Returns total count of empty buckets.
+        Returns number of empty buckets (None or tombstone). Every other bucket holds one of the size live
+        entries, so this takes O(1). During an incremental resize it counts the buckets of the new table,
+        whose live entries are those not still waiting in the old table; the resize is not advanced.
+        """
+
+        return self._capacity - self._size + self._old_size
+
+    def _probe_length(self, buckets: DynamicArray, capacity: int, key: str, hash_value: int) -> tuple:
+        """
+        Walks the probe sequence of _probe for key on buckets, without changing anything.
+        Returns (number of buckets examined, whether key was found).
         """
 
+        initial_index = hash_value % capacity
+        iter_index = initial_index
         count = 0
-        for idx in range(self._capacity):
-            if self._buckets[idx] is None or self._buckets[idx].is_tombstone:
-                count += 1
-        return count
+
+        while count < capacity:
+            entry = buckets[iter_index]
+            if entry is None or (self._robin_hood and entry.distance < count):
+                return count + 1, False
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                return count + 1, True
+            count += 1
+            if self._robin_hood:
+                iter_index = (iter_index + 1) % capacity
+            else:
+                iter_index = (initial_index + count ** 2) % capacity
+        return count, False
+
+    def _sample(self, operation: str, key: str) -> None:
+        """
+        Counts operation on key for stats; if it is one to measure, records how many buckets its probe
+        examines (in both tables during an incremental resize) and whether key is present.
+        """
+
+        stats = self._stats
+        stats.countdown -= 1
+        if stats.countdown:
+            return
+        stats.countdown = stats.sample
+
+        hash_value = self._hash_function(key)
+        probes, found = self._probe_length(self._buckets, self._capacity, key, hash_value)
+        if not found and self._old_buckets is not None:
+            old_probes, found = self._probe_length(self._old_buckets, self._old_capacity, key, hash_value)
+            probes += old_probes
+        stats.record(operation, probes, found)
+
+    def stats(self, reset: bool = False) -> dict:
+        """
+        Returns a snapshot of the map's stats as a dict of plain values (for a metrics pipeline): size,
+        capacity, load factor, tombstones, whether an incremental resize is in progress and empty buckets
+        (as empty_buckets), and with stats_sample on, the operations counted, resize
+        count and time, and per operation (get, put, remove) the measured count, hits, misses, hit ratio,
+        mean / max probes and a histogram of probes (see OperationStats.as_dict).
+        contains_key counts as a get, and setdefault / get_or_insert / update / increment as a put;
+        batch operations are not counted. reset=True zeroes the counters once the snapshot is taken.
+        """
+
+        out = {'size': self._size, 'capacity': self._capacity, 'load': self.table_load(),
+               'tombstones': self._tombstones, 'resizing': self._old_buckets is not None,
+               'empty_buckets': self.empty_buckets()}
+        if self._stats is not None:
+            out.update(self._stats.as_dict('probes'))
+            if reset:
+                self._stats.reset()
+        return out
 
     def get(self, key: str) -> object:
         """
@@ -175,15 +659,15 @@ class HashMap:
         Otherwise, returns None.
         """
 
-        initial_index = self._hash_function(key) % self._capacity
-        iter_index = initial_index
-        count = 0
+        if self._stats is not None:
+            self._sample('get', key)
 
-        while self._buckets[iter_index] is not None:
-            if (self._buckets[iter_index].key == key) and not self._buckets[iter_index].is_tombstone:
-                return self._buckets[iter_index].value
-            count += 1
-            iter_index = (initial_index + count ** 2) % self._capacity
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        entry = self._find_entry(key)
+        if entry:
+            return entry.value
         return None
 
     def contains_key(self, key: str) -> bool:
@@ -192,43 +676,163 @@ class HashMap:
         Returns Boolean.
         """
 
+        if self._stats is not None:
+            self._sample('get', key)
+
         if self._size == 0:
             return False
 
-        initial_index = self._hash_function(key) % self._capacity
-        iter_index = initial_index
-        count = 0
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
 
-        while self._buckets[iter_index]:
-            if (self._buckets[iter_index].key == key) and not self._buckets[iter_index].is_tombstone:
-                return True
-            count += 1
-            iter_index = (initial_index + count ** 2) % self._capacity
-        return False
+        return self._find_entry(key) is not None
 
     def remove(self, key: str) -> None:
         """
         Performs quadratic probing to find bucket with entry containing key.
         If found, sets is_tombstone data member of entry to True, and decrements size.
+        Compacts the table once tombstones reach max_tombstone_ratio of the buckets.
         """
 
-        initial_index = self._hash_function(key) % self._capacity
-        iter_index = initial_index
-        count = 0
+        if self._stats is not None:
+            self._sample('remove', key)
+
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        hash_value = self._hash_function(key)
+
+        if self._robin_hood:
+            if self._remove_robin_hood(key, hash_value):
+                self._shrink_or_compact()
+            return
 
-        while self._buckets[iter_index]:
-            if (self._buckets[iter_index].key == key) and not self._buckets[iter_index].is_tombstone :
-                self._buckets[iter_index].is_tombstone = True
+        entry = self._probe(self._buckets, self._capacity, key, hash_value)
+        if entry:
+            entry.is_tombstone = True
+            self._size -= 1
+            self._tombstones += 1
+            self._version += 1
+            self._shrink_or_compact()
+            return
+
+        # entries still waiting in the old table are dropped when migration skips their tombstone
+        if self._old_buckets is not None:
+            entry = self._probe(self._old_buckets, self._old_capacity, key, hash_value)
+            if entry:
+                entry.is_tombstone = True
                 self._size -= 1
+                self._old_size -= 1
+                self._version += 1
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of key. If key is absent, first inserts it with value default.
+        Hashes key once and probes once.
+        """
+
+        entry, hash_value, index = self._locate(key)
+        if entry:
+            return entry.value
+        self._insert(key, default, hash_value, index)
+        return default
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        Returns the value of key. If key is absent, first inserts it with value factory()
+        (called only then, so an expensive default is only built when needed).
+        Hashes key once and probes once.
+        """
+
+        entry, hash_value, index = self._locate(key)
+        if entry:
+            return entry.value
+        value = factory()
+        self._insert(key, value, hash_value, index)
+        return value
+
+    def update(self, key: str, function: callable) -> object:
+        """
+        Sets the value of key to function(current value), where the current value is None if key is absent,
+        and returns the new value. Hashes key once and probes once.
+        """
+
+        entry, hash_value, index = self._locate(key)
+        if entry:
+            entry.value = function(entry.value)
+            return entry.value
+        value = function(None)
+        self._insert(key, value, hash_value, index)
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of key, treating an absent key as 0, and returns the new value.
+        Hashes key once and probes once.
+        """
+
+        entry, hash_value, index = self._locate(key)
+        if entry:
+            entry.value += delta
+            return entry.value
+        self._insert(key, delta, hash_value, index)
+        return delta
+
+    def _grown(self, capacity: int) -> int:
+        """
+        Returns capacity scaled up by the growth factor (before rounding to a prime).
+        """
+
+        return max(capacity + 1, int(capacity * self._growth_factor))
+
+    def _shrink_or_compact(self) -> None:
+        """
+        Called after removals. Shrinks the table by the growth factor once the load factor drops under
+        min_load (keeping it at or above the initial capacity and large enough for the current size);
+        otherwise compacts it once tombstones reach max_tombstone_ratio of the buckets.
+        Either rehash also drops every tombstone; in incremental mode, it is started as an incremental resize.
+        Not while an incremental resize is in progress: it is already building a tombstone-free table.
+        """
+
+        if self._old_buckets is not None:
+            return
+
+        if self._min_load and self._capacity > self._min_capacity and self._size / self._capacity < self._min_load:
+            new_capacity = max(self._min_capacity, self.capacity_for(self._size),
+                               int(self._capacity / self._growth_factor))
+            if new_capacity < self._capacity:
+                if self._incremental:
+                    self._start_rehash(new_capacity)
+                else:
+                    self.resize_table(new_capacity)
                 return
-            count += 1
-            iter_index = (initial_index + count ** 2) % self._capacity
+
+        if (self._max_tombstone_ratio is not None
+                and self._tombstones >= self._max_tombstone_ratio * self._capacity):
+            if self._incremental:
+                self._start_rehash(self._capacity)
+            else:
+                self.compact()
+
+    def compact(self) -> None:
+        """
+        Rehashes the table at its current capacity, dropping every tombstone,
+        so that probe sequences only pass live entries again.
+        Any incremental resize in progress is completed first.
+        """
+
+        self._finish_rehash()
+
+        if self._tombstones:
+            self.resize_table(self._capacity)
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         Returns dynamic array, which is a list of tuples with key/value pairs of the HashEntry within each bucket.
         """
 
+        self._finish_rehash()
+
         da = DynamicArray()
 
         for idx in range(self._capacity):
@@ -240,37 +844,250 @@ class HashMap:
     def clear(self) -> None:
         """
         Clears each bucket to be None, and sets the size data member to 0.
+        Any incremental resize in progress is abandoned along with the old buckets.
         """
 
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._old_size = 0
+
         self._buckets = DynamicArray()
 
         for idx in range(self._capacity):
             self._buckets.append(None)
         self._size = 0
+        self._tombstones = 0
+        self._version += 1
 
-    def __iter__(self):
+    def capacity_for(self, expected_size: int) -> int:
+        """
+        Returns the smallest capacity that holds expected_size entries without put triggering a resize
+        (the last insert happens at size expected_size - 1, which must stay under max_load).
+        The table rounds it up to a prime.
+        """
+        return max(1, int((expected_size - 1) / self._max_load) + 1)
+
+    def reserve(self, expected_size: int) -> None:
+        """
+        Resizes once, if needed, so that the map can grow to expected_size entries
+        without any further resize.
+        """
+
+        needed = self.capacity_for(expected_size)
+        if needed > self._capacity:
+            self.resize_table(needed)
+
+    @classmethod
+    def from_items(cls, items, function: callable, expected_size: int = None, **kwargs) -> "HashMap":
+        """
+        Builds a map from items (a DynamicArray or any iterable of (key, value) pairs).
+        The map is reserved for expected_size (default: the number of items) before it is filled,
+        so no resize happens while it is filled. Other keyword arguments go to the constructor.
+        """
+
+        items = as_list(items)
+        if expected_size is None:
+            expected_size = len(items)
+
+        m = cls(1, function, **kwargs)
+        m.reserve(expected_size)
+        m.put_many(items)
+        return m
+
+    @classmethod
+    def load(cls, path: str, function: callable, **kwargs) -> "HashMap":
         """
-        Initializes a data member _iter_index to 0, so that iteration can be performed.
-        Returns self.
+        Builds a map from the snapshot at path (see save), sized for it up front.
+        The keys' stored hashes are reused when they match function, so no key is hashed or compared
+        while the map is filled. Other keyword arguments go to the constructor.
         """
 
-        self._iter_index = 0
-        return self
+        # the decoded keys and values and one HashEntry per entry
+        with gc_paused():
+            entries = hash_map_snapshot.load_entries(path, function)
+            m = cls(1, function, **kwargs)
+            m.reserve(len(entries))
+
+            entry_class = RobinHoodEntry if m._robin_hood else HashEntry
+            m._rehash(DynamicArray([entry_class(key, value, hash_value) for key, value, hash_value in entries]))
+            m._size = len(entries)
+            return m
 
-    def __next__(self):
+    def save(self, path: str) -> None:
         """
-        Iterates self._iter_index while it is less than capacity.
-        Checks each bucket, and increment self._iter_index data member.
-        if HashEntry exists and is not tombstone, returns the entry.
-        Raise StopIteration once all buckets checked.
+        Writes the map to path as a binary snapshot (see hash_map_snapshot), each key stored with its hash.
+        Any incremental resize still in progress is completed first.
         """
 
-        while self._iter_index < self._capacity:
-            entry = self._buckets[self._iter_index]
-            self._iter_index += 1
+        hash_map_snapshot.save(path, self._live_entries())
+
+    def _live_entries(self):
+        """
+        Yields a (key, value, hash) triple for each entry, completing any incremental resize first.
+        """
+
+        for entry in self._iter_entries():
+            yield entry.key, entry.value, entry.hash
+
+    def put_many(self, pairs) -> None:
+        """
+        Puts every (key, value) pair of pairs (a DynamicArray or any iterable of pairs).
+        Resizes at most once up front, for the size the map would reach if every key were new,
+        hashes all keys in one batch, then inserts in a single loop with no per-key load check.
+        """
+
+        pairs = as_list(pairs)
+        keys = [pair[0] for pair in pairs]
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        self.reserve(self._size + len(keys))
+
+        if self._robin_hood:
+            for key, (_, value), hash_value in zip(keys, pairs, hashes):
+                self._put_robin_hood(key, value, hash_value)
+            return
+
+        buckets = self._buckets
+        capacity = self._capacity
+        for key, (_, value), hash_value in zip(keys, pairs, hashes):
+            initial_index = hash_value % capacity
+            iter_index = initial_index
+            count = 0
+            free_index = None
+
+            # same probe as put
+            while count < capacity and buckets[iter_index]:
+                entry = buckets[iter_index]
+                if entry.is_tombstone:
+                    if free_index is None:
+                        free_index = iter_index
+                elif entry.hash == hash_value and entry.key == key:
+                    entry.value = value
+                    break
+                count += 1
+                iter_index = (initial_index + count ** 2) % capacity
+            else:
+                if free_index is None:
+                    free_index = iter_index
+                else:
+                    self._tombstones -= 1
+                buckets[free_index] = HashEntry(key, value, hash_value)
+                self._size += 1
+                self._version += 1
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with the value of each key in keys (None where absent), in order.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        values = []
+        for key, hash_value in zip(keys, hashes):
+            entry = self._probe(buckets, capacity, key, hash_value)
+            values.append(entry.value if entry else None)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with a Boolean for each key in keys, in order.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        return DynamicArray([self._probe(buckets, capacity, key, hash_value) is not None
+                             for key, hash_value in zip(keys, hashes)])
+
+    def remove_many(self, keys) -> int:
+        """
+        Removes every key in keys that is present.
+        The tombstone ratio is checked once, after the whole batch.
+        Returns the number of keys removed.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        removed = 0
+        if self._robin_hood:
+            for key, hash_value in zip(keys, hashes):
+                removed += self._remove_robin_hood(key, hash_value)
+            self._shrink_or_compact()
+            return removed
+
+        for key, hash_value in zip(keys, hashes):
+            entry = self._probe(buckets, capacity, key, hash_value)
+            if entry:
+                entry.is_tombstone = True
+                removed += 1
+        self._size -= removed
+        self._tombstones += removed
+        if removed:
+            self._version += 1
+        self._shrink_or_compact()
+        return removed
+
+    def _iter_entries(self):
+        """
+        Generator over the live HashEntry objects, in bucket order. Completes any incremental resize first.
+        Raises RuntimeError if an entry is added or removed, or the table is resized, before it is exhausted.
+        """
+
+        self._finish_rehash()
+
+        version = self._version
+        buckets = self._buckets
+        for idx in range(self._capacity):
+            entry = buckets[idx]
             if entry and not entry.is_tombstone:
-                return entry
-        raise StopIteration
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the live HashEntry objects (see _iter_entries),
+        so that any number of iterations can be in progress at once.
+        """
+
+        return self._iter_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Returns a view of the keys: iterating it streams them straight from the table, without a copy.
+        """
+
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Returns a view of the values: iterating it streams them straight from the table, without a copy.
+        """
+
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Returns a view of the (key, value) tuples: iterating it streams them straight from the table,
+        without building a DynamicArray as get_keys_and_values does.
+        """
+
+        return ItemsView(self)
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -480,3 +1297,162 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nincremental resize")
+    print("------------------")
+    m = HashMap(11, hash_function_1, incremental=True, migrate_step=2)
+    for i in range(7):
+        m.put('key' + str(i), i)
+    # the 7th put started the resize: the new table is in place, the old one is migrated 2 slots per call
+    print(m.get_capacity(), m.stats()['resizing'])
+    print([m.get('key' + str(i)) for i in range(7)])
+    while m.stats()['resizing']:
+        m.get('key0')
+    print(m.get_size(), m.get_capacity(), m.stats()['resizing'])
+    assert all(m.get('key' + str(i)) == i for i in range(7))
+
+    print("\ntombstone compaction")
+    print("--------------------")
+    m = HashMap(101, hash_function_1, max_tombstone_ratio=0.25)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    for i in range(0, 40, 2):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_tombstones(), m.get_capacity())
+    for i in range(1, 40, 4):
+        m.remove('key' + str(i))
+    # the 26th tombstone passed a quarter of the buckets, so remove compacted the table; 4 removes followed
+    print(m.get_size(), m.get_tombstones(), m.get_capacity())
+    m = HashMap(101, hash_function_1, max_tombstone_ratio=None)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    for i in range(30):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_tombstones())
+    m.compact()
+    print(m.get_size(), m.get_tombstones(), m.get('key35'))
+    assert m.get_tombstones() == 0 and m.get_size() == 10
+
+    print("\nbatch operations")
+    print("----------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many([('key' + str(i), i * 10) for i in range(20)])
+    print(m.get_size(), m.get_capacity())
+    print(m.get_many(['key3', 'key19', 'key20']))
+    print(m.contains_many(['key3', 'key20']))
+    print(m.remove_many(['key' + str(i) for i in range(0, 25, 5)]), m.get_size())
+    found = m.get_many(['key5', 'key6'])
+    assert found.get_at_index(0) is None and found.get_at_index(1) == 60
+
+    print("\nreserve / from_items")
+    print("--------------------")
+    m = HashMap(11, hash_function_1)
+    m.reserve(1000)
+    capacity = m.get_capacity()
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    print(capacity, m.get_size(), m.get_capacity())
+    assert m.get_capacity() == capacity
+    m = HashMap.from_items(DynamicArray([('a', 1), ('b', 2), ('c', 3)]), hash_function_1)
+    print(m.get_size(), m.get_capacity(), m.get('b'))
+
+    print("\nmax_load / min_load")
+    print("-------------------")
+    m = HashMap(11, hash_function_1, max_load=0.4, min_load=0.1)
+    for i in range(200):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    for i in range(195):
+        m.remove('key' + str(i))
+        if i % 50 == 49:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    # each shrink halves the capacity, never below the initial capacity, until the load is back over min_load
+    print(m.get_size(), m.get_capacity(), m.get('key199'))
+    assert m.get_capacity() >= 11 and m.table_load() >= 0.1
+    for i in range(195, 200):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_capacity())
+    assert m.get_capacity() == 11
+
+    print("\nRobin Hood probing")
+    print("------------------")
+    m = HashMap(11, hash_function_1, probing='robin_hood', max_load=0.9)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    for i in range(0, 100, 3):
+        m.remove('key' + str(i))
+    # remove shifts the following entries back instead of leaving tombstones
+    print(m.get_size(), m.get_tombstones(), m.contains_key('key3'), m.get('key4'))
+    assert m.get_tombstones() == 0
+    assert all(m.get('key' + str(i)) == (None if i % 3 == 0 else i) for i in range(100))
+
+    print("\nsetdefault / get_or_insert / update / increment")
+    print("-----------------------------------------------")
+    m = HashMap(11, hash_function_1)
+    print(m.setdefault('a', 1), m.setdefault('a', 2))
+    print(m.get_or_insert('b', list), m.get_or_insert('b', lambda: 'unused'))
+    print(m.update('c', lambda value: (value or 0) + 5), m.update('c', lambda value: value * 2))
+    for word in ['x', 'y', 'x', 'z', 'x']:
+        m.increment(word)
+    print(m.get('x'), m.get('y'), m.increment('y', 10), m.get_size())
+    assert m.get('a') == 1 and m.get('b') == [] and m.get('c') == 10 and m.get('y') == 11
+
+    print("\nkeys / values / items views")
+    print("---------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i * 10)
+    keys, items = m.keys(), m.items()
+    print(len(keys), sorted(keys), sorted(m.values()), sorted(items))
+    print('key1' in keys, 'key9' in keys, ('key2', 20) in items, ('key2', 21) in items)
+    # views are live: they see later changes without being fetched again
+    m.put('key9', 90)
+    print(len(keys), 'key9' in keys)
+    try:
+        for key in m.keys():
+            m.remove(key)
+        print("no exception")
+    except RuntimeError as e:
+        # adding or removing an entry during iteration is caught on the iterator's next step
+        print("RuntimeError:", e)
+    print(m.get_size())
+    assert m.get_size() == 4
+
+    print("\nstats")
+    print("-----")
+    m = HashMap(11, hash_function_1, stats_sample=1)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    for i in range(150):
+        m.get('key' + str(i))
+    m.remove('key0')
+    stats = m.stats()
+    print(stats['operations'], stats['resizes'], stats['size'], stats['capacity'])
+    get = stats['get']
+    print(get['measured'], get['hits'], get['misses'], round(get['hit_ratio'], 2), get['max_probes'])
+    print(get['probes_histogram'])
+    # reset=True zeroes the counters after the snapshot
+    m.stats(reset=True)
+    print(m.stats()['operations'], m.stats()['get']['measured'])
+    assert stats['operations'] == 251 and get['hits'] == 100 and get['misses'] == 50
+
+    print("\nempty_buckets counter")
+    print("---------------------")
+
+    def scan_empty(m: HashMap) -> int:
+        # the O(capacity) count the counter replaces
+        return sum(1 for idx in range(m._capacity) if m._buckets[idx] is None or m._buckets[idx].is_tombstone)
+
+    m = HashMap(11, hash_function_1, incremental=True, migrate_step=1)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    for i in range(0, 40, 3):
+        m.remove('key' + str(i))
+    # the counters answer mid-resize without advancing the migration
+    print(m.stats()['resizing'], m.empty_buckets(), scan_empty(m), m.get_tombstones(), m.stats()['resizing'])
+    assert m.stats()['resizing'] and m.empty_buckets() == scan_empty(m)
+    while m.stats()['resizing']:
+        m.get('key1')
+    print(m.empty_buckets(), scan_empty(m), m.get_tombstones(), m.get_capacity())
+    assert m.empty_buckets() == scan_empty(m)
@@ -0,0 +1,404 @@
+# Description: Open Addressing HashMap with compact, array-backed storage.
+#              Same public API as hash_map_oa.HashMap, but instead of one HashEntry
+#              object per slot inside a DynamicArray, slots are kept in parallel flat arrays:
+#              keys and values in lists, hashes in an array('Q') and slot states in a bytearray.
+
+from array import array
+
+from a6_include import DynamicArray, HashEntry, MASK_64, hash_function_1, hash_function_2
+
+# slot states
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function,
+                 max_tombstone_ratio: float = 0.25,
+                 max_load: float = 0.5, growth_factor: float = 2.0) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        The same resize policy as hash_map_oa.HashMap: the table grows by growth_factor once the load factor
+        reaches max_load, and once tombstones make up max_tombstone_ratio of the slots, remove compacts
+        the table (None turns that off). Since tombstones lengthen probes as much as live entries,
+        put also rehashes once live entries and tombstones together reach max_load (see put).
+        """
+        if not 0 < max_load <= 0.5:
+            raise ValueError("max_load must be in (0, 0.5] for quadratic probing")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+
+        # resize policy
+        self._max_load = max_load
+        self._growth_factor = growth_factor
+
+        # tombstones currently in the table
+        self._tombstones = 0
+        self._max_tombstone_ratio = max_tombstone_ratio
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == TOMBSTONE) + '\n')
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstones in the table
+        """
+        return self._tombstones
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Creates empty slot arrays for capacity slots.
+        Hashes take 8 bytes and states 1 byte per slot; keys and values are one list pointer each.
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def _hash(self, key: str) -> int:
+        """
+        Returns the hash of key, folded to an unsigned 64-bit value so it fits in the hashes array.
+        """
+        return self._hash_function(key) & MASK_64
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Performs quadratic probing for the live slot holding key.
+        Stored hashes are compared first, so keys are only compared when the full hashes match.
+        Returns the slot index, or -1 if the probe reaches an empty slot.
+        """
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        capacity = self._capacity
+
+        initial_index = hash_value % capacity
+        iter_index = initial_index
+        count = 0
+
+        while count < capacity and states[iter_index] != EMPTY:
+            if states[iter_index] == LIVE and hashes[iter_index] == hash_value and keys[iter_index] == key:
+                return iter_index
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        First checks to see if live slots and tombstones together reach max_load, and if so rehashes:
+        at the same capacity if dropping the tombstones frees at least half of what max_load allows,
+        otherwise grown by growth_factor. Either way each probe keeps reaching empty slots.
+        Perform quadratic probing to find the slot with key.
+        If found, updates value.
+        Otherwise, insert into the first tombstone passed, or else the empty slot that ended the probe.
+        """
+
+        if (self._size + self._tombstones) / self._capacity >= self._max_load:
+            if self._size < self._max_load * self._capacity / 2:
+                self.compact()
+            else:
+                self.resize_table(self._grown(self._capacity))
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        capacity = self._capacity
+
+        hash_value = self._hash(key)
+        initial_index = hash_value % capacity
+        iter_index = initial_index
+        count = 0
+        free_index = -1
+
+        while count < capacity and states[iter_index] != EMPTY:
+            if states[iter_index] == TOMBSTONE:
+                if free_index < 0:
+                    free_index = iter_index
+            elif hashes[iter_index] == hash_value and keys[iter_index] == key:
+                self._values[iter_index] = value
+                return
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+
+        if free_index < 0:
+            free_index = iter_index
+        elif states[free_index] == TOMBSTONE:
+            self._tombstones -= 1
+        keys[free_index] = key
+        self._values[free_index] = value
+        hashes[free_index] = hash_value
+        states[free_index] = LIVE
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes table to new_capacity.
+        First checks if given new_capacity is < current size (amount of elements), returns if true.
+        Sets new_capacity to next prime number of given new_capacity (if not already prime),
+        growing further if needed to keep the load factor below max_load.
+        Live slots are moved into fresh arrays using their stored hashes; tombstones are dropped.
+        """
+
+        if new_capacity < self._size:
+            return
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(self._grown(new_capacity))
+
+        old_keys, old_values = self._keys, self._values
+        old_hashes, old_states = self._hashes, self._states
+
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+
+        keys, values = self._keys, self._values
+        hashes, states = self._hashes, self._states
+
+        for idx in range(len(old_states)):
+            if old_states[idx] == LIVE:
+                hash_value = old_hashes[idx]
+                initial_index = hash_value % new_capacity
+                iter_index = initial_index
+                count = 0
+                while states[iter_index] != EMPTY:
+                    count += 1
+                    iter_index = (initial_index + count ** 2) % new_capacity
+                keys[iter_index] = old_keys[idx]
+                values[iter_index] = old_values[idx]
+                hashes[iter_index] = hash_value
+                states[iter_index] = LIVE
+
+    def _grown(self, capacity: int) -> int:
+        """
+        Returns capacity scaled up by the growth factor (before rounding to a prime).
+        """
+
+        return max(capacity + 1, int(capacity * self._growth_factor))
+
+    def compact(self) -> None:
+        """
+        Rehashes the table at its current capacity, dropping every tombstone,
+        so that probe sequences only pass live slots again.
+        """
+
+        if self._tombstones:
+            self.resize_table(self._capacity)
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of slots that are empty or tombstones, i.e. not live.
+        """
+
+        return self._capacity - self._size
+
+    def get(self, key: str) -> object:
+        """
+        If key found with quadratic probing, returns its value.
+        Otherwise, returns None.
+        """
+
+        index = self._find_index(key, self._hash(key))
+        if index < 0:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if a live slot exists with key using quadratic probing.
+        Returns Boolean.
+        """
+
+        if self._size == 0:
+            return False
+
+        return self._find_index(key, self._hash(key)) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Performs quadratic probing to find the slot containing key.
+        If found, marks the slot as a tombstone, releases its key and value, and decrements size.
+        Compacts the table once tombstones reach max_tombstone_ratio of the slots.
+        """
+
+        index = self._find_index(key, self._hash(key))
+        if index >= 0:
+            self._states[index] = TOMBSTONE
+            self._keys[index] = None
+            self._values[index] = None
+            self._size -= 1
+            self._tombstones += 1
+            if (self._max_tombstone_ratio is not None
+                    and self._tombstones >= self._max_tombstone_ratio * self._capacity):
+                self.compact()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array, which is a list of tuples with key/value pairs of each live slot.
+        """
+
+        da = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+
+        for idx in range(self._capacity):
+            if states[idx] == LIVE:
+                da.append((keys[idx], values[idx]))
+        return da
+
+    def clear(self) -> None:
+        """
+        Resets every slot to empty, and sets the size data member to 0.
+        """
+
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def __iter__(self):
+        """
+        Initializes a data member _iter_index to 0, so that iteration can be performed.
+        Returns self.
+        """
+
+        self._iter_index = 0
+        return self
+
+    def __next__(self):
+        """
+        Advances self._iter_index to the next live slot, and returns it as a HashEntry
+        (built on demand, since slots are not stored as objects).
+        Raise StopIteration once all slots checked.
+        """
+
+        while self._iter_index < self._capacity:
+            idx = self._iter_index
+            self._iter_index += 1
+            if self._states[idx] == LIVE:
+                return HashEntry(self._keys[idx], self._values[idx], self._hashes[idx])
+        raise StopIteration
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+
+    print("\nget_keys_and_values / resize")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
+
+    print("\n__iter__(), __next__()")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+
+    print("\ntombstones")
+    print("----------")
+    m = HashMap(101, hash_function_1)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    for i in range(30):
+        m.remove('key' + str(i))
+    # the 26th tombstone passed a quarter of the slots, so remove compacted the table; 4 removes followed
+    print(m.get_size(), m.get_tombstones(), m.get_capacity())
+    m.compact()
+    print(m.get_size(), m.get_tombstones(), m.get('key35'))
+    print(m.get_tombstones() == 0)
@@ -5,34 +5,93 @@
 # Due Date: 8/13/24
 # Description: Separate Chaining HashMap
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import hash_map_snapshot
+from a6_include import (CompactBucket, DynamicArray, ItemsView, KeysView, LinkedList, OperationStats, ValuesView,
+                        as_list, gc_paused, hash_keys, hash_function_1, hash_function_2)
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental: bool = False,
+                 migrate_step: int = 8,
+                 max_load: float = 1.0,
+                 min_load: float = 0.0,
+                 growth_factor: float = 2.0,
+                 buckets: str = 'linked_list',
+                 stats_sample: int = 0) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        If incremental is True, growing the table does not rehash everything at once:
+        each later put/get/remove migrates up to migrate_step old buckets into the new table.
+        The table grows by growth_factor once the load factor reaches max_load, and remove shrinks it
+        by growth_factor (never below the initial capacity) once the load factor drops under min_load.
+        min_load 0 turns shrinking off.
+        buckets='compact' stores each chain in a CompactBucket instead of a LinkedList: parallel lists
+        searched in C while short, and sorted by key (binary search) once a chain grows past
+        TREEIFY_THRESHOLD, so that a flood of colliding keys costs O(log n) per lookup instead of O(n).
+        stats_sample N >= 1 turns on stats (see stats): one in every N get / put / remove is measured.
         """
+        if buckets not in ('linked_list', 'compact'):
+            raise ValueError("buckets must be 'linked_list' or 'compact'")
+        if max_load <= 0:
+            raise ValueError("max_load must be positive")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if not 0 <= min_load < max_load / growth_factor:
+            raise ValueError("min_load must be in [0, max_load / growth_factor), or resizes would oscillate")
+        if stats_sample < 0:
+            raise ValueError("stats_sample must be at least 0")
+
+        # bucket type for every chain of the table
+        self._bucket_class = CompactBucket if buckets == 'compact' else LinkedList
+
         self._buckets = DynamicArray()
 
         # capacity must be a prime number
         self._capacity = self._next_prime(capacity)
         for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+            self._buckets.append(self._bucket_class())
 
         self._hash_function = function
         self._size = 0
 
+        # non-empty buckets, so empty_buckets needs no scan (of the new table during an incremental resize)
+        self._occupied = 0
+
+        # resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._growth_factor = growth_factor
+        self._min_capacity = self._capacity
+
+        # old buckets and migration cursors while an incremental resize is in progress
+        self._incremental = incremental
+        self._migrate_step = max(1, migrate_step)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+        self._fill_index = 0
+
+        # bumped whenever an entry is added or removed or the table is replaced, so that iterators fail fast
+        self._version = 0
+
+        # sampled operation stats, or None when off
+        self._stats = OperationStats(stats_sample) if stats_sample else None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_rehash()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -89,26 +148,49 @@ class HashMap:
 
     def put(self, key: str, value: object) -> None:
         """
-        First checks to see if table load is > 1, and calls resize function to doulbe capacity if true.
+        First checks to see if table load is >= max_load, and calls resize function to grow capacity if true.
+        (In incremental mode, starts an incremental resize instead.)
         If node is present at hash_index, updates value.
         Otherwise, places new node at hash_index.
         """
 
-        # double capacity if load factor >= 1
-        if self.table_load() >= 1:
-            self.resize_table(self._capacity*2)
-
-        hash_index = self._hash_function(key) % self._capacity  # index of key = hash (using hash function) % array size
-        bucket = self._buckets[hash_index]                      # bucket containing index
-
         # if node with key exists in bucket, update value
-        # otherwise, insert new node with key/value pair and increment size
-        node = bucket.contains(key)
+        # otherwise, insert new node with key/value pair (and its hash) and increment size
+        node, hash_value, bucket = self._locate(key)
         if node:
             node.value = value
             return
-        bucket.insert(key, value)
+        if bucket.length() == 0:
+            self._count_bucket(hash_value, 1)
+        bucket.insert(key, value, hash_value)
         self._size += 1
+        self._version += 1
+
+    def _locate(self, key: str) -> tuple:
+        """
+        First half of put, shared with setdefault / get_or_insert / update / increment:
+        migrates and grows the table as put does, then hashes key once and scans its bucket once.
+        Returns (node, hash_value, bucket): the node with key or None, and the bucket key belongs in.
+        """
+
+        if self._stats is not None:
+            self._sample('put', key)
+
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        # grow capacity if load factor >= max_load
+        if self.table_load() >= self._max_load:
+            # leave room for the entry about to be inserted as well
+            new_capacity = max(self._grown(self._capacity), self.capacity_for(self._size + 1))
+            if self._incremental:
+                self._start_rehash(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+
+        hash_value = self._hash_function(key)
+        bucket = self._find_bucket(hash_value)  # bucket containing key's hash index
+        return bucket.contains(key, hash_value), hash_value, bucket
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -116,33 +198,204 @@ class HashMap:
         Sets new_capacity to next prime number (if not already prime) of given new_capacity.
         Creates new_capacity amount of buckets containing empty LinkedLists stored in a Dynamic Array ADT.
         Saves old buckets and updates data members to reflect new values
-        Copies/inserts old buckets and nodes into updated structure.
+        Moves old nodes into updated structure (see _rehash).
+        Any incremental resize still in progress is completed first.
         """
 
         if new_capacity < 1:
             return
 
+        self._finish_rehash()
+        start = time.perf_counter()
+
         # create new capacity of next prime number from given value
         if not self._is_prime(new_capacity):
             new_capacity = self._next_prime(new_capacity)
 
-        # append new_capacity amount of new empty buckets
-        # each bucket is a LinkedList that are stored in a Dynamic Array ADT
-        new_buckets = DynamicArray()
-        for bucket in range(new_capacity):
-            new_buckets.append(LinkedList())
+        # keep growing until the entries fit under the load factor, so that
+        # the rehash itself never has to trigger a nested resize
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(self._grown(new_capacity))
 
-        # save old buckets, update data members
-        old_buckets = self._buckets
-        self._buckets = new_buckets
-        self._capacity = new_capacity
-        self._size = 0
+        # one new LinkedList per bucket, possibly millions of them, and no reference cycles
+        with gc_paused():
+            # append new_capacity amount of new empty buckets
+            # each bucket is a LinkedList (or CompactBucket) stored in a Dynamic Array ADT
+            new_buckets = DynamicArray()
+            for bucket in range(new_capacity):
+                new_buckets.append(self._bucket_class())
+
+            # save old buckets, update data members
+            old_buckets = self._buckets
+            self._buckets = new_buckets
+            self._capacity = new_capacity
 
-        # copy/insert old buckets into new buckets (rehashing and sizing is handled in the called 'put' method)
+            self._rehash(old_buckets)
+            self._version += 1
+
+        if self._stats is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _rehash(self, old_buckets: DynamicArray) -> None:
+        """
+        Moves every node from old_buckets into self._buckets.
+        Keys are already unique and the new capacity already fits them, so nodes are relinked
+        directly: no duplicate check, no new SLNode, and no load factor check per entry.
+        Each node's stored hash is reused, so the hash function is not called. Size is unchanged.
+        """
+
+        buckets = self._buckets
+        capacity = self._capacity
+        occupied = 0
+
+        # the LinkedList iterator steps past a node before returning it,
+        # so relinking the returned node does not disturb the traversal
         for idx in range(old_buckets.length()):
-            bucket = old_buckets[idx]
-            for node in bucket:
-                self.put(node.key, node.value)
+            for node in old_buckets[idx]:
+                bucket = buckets[node.hash % capacity]
+                if bucket.length() == 0:
+                    occupied += 1
+                bucket.insert_node(node)
+        self._occupied = occupied
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize to the next prime >= new_capacity.
+        The current buckets become the old table and are migrated a few at a time by _migrate.
+        The new table starts out as None placeholders; its LinkedLists are created on first use
+        or by _migrate, so that starting a resize costs no more than one list copy.
+        """
+
+        self._finish_rehash()
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._next_prime(self._grown(new_capacity))
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._migrate_index = 0
+        self._fill_index = 0
+        self._occupied = 0
+        self._version += 1
+        if self._stats is not None:
+            self._stats.record_resize(0.0)
+
+    def _migrate(self, step: int) -> None:
+        """
+        Moves the nodes of the next step old buckets into the new table,
+        and allocates the new table's remaining empty buckets at the same pace.
+        Ends the incremental resize once every old bucket has been migrated.
+        """
+
+        start = time.perf_counter() if self._stats is not None else 0.0
+        old_buckets = self._old_buckets
+        capacity = self._capacity
+
+        stop = min(self._migrate_index + step, self._old_capacity)
+        for idx in range(self._migrate_index, stop):
+            for node in old_buckets[idx]:
+                bucket = self._new_bucket(node.hash % capacity)
+                if bucket.length() == 0:
+                    self._occupied += 1
+                bucket.insert_node(node)
+            old_buckets[idx] = None     # free old LinkedLists as we go rather than all at the end
+        self._migrate_index = stop
+
+        done = stop == self._old_capacity
+        fill_stop = capacity if done else stop * capacity // self._old_capacity
+        for idx in range(self._fill_index, fill_stop):
+            self._new_bucket(idx)
+        self._fill_index = max(self._fill_index, fill_stop)
+
+        if done:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+        if self._stats is not None:
+            self._stats.resize_seconds += time.perf_counter() - start
+
+    def _finish_rehash(self) -> None:
+        """
+        Completes any incremental resize in progress.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def is_incremental(self) -> bool:
+        """
+        Return True if the map was created with incremental=True
+        """
+        return self._incremental
+
+    def is_resizing(self) -> bool:
+        """
+        Return True while an incremental resize is in progress
+        """
+        return self._old_buckets is not None
+
+    def migrate(self, step: int) -> bool:
+        """
+        Migrates up to step more old buckets of the incremental resize in progress, if any, for a caller
+        that drives the migration in steps of its own (such as hash_map_async.AsyncHashMap) rather than
+        leaving it to later operations. Returns True while the resize is still in progress.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(max(1, step))
+        return self._old_buckets is not None
+
+    def start_resize(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize to new_capacity (rounded as by resize_table), in either mode,
+        returning without moving anything: later operations and migrate complete it.
+        Returns if new_capacity is < current size. A resize already in progress is completed first,
+        synchronously, so a caller that must not block waits until is_resizing() is False.
+        """
+
+        if new_capacity < self._size:
+            return
+        self._start_rehash(new_capacity)
+
+    def _new_bucket(self, index: int) -> LinkedList:
+        """
+        Returns the bucket at index in the new table, creating it if it is still a placeholder.
+        """
+
+        bucket = self._buckets[index]
+        if bucket is None:
+            bucket = self._bucket_class()
+            self._buckets[index] = bucket
+        return bucket
+
+    def _count_bucket(self, hash_value: int, delta: int) -> None:
+        """
+        Adds delta to the count of non-empty buckets when put or remove has just filled or emptied the
+        bucket of keys with hash_value, unless that bucket is in the old table of an incremental resize
+        (see _find_bucket): _migrate counts it when it moves the nodes into the new table.
+        """
+
+        if self._old_buckets is None or hash_value % self._old_capacity < self._migrate_index:
+            self._occupied += delta
+
+    def _find_bucket(self, hash_value: int) -> LinkedList:
+        """
+        Returns the bucket that holds (or would hold) keys with hash_value.
+        While an incremental resize is in progress, old buckets that have not been migrated yet
+        still own their keys, so a key is only ever looked for in one bucket.
+        """
+
+        if self._old_buckets is not None:
+            old_index = hash_value % self._old_capacity
+            if old_index >= self._migrate_index:
+                return self._old_buckets[old_index]
+            return self._new_bucket(hash_value % self._capacity)
+        return self._buckets[hash_value % self._capacity]
 
     def table_load(self) -> float:
         """
@@ -153,15 +406,61 @@ class HashMap:
 
     def empty_buckets(self) -> int:
         """
-        Counts number of empty buckets, checking to see if each bucket (LinkedList) has size > 0.
-        Returns total count of empty buckets.
+        Returns number of empty buckets (LinkedLists of size 0), from the count of non-empty buckets
+        that put / remove / resize keep up to date, so it takes O(1). During an incremental resize it
+        counts the buckets of the new table (placeholders included); the resize is not advanced.
         """
 
-        count = 0
-        for idx in range(self._capacity):
-            if self._buckets[idx].length() == 0:
-                count += 1
-        return count
+        return self._capacity - self._occupied
+
+    def occupied_buckets(self) -> int:
+        """
+        Returns number of non-empty buckets (of the new table during an incremental resize).
+        """
+
+        return self._occupied
+
+    def _sample(self, operation: str, key: str) -> None:
+        """
+        Counts operation on key for stats; if it is one to measure, records how many nodes of key's chain
+        a lookup scans (the whole chain on a miss) and whether key is present.
+        """
+
+        stats = self._stats
+        stats.countdown -= 1
+        if stats.countdown:
+            return
+        stats.countdown = stats.sample
+
+        hash_value = self._hash_function(key)
+        length = 0
+        found = False
+        for node in self._find_bucket(hash_value):
+            length += 1
+            if node.hash == hash_value and node.key == key:
+                found = True
+                break
+        stats.record(operation, length, found)
+
+    def stats(self, reset: bool = False) -> dict:
+        """
+        Returns a snapshot of the map's stats as a dict of plain values (for a metrics pipeline): size,
+        capacity, load factor, whether an incremental resize is in progress and empty / occupied buckets
+        (as empty_buckets / occupied_buckets), and with stats_sample on, the operations counted, resize count and time,
+        and per operation (get, put, remove) the measured count, hits, misses, hit ratio, mean / max
+        chain length scanned and a histogram of it (see OperationStats.as_dict).
+        contains_key counts as a get, and setdefault / get_or_insert / update / increment as a put;
+        batch operations are not counted. reset=True zeroes the counters once the snapshot is taken.
+        """
+
+        out = {'size': self._size, 'capacity': self._capacity, 'load': self.table_load(),
+               'resizing': self._old_buckets is not None,
+               'empty_buckets': self._capacity - self._occupied, 'occupied_buckets': self._occupied}
+        if self._stats is not None:
+            out.update(self._stats.as_dict('chain_length'))
+            if reset:
+                self._stats.reset()
+        return out
 
     def get(self, key: str):
         """
@@ -169,10 +468,14 @@ class HashMap:
         Otherwise, returns None.
         """
 
-        hash_index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[hash_index]
+        if self._stats is not None:
+            self._sample('get', key)
+
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
 
-        node = bucket.contains(key)
+        hash_value = self._hash_function(key)
+        node = self._find_bucket(hash_value).contains(key, hash_value)
         if node:
             return node.value
         return None
@@ -183,10 +486,14 @@ class HashMap:
         Returns Boolean.
         """
 
-        hash_index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[hash_index]
+        if self._stats is not None:
+            self._sample('get', key)
 
-        if bucket.contains(key):
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        hash_value = self._hash_function(key)
+        if self._find_bucket(hash_value).contains(key, hash_value):
             return True
         return False
 
@@ -196,16 +503,121 @@ class HashMap:
         Decrements size.
         """
 
-        hash_index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[hash_index]
-        if bucket.remove(key):
+        if self._stats is not None:
+            self._sample('remove', key)
+
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        hash_value = self._hash_function(key)
+        bucket = self._find_bucket(hash_value)
+        if bucket.remove(key, hash_value):
             self._size -= 1
+            self._version += 1
+            if bucket.length() == 0:
+                self._count_bucket(hash_value, -1)
+            self._shrink_if_sparse()
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of key. If key is absent, first inserts it with value default.
+        Hashes key once and probes once.
+        """
+
+        node, hash_value, bucket = self._locate(key)
+        if node:
+            return node.value
+        if bucket.length() == 0:
+            self._count_bucket(hash_value, 1)
+        bucket.insert(key, default, hash_value)
+        self._size += 1
+        self._version += 1
+        return default
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        Returns the value of key. If key is absent, first inserts it with value factory()
+        (called only then, so an expensive default is only built when needed).
+        Hashes key once and probes once.
+        """
+
+        node, hash_value, bucket = self._locate(key)
+        if node:
+            return node.value
+        value = factory()
+        if bucket.length() == 0:
+            self._count_bucket(hash_value, 1)
+        bucket.insert(key, value, hash_value)
+        self._size += 1
+        self._version += 1
+        return value
+
+    def update(self, key: str, function: callable) -> object:
+        """
+        Sets the value of key to function(current value), where the current value is None if key is absent,
+        and returns the new value. Hashes key once and probes once.
+        """
+
+        node, hash_value, bucket = self._locate(key)
+        if node:
+            node.value = function(node.value)
+            return node.value
+        value = function(None)
+        if bucket.length() == 0:
+            self._count_bucket(hash_value, 1)
+        bucket.insert(key, value, hash_value)
+        self._size += 1
+        self._version += 1
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of key, treating an absent key as 0, and returns the new value.
+        Hashes key once and probes once.
+        """
+
+        node, hash_value, bucket = self._locate(key)
+        if node:
+            node.value += delta
+            return node.value
+        if bucket.length() == 0:
+            self._count_bucket(hash_value, 1)
+        bucket.insert(key, delta, hash_value)
+        self._size += 1
+        self._version += 1
+        return delta
+
+    def _grown(self, capacity: int) -> int:
+        """
+        Returns capacity scaled up by the growth factor (before rounding to a prime).
+        """
+
+        return max(capacity + 1, int(capacity * self._growth_factor))
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Shrinks the table by the growth factor once the load factor drops under min_load,
+        keeping it at or above the initial capacity and large enough for the current size.
+        Not while an incremental resize is already in progress.
+        """
+
+        if (self._min_load and self._old_buckets is None and self._capacity > self._min_capacity
+                and self._size / self._capacity < self._min_load):
+            new_capacity = max(self._min_capacity, self.capacity_for(self._size),
+                               int(self._capacity / self._growth_factor))
+            if new_capacity < self._capacity:
+                if self._incremental:
+                    self._start_rehash(new_capacity)
+                else:
+                    self.resize_table(new_capacity)
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         Returns dynamic array, which is a list of tuples with key/value pairs of nodes within each bucket.
         """
 
+        self._finish_rehash()
+
         da = DynamicArray()
 
         for idx in range(self._capacity):
@@ -217,21 +629,229 @@ class HashMap:
     def clear(self) -> None:
         """
         Clears each bucket to be an empty LinkedList, and sets the size data member to 0.
+        Any incremental resize in progress is abandoned along with the old buckets.
         """
 
+        self._old_buckets = None
+        self._old_capacity = 0
+
         for idx in range(self._capacity):
-            self._buckets[idx] = LinkedList()
+            self._buckets[idx] = self._bucket_class()
         self._size = 0
+        self._occupied = 0
+        self._version += 1
 
     def get_bucket(self, index: int) -> LinkedList:
         """
         Returns LinkedList (bucket) at index in hash map.
         """
 
+        self._finish_rehash()
+
         # if given index is within capacity, return bucket
         if 0 <= index < self._capacity:
             return self._buckets[index]
 
+    def capacity_for(self, expected_size: int) -> int:
+        """
+        Returns the smallest capacity that holds expected_size entries without put triggering a resize
+        (the last insert happens at size expected_size - 1, which must stay under max_load).
+        The table rounds it up to a prime.
+        """
+        return max(1, int((expected_size - 1) / self._max_load) + 1)
+
+    def reserve(self, expected_size: int) -> None:
+        """
+        Resizes once, if needed, so that the map can grow to expected_size entries
+        without any further resize.
+        """
+
+        needed = self.capacity_for(expected_size)
+        if needed > self._capacity:
+            self.resize_table(needed)
+
+    @classmethod
+    def from_items(cls, items, function: callable = hash_function_1, expected_size: int = None, **kwargs) -> "HashMap":
+        """
+        Builds a map from items (a DynamicArray or any iterable of (key, value) pairs).
+        The map is reserved for expected_size (default: the number of items) before it is filled,
+        so no resize happens while it is filled. Other keyword arguments go to the constructor.
+        """
+
+        items = as_list(items)
+        if expected_size is None:
+            expected_size = len(items)
+
+        m = cls(1, function, **kwargs)
+        m.reserve(expected_size)
+        m.put_many(items)
+        return m
+
+    @classmethod
+    def load(cls, path: str, function: callable = hash_function_1, **kwargs) -> "HashMap":
+        """
+        Builds a map from the snapshot at path (see save), sized for it up front.
+        The keys' stored hashes are reused when they match function, so no key is hashed or compared
+        while the map is filled. Other keyword arguments go to the constructor.
+        """
+
+        # the decoded keys and values, the buckets reserve allocates and one SLNode per entry
+        with gc_paused():
+            entries = hash_map_snapshot.load_entries(path, function)
+            m = cls(1, function, **kwargs)
+            m.reserve(len(entries))
+
+            buckets = m._buckets
+            capacity = m._capacity
+            for key, value, hash_value in entries:
+                bucket = buckets[hash_value % capacity]
+                if bucket.length() == 0:
+                    m._occupied += 1
+                bucket.insert(key, value, hash_value)
+            m._size = len(entries)
+            return m
+
+    def save(self, path: str) -> None:
+        """
+        Writes the map to path as a binary snapshot (see hash_map_snapshot), each key stored with its hash.
+        Any incremental resize still in progress is completed first.
+        """
+
+        hash_map_snapshot.save(path, ((node.key, node.value, node.hash) for node in self._iter_entries()))
+
+    def _iter_entries(self):
+        """
+        Generator over the nodes (SLNode: key, value, hash), in bucket order. Completes any incremental resize first.
+        Raises RuntimeError if an entry is added or removed, or the table is resized, before it is exhausted.
+        """
+
+        self._finish_rehash()
+
+        version = self._version
+        buckets = self._buckets
+        for idx in range(self._capacity):
+            for node in buckets[idx]:
+                yield node
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the nodes (see _iter_entries),
+        so that any number of iterations can be in progress at once.
+        """
+
+        return self._iter_entries()
+
+    def keys(self) -> KeysView:
+        """
+        Returns a view of the keys: iterating it streams them straight from the buckets, without a copy.
+        """
+
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        Returns a view of the values: iterating it streams them straight from the buckets, without a copy.
+        """
+
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        Returns a view of the (key, value) tuples: iterating it streams them straight from the buckets,
+        without building a DynamicArray as get_keys_and_values does.
+        """
+
+        return ItemsView(self)
+
+    def put_many(self, pairs) -> None:
+        """
+        Puts every (key, value) pair of pairs (a DynamicArray or any iterable of pairs).
+        Resizes at most once up front, for the size the map would reach if every key were new,
+        hashes all keys in one batch, then inserts in a single loop with no per-key load check.
+        """
+
+        pairs = as_list(pairs)
+        keys = [pair[0] for pair in pairs]
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        self.reserve(self._size + len(keys))
+
+        buckets = self._buckets
+        capacity = self._capacity
+        for key, (_, value), hash_value in zip(keys, pairs, hashes):
+            bucket = buckets[hash_value % capacity]
+            node = bucket.contains(key, hash_value)
+            if node:
+                node.value = value
+            else:
+                if bucket.length() == 0:
+                    self._occupied += 1
+                bucket.insert(key, value, hash_value)
+                self._size += 1
+                self._version += 1
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with the value of each key in keys (None where absent), in order.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        values = []
+        for key, hash_value in zip(keys, hashes):
+            node = buckets[hash_value % capacity].contains(key, hash_value)
+            values.append(node.value if node else None)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with a Boolean for each key in keys, in order.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        return DynamicArray([buckets[hash_value % capacity].contains(key, hash_value) is not None
+                             for key, hash_value in zip(keys, hashes)])
+
+    def remove_many(self, keys) -> int:
+        """
+        Removes every key in keys that is present.
+        Returns the number of keys removed.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        self._finish_rehash()
+        buckets = self._buckets
+        capacity = self._capacity
+
+        removed = 0
+        for key, hash_value in zip(keys, hashes):
+            bucket = buckets[hash_value % capacity]
+            if bucket.remove(key, hash_value):
+                removed += 1
+                if bucket.length() == 0:
+                    self._occupied -= 1
+        self._size -= removed
+        if removed:
+            self._version += 1
+        self._shrink_if_sparse()
+        return removed
+
 
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     """
@@ -244,13 +864,19 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     # initialize new hashmap
     map = HashMap()
 
-    # iterate through da, placing/updating nodes as appropriate
+    # iterate through da, counting each element with a single hash and bucket scan
+    # (a new node starts at 1, an existing node's value is incremented by 1)
     for idx in range(da.length()):
-        key = da[idx]
-        if map.contains_key(key):           # if node already in map, increment node value by 1
-            map.put(key, map.get(key) + 1)
-        else:                               # if no node, place node in map and initialize value to 1
-            map.put(key, 1)
+        map.increment(da[idx])
+
+    return _modes(map)
+
+
+def _modes(map: HashMap) -> tuple[DynamicArray, int]:
+    """
+    Scans every node of a map of counts, in bucket order.
+    Returns a tuple containing a da of the keys with the highest count, and that count.
+    """
 
     # initialize modes as empty da, and running max_frequency
     modes = DynamicArray()
@@ -271,6 +897,88 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     return modes, max_frequency
 
 
+# input and hash function of count_frequencies, set in the parent just before a fork-based pool starts,
+# so that forked workers read them from inherited memory instead of receiving pickled copies
+_shared_items = None
+_shared_function = None
+
+
+def _count_items(items: list, function: callable) -> list:
+    """
+    Counts items in a new HashMap. Returns the (key, count) pairs as a list, ready to be pickled.
+    """
+
+    counts = HashMap(function=function)
+    for key in items:
+        counts.increment(key)
+    return as_list(counts.get_keys_and_values())
+
+
+def _count_shard(start: int, stop: int) -> list:
+    """
+    Worker of a fork-based pool: counts _shared_items[start:stop] with _shared_function (see _count_items).
+    """
+
+    return _count_items(_shared_items[start:stop], _shared_function)
+
+
+def count_frequencies(da, workers: int = None, function: callable = hash_function_1) -> HashMap:
+    """
+    Counts the elements of da (a DynamicArray or list) on a pool of worker processes
+    (default: one per CPU). The input is split into one contiguous shard per worker,
+    each worker counts its shard in its own HashMap, and the partial counts are merged
+    into the returned map with increment. With one worker, counts in this process.
+    function must be picklable (a module-level function or builtin) unless the pool forks:
+    forked workers inherit it, like the input, rather than receiving it as an argument.
+    """
+
+    global _shared_items, _shared_function
+
+    items = as_list(da)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(items)))
+    if workers == 1:
+        partials = [_count_items(items, function)]
+    else:
+        bounds = [len(items) * i // workers for i in range(workers + 1)]
+        if 'fork' in multiprocessing.get_all_start_methods():
+            _shared_items, _shared_function = items, function
+            try:
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                    partials = list(pool.map(_count_shard, bounds[:-1], bounds[1:]))
+            finally:
+                _shared_items = _shared_function = None
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                partials = list(pool.map(_count_items, [items[bounds[i]:bounds[i + 1]] for i in range(workers)],
+                                         [function] * workers))
+
+    counts = HashMap(function=function)
+    counts.reserve(max(len(partial) for partial in partials))
+    for partial in partials:
+        for key, count in partial:
+            counts.increment(key, count)
+    return counts
+
+
+def find_mode_parallel(da, workers: int = None, function: callable = hash_function_1) -> tuple[DynamicArray, int]:
+    """
+    Same result as find_mode, with the counting sharded across worker processes (see count_frequencies).
+    Returns a tuple containing the modes da, and max_frequency.
+    """
+
+    return _modes(count_frequencies(da, workers, function))
+
+
+def top_k(da, k: int, workers: int = None, function: callable = hash_function_1) -> DynamicArray:
+    """
+    Returns a DynamicArray of the k most frequent elements of da as (key, count) tuples,
+    most frequent first (ties in key order). Counting is sharded as in count_frequencies.
+    """
+
+    pairs = count_frequencies(da, workers, function).items()
+    return DynamicArray(heapq.nsmallest(k, pairs, key=lambda pair: (-pair[1], pair[0])))
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -471,3 +1179,146 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nincremental resize")
+    print("------------------")
+    m = HashMap(11, hash_function_1, incremental=True, migrate_step=2)
+    for i in range(12):
+        m.put('key' + str(i), i)
+    # the 12th put started the resize: the new table is in place, the old one is migrated 2 buckets per call
+    print(m.get_capacity(), m.stats()['resizing'])
+    print([m.get('key' + str(i)) for i in range(12)])
+    while m.stats()['resizing']:
+        m.get('key0')
+    print(m.get_size(), m.get_capacity(), m.stats()['resizing'])
+    assert all(m.get('key' + str(i)) == i for i in range(12))
+
+    print("\nbatch operations")
+    print("----------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many([('key' + str(i), i * 10) for i in range(20)])
+    print(m.get_size(), m.get_capacity())
+    print(m.get_many(['key3', 'key19', 'key20']))
+    print(m.contains_many(['key3', 'key20']))
+    print(m.remove_many(['key' + str(i) for i in range(0, 25, 5)]), m.get_size())
+    found = m.get_many(['key5', 'key6'])
+    assert found.get_at_index(0) is None and found.get_at_index(1) == 60
+
+    print("\nreserve / from_items")
+    print("--------------------")
+    m = HashMap(11, hash_function_1)
+    m.reserve(1000)
+    capacity = m.get_capacity()
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    print(capacity, m.get_size(), m.get_capacity())
+    assert m.get_capacity() == capacity
+    m = HashMap.from_items(DynamicArray([('a', 1), ('b', 2), ('c', 3)]), hash_function_1)
+    print(m.get_size(), m.get_capacity(), m.get('b'))
+
+    print("\nmax_load / min_load")
+    print("-------------------")
+    m = HashMap(11, hash_function_1, max_load=2.0, min_load=0.25)
+    for i in range(200):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    for i in range(195):
+        m.remove('key' + str(i))
+        if i % 50 == 49:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    # each shrink halves the capacity, never below the initial capacity, until the load is back over min_load
+    print(m.get_size(), m.get_capacity(), m.get('key199'))
+    assert m.get_capacity() >= 11 and m.table_load() >= 0.25
+    for i in range(195, 200):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_capacity())
+    assert m.get_capacity() == 11
+
+    print("\ncompact buckets")
+    print("---------------")
+    # the 24 orderings of 'abcd' are anagrams, so hash_function_1 sends them all to one bucket
+    anagrams = [a + b + c + d for a in 'abcd' for b in 'abcd' for c in 'abcd' for d in 'abcd'
+                if len({a, b, c, d}) == 4]
+    m = HashMap(101, hash_function_1, buckets='compact')
+    for i, key in enumerate(anagrams):
+        m.put(key, i)
+    bucket = m.get_bucket(hash_function_1('abcd') % m.get_capacity())
+    # past TREEIFY_THRESHOLD nodes the bucket keeps them sorted by key and binary searches them,
+    # and below UNTREEIFY_THRESHOLD it goes back to a plain scan
+    print(m.get_size(), m.occupied_buckets(), bucket.length())
+    print([node.key for node in bucket][:6])
+    print(m.get('dcba'), m.contains_key('abdc'), m.contains_key('abce'))
+    for key in anagrams[:20]:
+        m.remove(key)
+    print(m.get_size(), bucket.length())
+    assert all(m.get(key) == i for i, key in enumerate(anagrams) if i >= 20)
+
+    print("\nsetdefault / get_or_insert / update / increment")
+    print("-----------------------------------------------")
+    m = HashMap(11, hash_function_1)
+    print(m.setdefault('a', 1), m.setdefault('a', 2))
+    print(m.get_or_insert('b', list), m.get_or_insert('b', lambda: 'unused'))
+    print(m.update('c', lambda value: (value or 0) + 5), m.update('c', lambda value: value * 2))
+    for word in ['x', 'y', 'x', 'z', 'x']:
+        m.increment(word)
+    print(m.get('x'), m.get('y'), m.increment('y', 10), m.get_size())
+    assert m.get('a') == 1 and m.get('b') == [] and m.get('c') == 10 and m.get('y') == 11
+
+    print("\nkeys / values / items views")
+    print("---------------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i * 10)
+    keys, items = m.keys(), m.items()
+    print(len(keys), sorted(keys), sorted(m.values()), sorted(items))
+    print('key1' in keys, 'key9' in keys, ('key2', 20) in items, ('key2', 21) in items)
+    # views are live: they see later changes without being fetched again
+    m.put('key9', 90)
+    print(len(keys), 'key9' in keys)
+    try:
+        for key in m.keys():
+            m.remove(key)
+        print("no exception")
+    except RuntimeError as e:
+        # adding or removing an entry during iteration is caught on the iterator's next step
+        print("RuntimeError:", e)
+    print(m.get_size())
+    assert m.get_size() == 4
+
+    print("\nstats")
+    print("-----")
+    m = HashMap(11, hash_function_1, stats_sample=1)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    for i in range(150):
+        m.get('key' + str(i))
+    m.remove('key0')
+    stats = m.stats()
+    print(stats['operations'], stats['resizes'], stats['size'], stats['capacity'])
+    get = stats['get']
+    print(get['measured'], get['hits'], get['misses'], round(get['hit_ratio'], 2), get['max_chain_length'])
+    print(get['chain_length_histogram'])
+    # reset=True zeroes the counters after the snapshot
+    m.stats(reset=True)
+    print(m.stats()['operations'], m.stats()['get']['measured'])
+    assert stats['operations'] == 251 and get['hits'] == 100 and get['misses'] == 50
+
+    print("\nempty_buckets counter")
+    print("---------------------")
+
+    def scan_empty(m: HashMap) -> int:
+        # the O(capacity) count the counter replaces (a placeholder of a resize in progress is empty)
+        return sum(1 for idx in range(m._capacity) if m._buckets[idx] is None or m._buckets[idx].length() == 0)
+
+    m = HashMap(11, hash_function_2, incremental=True, migrate_step=1)
+    for i in range(24):
+        m.put('key' + str(i), i)
+    for i in range(0, 24, 3):
+        m.remove('key' + str(i))
+    # the counters answer mid-resize without advancing the migration
+    print(m.stats()['resizing'], m.empty_buckets(), scan_empty(m), m.occupied_buckets(), m.stats()['resizing'])
+    assert m.stats()['resizing'] and m.empty_buckets() == scan_empty(m)
+    while m.stats()['resizing']:
+        m.get('key1')
+    print(m.empty_buckets(), scan_empty(m), m.occupied_buckets(), m.get_capacity())
+    assert m.empty_buckets() == scan_empty(m)
@@ -0,0 +1,888 @@
+# Description: Open Addressing HashMap in shared memory, for many processes that need the same table.
+#              The slot arrays (states, hashes, blob offsets and lengths) and a blob of UTF-8 keys and
+#              pickled values live in a multiprocessing.shared_memory segment, so reader processes
+#              attach by name and look keys up in place: nothing is copied or unpickled except the
+#              value returned. One process at a time writes each table (single writer); readers
+#              never lock and retry a lookup that overlapped a write (sequence lock).
+#              ShardedHashMap splits keys over several such tables, each with its own writer
+#              (partitioned writers).
+
+import pickle
+import sys
+import time
+from multiprocessing import shared_memory
+
+from a6_include import DynamicArray, MASK_64, hash_function_fnv1a
+
+# slot states
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# quadratic probing only reaches about half of the buckets, as in hash_map_oa
+MAX_LOAD = 0.5
+
+# seconds a reader keeps retrying before it gives up on a writer that never ends its write
+# (a write holds the sequence odd only while it changes a few slots or switches tables)
+READ_TIMEOUT = 1.0
+
+# fields of the root segment, which outlives every table and tells readers which one is current
+_SEQUENCE, _GENERATION = range(2)
+
+# fields of a table segment's header, followed by the slot arrays and the blob
+_CAPACITY, _SIZE, _TOMBSTONES, _BLOB_SIZE, _BLOB_USED, _BLOB_GARBAGE = range(6)
+_HEADER_BYTES = 8 * 6
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to the existing segment name.
+    From Python 3.13 on, the attaching process does not register the segment with its resource tracker,
+    so its exit cannot unlink a segment owned by another process. Before 3.13 it is registered, which is
+    harmless in multiprocessing children (they share their parent's tracker).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    return shared_memory.SharedMemory(name)
+
+
+class SlotTable:
+    """
+    A slot table over a buffer: typed views over the arrays of a table laid out as
+    header (6 x uint64), states (1 byte per slot, padded to 8), hashes (uint64), blob offsets (uint64),
+    key lengths (uint32), value lengths (uint32), blob. Slot i's key is blob[offset:offset + key length],
+    immediately followed by its pickled value.
+    The buffer is a shared memory segment here, and a memory-mapped file in hash_map_snapshot.
+    """
+
+    __slots__ = ('shm', 'header', 'states', 'hashes', 'offsets', 'key_lengths', 'value_lengths', 'blob',
+                 'capacity')
+
+    def __init__(self, buf: memoryview, shm: shared_memory.SharedMemory = None) -> None:
+        """
+        Maps the arrays of the table stored in buf. shm, if given, is the segment holding buf, closed by close.
+        """
+        self.shm = shm
+        self.header = buf[:_HEADER_BYTES].cast('Q')
+        self.capacity = capacity = self.header[_CAPACITY]
+
+        states, hashes, offsets, key_lengths, value_lengths, blob = self.layout(capacity)
+        self.states = buf[states:states + capacity]
+        self.hashes = buf[hashes:offsets].cast('Q')
+        self.offsets = buf[offsets:key_lengths].cast('Q')
+        self.key_lengths = buf[key_lengths:value_lengths].cast('I')
+        self.value_lengths = buf[value_lengths:blob].cast('I')
+        self.blob = buf[blob:blob + self.header[_BLOB_SIZE]]
+
+    @staticmethod
+    def layout(capacity: int) -> tuple:
+        """
+        Returns the byte offsets of the states, hashes, offsets, key lengths, value lengths and blob arrays.
+        """
+        states = _HEADER_BYTES
+        hashes = states + (capacity + 7) // 8 * 8
+        offsets = hashes + 8 * capacity
+        key_lengths = offsets + 8 * capacity
+        value_lengths = key_lengths + 4 * capacity
+        blob = value_lengths + 4 * capacity
+        return states, hashes, offsets, key_lengths, value_lengths, blob
+
+    @classmethod
+    def bytes_needed(cls, capacity: int, blob_size: int) -> int:
+        """
+        Returns the size of a table of capacity slots and a blob of blob_size bytes.
+        """
+        return cls.layout(capacity)[-1] + blob_size
+
+    @classmethod
+    def format(cls, buf: memoryview, capacity: int, blob_size: int,
+               shm: shared_memory.SharedMemory = None) -> "SlotTable":
+        """
+        Writes the header of an empty table of capacity slots and a blob of blob_size bytes to buf, which must be
+        zero-filled and at least bytes_needed(capacity, blob_size) long, and maps it.
+        """
+        header = buf[:_HEADER_BYTES].cast('Q')
+        header[_CAPACITY] = capacity
+        header[_BLOB_SIZE] = blob_size
+        header.release()
+        return cls(buf, shm)
+
+    @classmethod
+    def create(cls, name: str, capacity: int, blob_size: int) -> "SlotTable":
+        """
+        Creates shared memory segment name holding an empty table of capacity slots and a blob of blob_size bytes.
+        """
+        shm = shared_memory.SharedMemory(name, create=True, size=cls.bytes_needed(capacity, blob_size))
+        return cls.format(shm.buf, capacity, blob_size, shm)
+
+    @classmethod
+    def attach(cls, name: str) -> "SlotTable":
+        """
+        Maps the table in the existing shared memory segment name.
+        """
+        shm = _attach_segment(name)
+        return cls(shm.buf, shm)
+
+    def get_size(self) -> int:
+        """
+        Return number of live slots
+        """
+        return self.header[_SIZE]
+
+    def fill(self, records) -> None:
+        """
+        Places records, (hash, encoded key, pickled value) triples with unique keys, into this empty table,
+        whose blob must hold all of them.
+        """
+
+        cursor = 0
+        count = 0
+        for hash_value, key, value in records:
+            index = self.free_index(hash_value)
+            middle = cursor + len(key)
+            self.blob[cursor:middle] = key
+            self.blob[middle:middle + len(value)] = value
+            self.states[index] = LIVE
+            self.hashes[index] = hash_value
+            self.offsets[index] = cursor
+            self.key_lengths[index] = len(key)
+            self.value_lengths[index] = len(value)
+            cursor = middle + len(value)
+            count += 1
+        self.header[_SIZE] = count
+        self.header[_BLOB_USED] = cursor
+
+    def records(self) -> list:
+        """
+        Returns a list of (hash, encoded key, pickled value) triples, copied out of the live slots.
+        """
+
+        blob = self.blob
+        records = []
+        for idx in range(self.capacity):
+            if self.states[idx] == LIVE:
+                offset = self.offsets[idx]
+                middle = offset + self.key_lengths[idx]
+                records.append((self.hashes[idx], bytes(blob[offset:middle]),
+                                bytes(blob[middle:middle + self.value_lengths[idx]])))
+        return records
+
+    def value_bytes(self, index: int) -> bytes:
+        """
+        Returns a copy of the pickled value of slot index.
+        """
+        offset = self.offsets[index] + self.key_lengths[index]
+        return bytes(self.blob[offset:offset + self.value_lengths[index]])
+
+    def find_index(self, key: bytes, hash_value: int) -> int:
+        """
+        Performs quadratic probing for the live slot holding key (UTF-8 encoded).
+        Returns the slot index, or -1 if the probe reaches an empty slot.
+        """
+
+        states = self.states
+        hashes = self.hashes
+        capacity = self.capacity
+
+        initial_index = hash_value % capacity
+        iter_index = initial_index
+        count = 0
+
+        while count < capacity and states[iter_index] != EMPTY:
+            if states[iter_index] == LIVE and hashes[iter_index] == hash_value:
+                offset = self.offsets[iter_index]
+                if self.blob[offset:offset + self.key_lengths[iter_index]] == key:
+                    return iter_index
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+        return -1
+
+    def free_index(self, hash_value: int) -> int:
+        """
+        Returns the first empty or tombstone slot on the probe path of hash_value.
+        """
+
+        states = self.states
+        capacity = self.capacity
+
+        initial_index = hash_value % capacity
+        iter_index = initial_index
+        count = 0
+
+        while states[iter_index] == LIVE:
+            count += 1
+            iter_index = (initial_index + count ** 2) % capacity
+        return iter_index
+
+    def close(self) -> None:
+        """
+        Releases the views, and unmaps the shared memory segment (without destroying it) if there is one.
+        """
+        for view in (self.header, self.states, self.hashes, self.offsets, self.key_lengths,
+                     self.value_lengths, self.blob):
+            view.release()
+        if self.shm is not None:
+            self.shm.close()
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=hash_function_fnv1a, name: str = None,
+                 blob_size: int = None, read_timeout: float = READ_TIMEOUT) -> None:
+        """
+        Initialize new HashMap in shared memory that uses
+        quadratic probing for collision resolution. This handle is the table's writer.
+        name names the root segment that other processes pass to attach (a random name if None, see get_name).
+        blob_size is the initial room for encoded keys and pickled values, 64 bytes per slot by default.
+        function must hash a key to the same value in every process, which builtin hash does not do for str
+        (unless PYTHONHASHSEED is fixed or every process is forked from the one that created the map).
+        A lookup that keeps overlapping writes for read_timeout seconds raises TimeoutError (see _read).
+        """
+        if read_timeout <= 0:
+            raise ValueError("read_timeout must be positive")
+
+        self._hash_function = function
+        self._writable = True
+        self._read_timeout = read_timeout
+
+        self._root = shared_memory.SharedMemory(name, create=True, size=16)
+        self._name = self._root.name
+        self._root_fields = self._root.buf[:16].cast('Q')
+
+        capacity = self._next_prime(capacity)
+        self._generation = 0
+        self._table = SlotTable.create(self._table_name(0), capacity, blob_size or 64 * capacity)
+
+    @classmethod
+    def attach(cls, name: str, function=hash_function_fnv1a, writable: bool = False,
+               read_timeout: float = READ_TIMEOUT) -> "HashMap":
+        """
+        Opens the map whose root segment is name, created in this or another process.
+        A read-only handle (the default) supports every lookup. With writable=True, this handle
+        takes over as the table's writer: the protocol allows only one writer at a time, so the previous
+        writer must have stopped writing. read_timeout is as in __init__.
+        """
+        if read_timeout <= 0:
+            raise ValueError("read_timeout must be positive")
+
+        m = cls.__new__(cls)
+        m._hash_function = function
+        m._writable = writable
+        m._read_timeout = read_timeout
+        m._root = _attach_segment(name)
+        m._name = name
+        m._root_fields = m._root.buf[:16].cast('Q')
+        m._generation = None
+        m._table = None
+        m._current_table()
+        return m
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for key, value in self._items():
+            out += 'K: ' + str(key) + ' V: ' + str(value) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._current_table().header[_SIZE]
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._current_table().capacity
+
+    def get_name(self) -> str:
+        """
+        Return name of the root segment, for attach
+        """
+        return self._name
+
+    # ------------------------------------------------------------------ #
+
+    def _table_name(self, generation: int) -> str:
+        """
+        Returns the segment name of the table of the given generation.
+        """
+        return self._name + '_' + str(generation)
+
+    def _current_table(self) -> SlotTable:
+        """
+        Returns the current table, first switching to it if the writer replaced the one mapped here.
+        A writer may replace tables faster than this process attaches to them, so a table that is already
+        gone is skipped.
+        """
+
+        generation = self._root_fields[_GENERATION]
+        while generation != self._generation:
+            try:
+                table = SlotTable.attach(self._table_name(generation))
+            except FileNotFoundError:
+                generation = self._root_fields[_GENERATION]
+                continue
+            if self._table is not None:
+                self._table.close()
+            self._table, self._generation = table, generation
+            generation = self._root_fields[_GENERATION]
+        return self._table
+
+    def _read(self, reader: callable):
+        """
+        Calls reader(table) under the sequence lock: retries until no write began or ended meanwhile,
+        so reader never returns data torn by a concurrent write. reader must only copy bytes out of the
+        table; it runs again on a retry.
+        Raises TimeoutError once it has retried for read_timeout seconds: a writer that died in the middle
+        of a write leaves the sequence odd for good, and would otherwise hang every reader.
+        """
+
+        root = self._root_fields
+        deadline = None
+        while True:
+            sequence = root[_SEQUENCE]
+            if not sequence & 1:
+                result = reader(self._current_table())
+                if root[_SEQUENCE] == sequence:
+                    return result
+
+            # a write is in progress (or overlapped the read): let the writer run, unless it has stopped
+            if deadline is None:
+                deadline = time.monotonic() + self._read_timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"shared HashMap {self._name}: a write has not completed in "
+                                   f"{self._read_timeout} s; its writer may have died mid-write")
+            time.sleep(0)
+
+    def _begin_write(self) -> SlotTable:
+        """
+        Makes the sequence odd, so readers retry until _end_write. Returns the current table.
+        """
+        if not self._writable:
+            raise PermissionError("this HashMap handle is read-only")
+        table = self._current_table()
+        self._root_fields[_SEQUENCE] += 1
+        return table
+
+    def _end_write(self) -> None:
+        """
+        Makes the sequence even again.
+        """
+        self._root_fields[_SEQUENCE] += 1
+
+    def _hash(self, key: str) -> int:
+        """
+        Returns the hash of key, folded to an unsigned 64-bit value so it fits in the hashes array.
+        """
+        return self._hash_function(key) & MASK_64
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Writes the encoded key and pickled value to the end of the blob and points key's slot at them:
+        the slot already holding key, or else the first free slot on its probe path.
+        The table is replaced by a larger one first if the new entry would take the load past MAX_LOAD
+        or the blob is out of room.
+        """
+
+        self._put(key.encode(), self._hash(key), value)
+
+    def _put(self, key: bytes, hash_value: int, value: object) -> None:
+        """
+        put, for an encoded key and its hash.
+        """
+
+        if not self._writable:
+            raise PermissionError("this HashMap handle is read-only")
+
+        entry = key + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        old = self._current_table()
+        index = old.find_index(key, hash_value)
+        table = self._make_room(old, index == -1, len(entry))
+        # a rebuilt table has its own slot indexes, so the key is probed for again there
+        if table is not old:
+            index = table.find_index(key, hash_value)
+
+        # the blob beyond BLOB_USED is not referenced by any slot, so it can be written outside the lock
+        header = table.header
+        offset = header[_BLOB_USED]
+        table.blob[offset:offset + len(entry)] = entry
+        header[_BLOB_USED] = offset + len(entry)
+
+        self._begin_write()
+        if index == -1:
+            index = table.free_index(hash_value)
+            if table.states[index] == TOMBSTONE:
+                header[_TOMBSTONES] -= 1
+            header[_SIZE] += 1
+        else:
+            header[_BLOB_GARBAGE] += table.key_lengths[index] + table.value_lengths[index]
+        table.hashes[index] = hash_value
+        table.offsets[index] = offset
+        table.key_lengths[index] = len(key)
+        table.value_lengths[index] = len(entry) - len(key)
+        table.states[index] = LIVE
+        self._end_write()
+
+    def _make_room(self, table: SlotTable, new_entry: bool, needed: int) -> SlotTable:
+        """
+        Replaces table if a new entry would take live plus tombstone slots past MAX_LOAD (doubling the
+        capacity if live slots alone would), or if the blob has no room for needed more bytes (sizing the new
+        blob at twice the live bytes). Returns the table to write into.
+        """
+
+        header = table.header
+        capacity = table.capacity
+        full = new_entry and header[_SIZE] + header[_TOMBSTONES] + 1 > capacity * MAX_LOAD
+        if not full and header[_BLOB_USED] + needed <= header[_BLOB_SIZE]:
+            return table
+
+        if new_entry and header[_SIZE] + 1 > capacity * MAX_LOAD:
+            capacity *= 2
+        live_bytes = header[_BLOB_USED] - header[_BLOB_GARBAGE] + needed
+        self._rebuild(capacity, max(header[_BLOB_SIZE], 2 * live_bytes))
+        return self._table
+
+    def _rebuild(self, new_capacity: int, blob_size: int, keep_entries: bool = True) -> None:
+        """
+        Copies the live entries (unless keep_entries is False) into a new table of the next prime >= new_capacity,
+        with blob_size bytes of blob, dropping tombstones and the blob bytes of removed or overwritten entries.
+        Then publishes it as the next generation and destroys the old table; readers still using the old table
+        finish on it, then retry.
+        """
+
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        old = self._current_table()
+        generation = self._generation + 1
+        new = SlotTable.create(self._table_name(generation), new_capacity, blob_size)
+
+        cursor = 0
+        for idx in range(old.capacity if keep_entries else 0):
+            if old.states[idx] == LIVE:
+                key_length, value_length = old.key_lengths[idx], old.value_lengths[idx]
+                offset, length = old.offsets[idx], key_length + value_length
+                new.blob[cursor:cursor + length] = old.blob[offset:offset + length]
+
+                index = new.free_index(old.hashes[idx])
+                new.states[index] = LIVE
+                new.hashes[index] = old.hashes[idx]
+                new.offsets[index] = cursor
+                new.key_lengths[index] = key_length
+                new.value_lengths[index] = value_length
+                cursor += length
+
+        new.header[_SIZE] = old.header[_SIZE] if keep_entries else 0
+        new.header[_BLOB_USED] = cursor
+
+        self._begin_write()
+        self._root_fields[_GENERATION] = generation
+        self._end_write()
+
+        self._table, self._generation = new, generation
+        old.close()
+        old.shm.unlink()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Moves the entries into a new table of the next prime >= new_capacity, unless new_capacity < size.
+        The capacity keeps growing until the entries fit under MAX_LOAD.
+        """
+
+        if not self._writable:
+            raise PermissionError("this HashMap handle is read-only")
+
+        table = self._current_table()
+        size = table.header[_SIZE]
+        if new_capacity < size:
+            return
+
+        new_capacity = max(new_capacity, 1)
+        while size > new_capacity * MAX_LOAD:
+            new_capacity *= 2
+        self._rebuild(new_capacity,
+                      max(64 * new_capacity, table.header[_BLOB_USED] - table.header[_BLOB_GARBAGE]))
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self._read(lambda table: table.header[_SIZE] / table.capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of buckets that are empty or tombstones (reads two header fields).
+        """
+
+        return self._read(lambda table: table.capacity - table.header[_SIZE])
+
+    def get(self, key: str) -> object:
+        """
+        Returns value of key (unpickled), or None if key is absent.
+        Only the pickled value is copied out of shared memory.
+        """
+
+        return self._get(key.encode(), self._hash(key))
+
+    def _get(self, key: bytes, hash_value: int) -> object:
+        """
+        get, for an encoded key and its hash.
+        """
+
+        def read(table):
+            index = table.find_index(key, hash_value)
+            return None if index == -1 else table.value_bytes(index)
+
+        # unpickled only once the sequence lock has confirmed the bytes are not torn
+        data = self._read(read)
+        return None if data is None else pickle.loads(data)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key exists in map, returns Boolean.
+        """
+
+        return self._contains_key(key.encode(), self._hash(key))
+
+    def _contains_key(self, key: bytes, hash_value: int) -> bool:
+        """
+        contains_key, for an encoded key and its hash.
+        """
+
+        return self._read(lambda table: table.find_index(key, hash_value) != -1)
+
+    def remove(self, key: str) -> None:
+        """
+        Turns key's slot into a tombstone (if key is present), and decrements size.
+        Its blob bytes stay until the next rebuild.
+        """
+
+        self._remove(key.encode(), self._hash(key))
+
+    def _remove(self, key: bytes, hash_value: int) -> None:
+        """
+        remove, for an encoded key and its hash.
+        """
+
+        if not self._writable:
+            raise PermissionError("this HashMap handle is read-only")
+
+        table = self._current_table()
+        index = table.find_index(key, hash_value)
+        if index == -1:
+            return
+
+        header = table.header
+        self._begin_write()
+        table.states[index] = TOMBSTONE
+        header[_SIZE] -= 1
+        header[_TOMBSTONES] += 1
+        header[_BLOB_GARBAGE] += table.key_lengths[index] + table.value_lengths[index]
+        self._end_write()
+
+    def _items(self) -> list:
+        """
+        Returns a list of (key, value) pairs, a consistent snapshot.
+        """
+
+        return [(key.decode(), pickle.loads(value)) for _, key, value in self._read(SlotTable.records)]
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array of (key, value) tuples, a consistent snapshot of the map.
+        """
+
+        return DynamicArray(self._items())
+
+    def clear(self) -> None:
+        """
+        Replaces the table with an empty one of the same capacity and sets size to 0.
+        """
+
+        if not self._writable:
+            raise PermissionError("this HashMap handle is read-only")
+
+        table = self._current_table()
+        self._rebuild(table.capacity, table.header[_BLOB_SIZE], keep_entries=False)
+
+    def close(self) -> None:
+        """
+        Unmaps this handle's view of the map. The map itself lives on for other handles.
+        """
+
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+        self._root_fields.release()
+        self._root.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys the map (after close): every handle that is still open keeps working on the table it has
+        mapped, but nothing can attach any more. Call once, from the process that owns the map's lifetime.
+        """
+
+        for name in (self._table_name(self._generation), self._name):
+            segment = _attach_segment(name)
+            segment.close()
+            segment.unlink()
+
+
+class ShardedHashMap:
+    def __init__(self, shards: int, capacity: int, function=hash_function_fnv1a, name: str = None,
+                 blob_size: int = None, read_timeout: float = READ_TIMEOUT) -> None:
+        """
+        Initialize a map of shards shared-memory HashMaps; key goes to shard hash % shards.
+        capacity and blob_size are split evenly between the shards, and read_timeout applies to each
+        (see HashMap). This handle can write every shard.
+        Each shard has its own writer: hand shard i over to another process with attach(name, writable=[i]),
+        and stop writing to it here.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        self._hash_function = function
+        self._directory = shared_memory.SharedMemory(name, create=True, size=8)
+        self._name = self._directory.name
+        fields = self._directory.buf[:8].cast('Q')
+        fields[0] = shards
+        fields.release()
+
+        self._shards = [HashMap(max(1, capacity // shards), function, self._name + '_s' + str(i),
+                                blob_size and max(1, blob_size // shards), read_timeout)
+                        for i in range(shards)]
+
+    @classmethod
+    def attach(cls, name: str, function=hash_function_fnv1a, writable=(),
+               read_timeout: float = READ_TIMEOUT) -> "ShardedHashMap":
+        """
+        Opens the sharded map name, as the writer of the shards listed in writable and a reader of the others.
+        """
+        m = cls.__new__(cls)
+        m._hash_function = function
+        m._directory = _attach_segment(name)
+        m._name = name
+        fields = m._directory.buf[:8].cast('Q')
+        shards = fields[0]
+        fields.release()
+
+        m._shards = [HashMap.attach(name + '_s' + str(i), function, i in writable, read_timeout)
+                     for i in range(shards)]
+        return m
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(shard.get_size() for shard in self._shards)
+
+    def get_name(self) -> str:
+        """
+        Return name of the map, for attach
+        """
+        return self._name
+
+    def get_shards(self) -> int:
+        """
+        Return number of shards
+        """
+        return len(self._shards)
+
+    def get_shard(self, index: int) -> HashMap:
+        """
+        Return the HashMap of shard index
+        """
+        return self._shards[index]
+
+    def shard_of(self, key: str) -> int:
+        """
+        Returns the index of the shard holding key, to route writes to the process that owns it.
+        """
+        return (self._hash_function(key) & MASK_64) % len(self._shards)
+
+    def _locate(self, key: str) -> tuple:
+        """
+        Returns (shard, encoded key, hash) for key, hashing it only once.
+        """
+        hash_value = self._hash_function(key) & MASK_64
+        return self._shards[hash_value % len(self._shards)], key.encode(), hash_value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Puts key in its shard (which this handle must be the writer of).
+        """
+        shard, key, hash_value = self._locate(key)
+        shard._put(key, hash_value, value)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value of key, or None if key is absent.
+        """
+        shard, key, hash_value = self._locate(key)
+        return shard._get(key, hash_value)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key exists in map, returns Boolean.
+        """
+        shard, key, hash_value = self._locate(key)
+        return shard._contains_key(key, hash_value)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes key from its shard (which this handle must be the writer of).
+        """
+        shard, key, hash_value = self._locate(key)
+        shard._remove(key, hash_value)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array of (key, value) tuples; each shard's part is a consistent snapshot of that shard.
+        """
+        pairs = []
+        for shard in self._shards:
+            pairs.extend(shard._items())
+        return DynamicArray(pairs)
+
+    def close(self) -> None:
+        """
+        Unmaps this handle's view of every shard.
+        """
+        for shard in self._shards:
+            shard.close()
+        self._directory.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys every shard and the map (after close).
+        """
+        for shard in self._shards:
+            shard.unlink()
+        directory = _attach_segment(self._name)
+        directory.close()
+        directory.unlink()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import multiprocessing
+    import os
+
+    print("\nwriter and reader handles")
+    print("-------------------------")
+    m = HashMap(11)
+    reader = HashMap.attach(m.get_name())
+    for i in range(40):
+        m.put('str' + str(i), {'id': i})
+        if i % 10 == 9:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.empty_buckets())
+    print(reader.get('str7'), reader.contains_key('str7'), reader.get('missing'), reader.get_capacity())
+    m.put('str7', [7])
+    m.remove('str8')
+    print(reader.get('str7'), reader.contains_key('str8'), reader.get_size())
+    try:
+        reader.put('str1', 1)
+    except PermissionError as error:
+        print('PermissionError:', error)
+    m.clear()
+    print(reader.get_size(), reader.get('str7'), m.get_keys_and_values())
+    reader.close()
+    m.close()
+    m.unlink()
+
+    print("\noverwrite that outgrows the blob")
+    print("--------------------------------")
+    # every key collides, and the last put needs a new blob: its slot must be found again in the new table
+    m = HashMap(11, lambda key: 0, blob_size=120)
+    m.put('A', 'a')
+    m.put('B', 'b')
+    m.remove('A')
+    m.put('B', 'y' * 200)
+    print(m.get('B') == 'y' * 200, m.get_size(), m.get_keys_and_values().length())
+    m.close()
+    m.unlink()
+
+    print("\npartitioned writers")
+    print("-------------------")
+
+    def fill_shard(name, index):
+        # owns shard index: writes only the keys that hash there
+        mine = ShardedHashMap.attach(name, writable=[index])
+        for i in range(100):
+            key = 'key' + str(i)
+            if mine.shard_of(key) == index:
+                mine.put(key, i * i)
+        mine.close()
+
+    sharded = ShardedHashMap(4, 40)
+    workers = [multiprocessing.Process(target=fill_shard, args=(sharded.get_name(), i))
+               for i in range(sharded.get_shards())]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print(sharded.get_size(), sharded.get('key9'), sharded.contains_key('key100'),
+          sorted(shard.get_size() for shard in sharded._shards))
+    sharded.close()
+    sharded.unlink()
+
+    print("\nwriter dying mid-write")
+    print("----------------------")
+
+    def die_mid_write(name):
+        # takes over as writer and exits between _begin_write and _end_write
+        writer = HashMap.attach(name, writable=True)
+        writer._begin_write()
+        os._exit(1)
+
+    m = HashMap(11)
+    m.put('key', 'value')
+    reader = HashMap.attach(m.get_name(), read_timeout=0.1)
+    print(reader.get('key'))
+    worker = multiprocessing.Process(target=die_mid_write, args=(m.get_name(),))
+    worker.start()
+    worker.join()
+    start = time.monotonic()
+    try:
+        reader.get('key')
+    except TimeoutError as error:
+        print('TimeoutError after', round(time.monotonic() - start, 1), 's:', error)
+    reader.close()
+    m.close()
+    m.unlink()
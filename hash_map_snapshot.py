@@ -0,0 +1,292 @@
+# Description: Binary snapshots of the hash maps, and a read-only HashMap that serves lookups
+#              straight from a memory-mapped snapshot file.
+#              A snapshot is a 16-byte file header (magic, flags) followed by a slot table in the
+#              layout of hash_map_shared.SlotTable: slot states, hashes, blob offsets and lengths,
+#              and a blob of UTF-8 keys and pickled values. The maps' save(path) / load(path)
+#              write and read it; HashMap(path) maps it and probes the slot table in place,
+#              without deserializing anything but the values it returns.
+
+import mmap
+import os
+import pickle
+
+from a6_include import DynamicArray, MASK_64, hash_function_1
+from hash_map_shared import LIVE, MAX_LOAD, SlotTable
+
+MAGIC = b'HMSNAP01'
+_FILE_HEADER_BYTES = 16
+
+# flag bits: some key hashed to a negative value, so stored hashes >= 2 ** 63 stand for negative ones
+_SIGNED_HASHES = 1
+
+# live slots checked against the hash function when a snapshot is opened
+_VERIFY_SAMPLE = 16
+
+
+def _next_prime(capacity: int) -> int:
+    """
+    Increment from given number to find the closest prime number
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not _is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+def _is_prime(capacity: int) -> bool:
+    """
+    Determine if given integer is a prime number and return boolean
+    """
+    if capacity == 2 or capacity == 3:
+        return True
+
+    if capacity == 1 or capacity % 2 == 0:
+        return False
+
+    factor = 3
+    while factor ** 2 <= capacity:
+        if capacity % factor == 0:
+            return False
+        factor += 2
+
+    return True
+
+
+def save(path: str, entries) -> None:
+    """
+    Writes entries, an iterable of (key, value, hash) triples with unique str keys, to path as a snapshot.
+    hash is the key's hash under the map's hash function; stored, it spares load from calling the function.
+    The file is written next to path and then renamed over it, so a crash never leaves a partial snapshot.
+    """
+
+    records = []
+    blob_size = 0
+    flags = 0
+    for key, value, hash_value in entries:
+        key = key.encode()
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        records.append((hash_value & MASK_64, key, value))
+        blob_size += len(key) + len(value)
+        if hash_value < 0:
+            flags |= _SIGNED_HASHES
+
+    capacity = _next_prime(int(len(records) / MAX_LOAD) + 1)
+    length = _FILE_HEADER_BYTES + SlotTable.bytes_needed(capacity, blob_size)
+
+    temporary = path + '.tmp'
+    with open(temporary, 'w+b') as file:
+        file.truncate(length)
+        with mmap.mmap(file.fileno(), length) as mapped:
+            mapped[:len(MAGIC)] = MAGIC
+            mapped[len(MAGIC):_FILE_HEADER_BYTES] = flags.to_bytes(8, 'little')
+            view = memoryview(mapped)
+            table = SlotTable.format(view[_FILE_HEADER_BYTES:], capacity, blob_size)
+            table.fill(records)
+            table.close()
+            view.release()
+            mapped.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _open(path: str) -> tuple:
+    """
+    Maps the snapshot at path read-only. Returns (mmap, memoryview over it, SlotTable, flags).
+    """
+
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        raise ValueError(path + " is not a hash map snapshot")
+    flags = int.from_bytes(mapped[len(MAGIC):_FILE_HEADER_BYTES], 'little')
+    view = memoryview(mapped)
+    return mapped, view, SlotTable(view[_FILE_HEADER_BYTES:]), flags
+
+
+def load_entries(path: str, function: callable) -> list:
+    """
+    Reads the snapshot at path. Returns a list of (key, value, hash) triples, hash being the key's hash under function.
+    The stored hashes are reused if a sample of keys hashes to them under function; otherwise every key is rehashed.
+    """
+
+    mapped, view, table, flags = _open(path)
+    try:
+        # slot arrays are converted to lists in one go, and keys and values are sliced out of the mmap
+        # itself (a bytes copy of just that range), which is much cheaper than indexing typed memoryviews
+        states = table.states.tolist()
+        hashes = table.hashes.tolist()
+        offsets = table.offsets.tolist()
+        key_lengths = table.key_lengths.tolist()
+        value_lengths = table.value_lengths.tolist()
+        base = _FILE_HEADER_BYTES + SlotTable.layout(table.capacity)[-1]
+    finally:
+        table.close()
+        view.release()
+
+    signed = flags & _SIGNED_HASHES
+    loads = pickle.loads
+    entries = []
+    try:
+        for idx in range(len(states)):
+            if states[idx] == LIVE:
+                offset = base + offsets[idx]
+                middle = offset + key_lengths[idx]
+                hash_value = hashes[idx]
+                if signed and hash_value >= 1 << 63:
+                    hash_value -= 1 << 64
+                entries.append((mapped[offset:middle].decode(), loads(mapped[middle:middle + value_lengths[idx]]),
+                                hash_value))
+    finally:
+        mapped.close()
+
+    if any(function(key) != hash_value for key, _, hash_value in entries[:_VERIFY_SAMPLE]):
+        entries = [(key, value, function(key)) for key, value, _ in entries]
+    return entries
+
+
+class HashMap:
+    def __init__(self, path: str, function: callable = hash_function_1) -> None:
+        """
+        Opens the snapshot at path as a read-only HashMap: lookups probe the memory-mapped slot table,
+        so opening takes no time regardless of the size of the map, and pages are read from the file
+        (or shared from the page cache with other processes mapping it) on first use.
+        function must be the hash function of the map that was saved; a sample of keys is checked against
+        it, and ValueError is raised if they do not hash to their stored hashes.
+        """
+        self._hash_function = function
+        self._path = path
+        self._mmap, self._view, self._table, flags = _open(path)
+
+        table = self._table
+        checked = 0
+        for idx in range(table.capacity):
+            if checked == _VERIFY_SAMPLE:
+                break
+            if table.states[idx] == LIVE:
+                key = self._key_at(idx)
+                if function(key) & MASK_64 != table.hashes[idx]:
+                    self.close()
+                    raise ValueError("snapshot was saved from a map with a different hash function")
+                checked += 1
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for key, value in self.get_keys_and_values()._data:
+            out += 'K: ' + str(key) + ' V: ' + str(value) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._table.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table.capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _key_at(self, index: int) -> str:
+        """
+        Returns the key of slot index.
+        """
+        table = self._table
+        offset = table.offsets[index]
+        return bytes(table.blob[offset:offset + table.key_lengths[index]]).decode()
+
+    def get(self, key: str) -> object:
+        """
+        Returns value of key, or None if key is absent. Only the value is read out of the file and unpickled.
+        """
+
+        table = self._table
+        index = table.find_index(key.encode(), self._hash_function(key) & MASK_64)
+        if index == -1:
+            return None
+        return pickle.loads(table.value_bytes(index))
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if key exists in map, returns Boolean.
+        """
+
+        return self._table.find_index(key.encode(), self._hash_function(key) & MASK_64) != -1
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self._table.get_size() / self._table.capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets (a snapshot has no tombstones).
+        """
+
+        return self._table.capacity - self._table.get_size()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array of (key, value) tuples, deserializing the whole map.
+        """
+
+        return DynamicArray([(key.decode(), pickle.loads(value)) for _, key, value in self._table.records()])
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+
+        self._table.close()
+        self._view.release()
+        self._mmap.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    import hash_map_oa
+    import hash_map_sc
+    from a6_include import hash_function_2
+
+    directory = tempfile.mkdtemp()
+    for module in (hash_map_sc, hash_map_oa):
+        print("\n" + module.__name__)
+        print("-" * len(module.__name__))
+        m = module.HashMap(11, hash_function_2)
+        for i in range(100):
+            m.put('str' + str(i), [i, 'value' + str(i)])
+        m.remove('str5')
+
+        path = os.path.join(directory, module.__name__ + '.snap')
+        m.save(path)
+        loaded = module.HashMap.load(path, hash_function_2)
+        print(loaded.get_size(), loaded.get('str42'), loaded.contains_key('str5'),
+              sorted(loaded.get_keys_and_values()._data) == sorted(m.get_keys_and_values()._data))
+
+        mapped = HashMap(path, hash_function_2)
+        print(mapped.get_size(), mapped.get_capacity(), mapped.get('str42'), mapped.get('str5'),
+              mapped.contains_key('str99'))
+        mapped.close()
+
+        # stored hashes do not match: load rehashes, the mmap view refuses
+        print(module.HashMap.load(path, hash_function_1).get('str42'))
+        try:
+            HashMap(path, hash_function_1)
+        except ValueError as error:
+            print('ValueError:', error)
+        os.remove(path)
+    os.rmdir(directory)
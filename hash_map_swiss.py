@@ -0,0 +1,425 @@
+# Description: Swiss-table style HashMap with group probing over control bytes.
+#              Same public API as hash_map_oa.HashMap. Slots are kept in flat arrays
+#              (as in hash_map_oa_compact) and every slot has a control byte: EMPTY, DELETED,
+#              or the low 7 bits of its key's mixed hash (the "tag"). Slots are probed 16 at a time:
+#              each group's control bytes are a 16-byte bytearray, so `tag in group` scans
+#              the whole group in C, and only slots whose tag matches have their keys compared.
+
+from array import array
+
+from a6_include import DynamicArray, HashEntry, MASK_64, as_list, hash_keys, hash_function_1, hash_function_2
+
+GROUP_SIZE = 16
+
+# control bytes; a full slot holds its 7-bit tag (0..127)
+EMPTY = 0x80
+DELETED = 0xFE
+
+# grow (or rehash away DELETED slots) once live + deleted slots reach this share of the table
+MAX_LOAD = 7 / 8
+
+# odd 64-bit multiplier (2^64 / golden ratio) of _mix
+MIX_MULTIPLIER = 0x9e3779b97f4a7c15
+
+
+def _mix(hash_value: int) -> int:
+    """
+    Returns hash_value scrambled into an unsigned 64-bit value whose low bits depend on all of its bits.
+    The tag and the first group are taken from the low bits, and the project hash functions return
+    small sums whose low bits repeat, which would pile keys into a few groups with the same tags.
+    Multiplying by an odd constant and folding the high half down are both invertible, so two keys
+    get equal mixed hashes only if their hashes were equal.
+    """
+    hash_value = (hash_value * MIX_MULTIPLIER) & MASK_64
+    return hash_value ^ (hash_value >> 32)
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        group probing over control bytes for collision resolution.
+        The table holds a power of two number of 16-slot groups, at least enough for capacity slots.
+        """
+        self._capacity = self._round_capacity(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._deleted = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            control = self._ctrl[i // GROUP_SIZE][i % GROUP_SIZE]
+            if control == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(control == DELETED) + '\n')
+        return out
+
+    @staticmethod
+    def _round_capacity(capacity: int) -> int:
+        """
+        Returns the smallest power of two number of groups holding at least capacity slots, in slots.
+        Group indexes are reduced with a mask, and triangular probing over a power of two
+        number of groups visits every group.
+        """
+        groups = 1
+        while groups * GROUP_SIZE < capacity:
+            groups *= 2
+        return groups * GROUP_SIZE
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Creates empty slot arrays for capacity slots: one control byte and one 8-byte hash per slot,
+        and one list pointer each for keys and values. Control bytes are kept in one bytearray per group:
+        `in` on a whole bytearray is far cheaper than find() with start / end arguments on a flat one.
+        """
+        self._ctrl = [bytearray([EMPTY]) * GROUP_SIZE for _ in range(capacity // GROUP_SIZE)]
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+
+    def _hash(self, key: str) -> int:
+        """
+        Returns the hash of key, mixed (see _mix) to an unsigned 64-bit value that fits in the hashes array.
+        The low 7 bits are the key's tag; the rest select its first group.
+        """
+        return _mix(self._hash_function(key))
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Probes group by group for the slot holding key: within a group, only slots whose control byte
+        equals the key's tag are compared. Groups are visited in triangular order (1, 2, 3... groups apart)
+        and the probe ends at the first group with an EMPTY slot, since an insert would have stopped there.
+        Returns the slot index, or -1 if key is absent.
+        """
+
+        ctrl = self._ctrl
+        keys = self._keys
+        hashes = self._hashes
+        mask = len(ctrl) - 1
+
+        tag = hash_value & 0x7F
+        group = (hash_value >> 7) & mask
+        step = 0
+
+        while step <= mask:
+            control = ctrl[group]
+            if tag in control:
+                start = group * GROUP_SIZE
+                offset = control.find(tag)
+                while offset >= 0:
+                    idx = start + offset
+                    if hashes[idx] == hash_value and keys[idx] == key:
+                        return idx
+                    offset = control.find(tag, offset + 1)
+            if EMPTY in control:
+                return -1
+            step += 1
+            group = (group + step) & mask
+        return -1
+
+    def _free_index(self, hash_value: int) -> int:
+        """
+        Returns the first EMPTY or DELETED slot along the probe sequence of hash_value.
+        The table always has one, since live and deleted slots stay under MAX_LOAD.
+        """
+
+        ctrl = self._ctrl
+        mask = len(ctrl) - 1
+
+        group = (hash_value >> 7) & mask
+        step = 0
+
+        while True:
+            control = ctrl[group]
+            offset = control.find(EMPTY)
+            if offset < 0:
+                offset = control.find(DELETED)
+            if offset >= 0:
+                return group * GROUP_SIZE + offset
+            step += 1
+            group = (group + step) & mask
+
+    def put(self, key: str, value: object) -> None:
+        """
+        If key is found, updates value.
+        Otherwise, first checks whether live plus deleted slots would reach MAX_LOAD of the table, and if so
+        doubles capacity (or, when most of them are DELETED, rehashes at the same capacity).
+        Then stores key in the first EMPTY or DELETED slot of its probe sequence.
+        """
+
+        hash_value = self._hash(key)
+        idx = self._find_index(key, hash_value)
+        if idx >= 0:
+            self._values[idx] = value
+            return
+
+        if self._size + self._deleted + 1 > self._capacity * MAX_LOAD:
+            if self._size + 1 > self._capacity * MAX_LOAD / 2:
+                self.resize_table(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity)
+
+        idx = self._free_index(hash_value)
+        control = self._ctrl[idx // GROUP_SIZE]
+        if control[idx % GROUP_SIZE] == DELETED:
+            self._deleted -= 1
+        control[idx % GROUP_SIZE] = hash_value & 0x7F
+        self._keys[idx] = key
+        self._values[idx] = value
+        self._hashes[idx] = hash_value
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes table to new_capacity.
+        First checks if given new_capacity is < current size (amount of elements), returns if true.
+        Rounds new_capacity up to a power of two number of groups, doubling further if needed
+        to keep the load factor below MAX_LOAD.
+        Live slots are moved into fresh arrays using their stored hashes; DELETED slots are dropped.
+        """
+
+        if new_capacity < self._size:
+            return
+
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size + 1 > new_capacity * MAX_LOAD:
+            new_capacity *= 2
+
+        old_ctrl, old_keys = self._ctrl, self._keys
+        old_values, old_hashes = self._values, self._hashes
+
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        self._deleted = 0
+
+        ctrl, keys = self._ctrl, self._keys
+        values, hashes = self._values, self._hashes
+
+        for group, control in enumerate(old_ctrl):
+            for offset, tag in enumerate(control):
+                if tag < EMPTY:
+                    idx = group * GROUP_SIZE + offset
+                    hash_value = old_hashes[idx]
+                    new_idx = self._free_index(hash_value)
+                    ctrl[new_idx // GROUP_SIZE][new_idx % GROUP_SIZE] = tag
+                    keys[new_idx] = old_keys[idx]
+                    values[new_idx] = old_values[idx]
+                    hashes[new_idx] = hash_value
+
+    def table_load(self) -> float:
+        """
+        Load factor = total number of elements stored in table / number of buckets
+        """
+
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of slots that are EMPTY or DELETED, i.e. not live.
+        """
+
+        return self._capacity - self._size
+
+    def get(self, key: str) -> object:
+        """
+        If key found with group probing, returns its value.
+        Otherwise, returns None.
+        """
+
+        idx = self._find_index(key, self._hash(key))
+        if idx < 0:
+            return None
+        return self._values[idx]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks to see if a live slot exists with key using group probing.
+        Returns Boolean.
+        """
+
+        if self._size == 0:
+            return False
+
+        return self._find_index(key, self._hash(key)) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        Finds the slot containing key with group probing. If found, releases its key and value,
+        and decrements size. The slot becomes EMPTY if its group has another EMPTY slot
+        (no probe has ever continued past such a group), and DELETED otherwise.
+        """
+
+        idx = self._find_index(key, self._hash(key))
+        if idx < 0:
+            return
+
+        control = self._ctrl[idx // GROUP_SIZE]
+        if EMPTY in control:
+            control[idx % GROUP_SIZE] = EMPTY
+        else:
+            control[idx % GROUP_SIZE] = DELETED
+            self._deleted += 1
+        self._keys[idx] = None
+        self._values[idx] = None
+        self._size -= 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array, which is a list of tuples with key/value pairs of each live slot.
+        """
+
+        da = DynamicArray()
+        keys, values = self._keys, self._values
+
+        for group, control in enumerate(self._ctrl):
+            for offset, tag in enumerate(control):
+                if tag < EMPTY:
+                    idx = group * GROUP_SIZE + offset
+                    da.append((keys[idx], values[idx]))
+        return da
+
+    def clear(self) -> None:
+        """
+        Resets every slot to EMPTY, and sets the size data member to 0.
+        """
+
+        self._allocate(self._capacity)
+        self._size = 0
+        self._deleted = 0
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with the value of each key in keys (None where absent), in order.
+        Hashes every key in one batch, then runs the group probe of _find_index inline,
+        with the table's arrays bound to locals once for the whole batch.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+
+        ctrl = self._ctrl
+        slot_keys = self._keys
+        slot_values = self._values
+        slot_hashes = self._hashes
+        mask = len(ctrl) - 1
+
+        values = []
+        for key, hash_value in zip(keys, hashes):
+            hash_value = _mix(hash_value)
+            tag = hash_value & 0x7F
+            group = (hash_value >> 7) & mask
+            step = 0
+            value = None
+
+            while step <= mask:
+                control = ctrl[group]
+                if tag in control:
+                    start = group * GROUP_SIZE
+                    offset = control.find(tag)
+                    while offset >= 0:
+                        idx = start + offset
+                        if slot_hashes[idx] == hash_value and slot_keys[idx] == key:
+                            value = slot_values[idx]
+                            break
+                        offset = control.find(tag, offset + 1)
+                    if offset >= 0:
+                        break
+                if EMPTY in control:
+                    break
+                step += 1
+                group = (group + step) & mask
+            values.append(value)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns a DynamicArray with a Boolean for each key in keys, in order.
+        """
+
+        keys = as_list(keys)
+        hashes = hash_keys(keys, self._hash_function)
+        return DynamicArray([self._find_index(key, _mix(hash_value)) >= 0
+                             for key, hash_value in zip(keys, hashes)])
+
+    def __iter__(self):
+        """
+        Initializes a data member _iter_index to 0, so that iteration can be performed.
+        Returns self.
+        """
+
+        self._iter_index = 0
+        return self
+
+    def __next__(self):
+        """
+        Advances self._iter_index to the next live slot, and returns it as a HashEntry
+        (built on demand, since slots are not stored as objects).
+        Raise StopIteration once all slots checked.
+        """
+
+        while self._iter_index < self._capacity:
+            idx = self._iter_index
+            self._iter_index += 1
+            if self._ctrl[idx // GROUP_SIZE][idx % GROUP_SIZE] < EMPTY:
+                return HashEntry(self._keys[idx], self._values[idx], self._hashes[idx])
+        raise StopIteration
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.get('str42'), m.contains_key('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.contains_key('str42'), m.get_size())
+    print(m.get_many(['str1', 'str42', 'str149']), m.contains_many(['str1', 'str42']))
+
+    print("\nget_keys_and_values / resize")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(40)
+    print(m.get_keys_and_values())
+
+    print("\n__iter__(), __next__()")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
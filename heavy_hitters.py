@@ -0,0 +1,273 @@
+# Description: Streaming, bounded-memory frequency estimation for inputs too large (or unbounded)
+#              for find_mode: a Count-Min Sketch for per-key estimates, Space-Saving for heavy
+#              hitters, and find_mode_streaming, which reports the estimated mode(s) of any
+#              iterable along with an error bound.
+
+import heapq
+import math
+from array import array
+
+from a6_include import DynamicArray, as_list, hash_function_builtin, hash_function_fnv1a
+from hash_map_sc import HashMap
+
+
+class CountMinSketch:
+    def __init__(self, width: int, depth: int,
+                 function: callable = hash_function_builtin,
+                 second_function: callable = hash_function_fnv1a) -> None:
+        """
+        Initialize a sketch of depth rows of width counters each.
+        Row i maps a key to column (h1 + i * step) % width, where h1 = function(key) and step = 1 + h2 % (width - 1)
+        for h2 = second_function(key) (Kirsch-Mitzenmacher double hashing), so each key is only hashed twice
+        however many rows there are. The step is never 0, so a key never lands in the same column of every row.
+        An estimate never undercounts; it overcounts by at most error_bound() with probability 1 - e^-depth.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+
+        self._width = width
+        self._depth = depth
+        self._function = function
+        self._second_function = second_function
+        self._counters = array('Q', bytes(8 * width * depth))
+        self._total = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float, **kwargs) -> "CountMinSketch":
+        """
+        Builds a sketch whose estimates overcount by at most epsilon * total with probability 1 - delta:
+        width e / epsilon, depth ln(1 / delta). Other keyword arguments go to the constructor.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be in (0, 1)")
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), **kwargs)
+
+    def _columns(self, key: str) -> list:
+        """
+        Returns the flat counter index of key in each row.
+        """
+        width = self._width
+        first = self._function(key) % width
+        step = 1 + self._second_function(key) % (width - 1) if width > 1 else 0
+        return [row * width + (first + row * step) % width for row in range(self._depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Counts count more occurrences of key. Returns the key's new estimate.
+        """
+        counters = self._counters
+        estimate = None
+        for idx in self._columns(key):
+            counters[idx] += count
+            if estimate is None or counters[idx] < estimate:
+                estimate = counters[idx]
+        self._total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """
+        Returns the estimated count of key: the smallest of its counters.
+        """
+        counters = self._counters
+        return min(counters[idx] for idx in self._columns(key))
+
+    def error_bound(self) -> int:
+        """
+        Returns e / width * total: with probability 1 - e^-depth, no estimate exceeds its true count by more.
+        """
+        return math.ceil(math.e / self._width * self._total)
+
+    def get_total(self) -> int:
+        """
+        Return number of occurrences counted so far
+        """
+        return self._total
+
+    def get_width(self) -> int:
+        """
+        Return number of counters per row
+        """
+        return self._width
+
+    def get_depth(self) -> int:
+        """
+        Return number of rows
+        """
+        return self._depth
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int, function: callable = hash_function_builtin) -> None:
+        """
+        Initialize a Space-Saving summary that tracks at most capacity keys.
+        Counters live in a HashMap of key -> [count, error]; a key arriving when the summary is full
+        replaces the key with the smallest count m, starting at m + 1 with error m.
+        Every key occurring more than total / capacity times is guaranteed to be tracked, and a tracked
+        key's true count lies in [count - error, count].
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self._capacity = capacity
+        self._counters = HashMap(capacity, function)
+        # room for the one extra key a full summary holds between inserting a newcomer and evicting
+        self._counters.reserve(capacity + 1)
+
+        # (count, key) pairs; an entry whose count no longer matches the key's counter is stale and
+        # skipped when popped, and the heap is rebuilt before stale entries can outgrow the counters
+        self._heap = []
+        self._total = 0
+
+    def add(self, key: str, count: int = 1) -> None:
+        """
+        Counts count more occurrences of key.
+        """
+
+        self._total += count
+        fresh = [0, 0]
+        counter = self._counters.setdefault(key, fresh)
+        if counter is fresh and self._counters.get_size() > self._capacity:
+            # a newcomer to a full summary takes over the smallest counter
+            smallest, victim = self._pop_smallest()
+            self._counters.remove(victim)
+            counter[0] = counter[1] = smallest
+        counter[0] += count
+
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 2 * self._capacity:
+            self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_smallest(self) -> tuple:
+        """
+        Pops and returns (count, key) of the tracked key with the smallest count, skipping stale heap entries.
+        """
+
+        heap = self._heap
+        while True:
+            count, key = heapq.heappop(heap)
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] == count:
+                return count, key
+
+    def estimate(self, key: str) -> tuple:
+        """
+        Returns (count, error) for key: its true count lies in [count - error, count].
+        An untracked key has occurred at most as often as the smallest tracked count (0 while not full).
+        """
+
+        counter = self._counters.get(key)
+        if counter is not None:
+            return counter[0], counter[1]
+        if self._counters.get_size() < self._capacity:
+            return 0, 0
+        smallest = min(counter[0] for counter in self._counters.values())
+        return smallest, smallest
+
+    def top(self, k: int) -> DynamicArray:
+        """
+        Returns a DynamicArray of (key, count, error) for the k tracked keys with the highest counts,
+        highest first.
+        """
+
+        items = [(key, counter[0], counter[1]) for key, counter in self._counters.items()]
+        return DynamicArray(heapq.nsmallest(k, items, key=lambda item: (-item[1], item[0])))
+
+    def get_total(self) -> int:
+        """
+        Return number of occurrences counted so far
+        """
+        return self._total
+
+    def get_capacity(self) -> int:
+        """
+        Return maximum number of tracked keys
+        """
+        return self._capacity
+
+
+def find_mode_streaming(items, capacity: int = 1000, method: str = 'space_saving',
+                        epsilon: float = 0.001, delta: float = 0.01) -> tuple[DynamicArray, int, int]:
+    """
+    Estimates the mode of items (a DynamicArray or any iterable, e.g. a generator) in one pass,
+    in memory bounded by capacity tracked keys rather than by the number of distinct keys.
+    method 'space_saving' uses a SpaceSaving summary; the true count of each reported mode lies in
+    [frequency - error, frequency]. method 'count_min' counts with a CountMinSketch.from_error(epsilon, delta)
+    and keeps the capacity keys with the highest estimates as candidates; each reported frequency
+    overcounts by at most error with probability 1 - delta.
+    Returns a tuple containing the modes da, the estimated frequency, and the error bound.
+    """
+
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    if isinstance(items, DynamicArray):
+        items = as_list(items)
+
+    if method == 'space_saving':
+        summary = SpaceSaving(capacity)
+        for key in items:
+            summary.add(key)
+        top = summary.top(capacity)._data
+        if not top:
+            return DynamicArray(), 0, 0
+        frequency = top[0][1]
+        modes = [item for item in top if item[1] == frequency]
+        return DynamicArray([key for key, _, _ in modes]), frequency, max(error for _, _, error in modes)
+
+    if method == 'count_min':
+        sketch = CountMinSketch.from_error(epsilon, delta)
+        candidates = HashMap(capacity, hash_function_builtin)
+        heap = []
+        for key in items:
+            estimate = sketch.add(key)
+            if candidates.contains_key(key) or candidates.get_size() < capacity:
+                candidates.put(key, estimate)
+                heapq.heappush(heap, (estimate, key))
+            else:
+                # evict the candidate with the smallest (current) estimate if key now beats it
+                while heap[0][0] != candidates.get(heap[0][1]):
+                    heapq.heappop(heap)
+                if estimate > heap[0][0]:
+                    candidates.remove(heapq.heappop(heap)[1])
+                    candidates.put(key, estimate)
+                    heapq.heappush(heap, (estimate, key))
+            if len(heap) > 2 * capacity:
+                heap = [(value, key) for key, value in candidates.items()]
+                heapq.heapify(heap)
+
+        pairs = candidates.get_keys_and_values()._data
+        if not pairs:
+            return DynamicArray(), 0, 0
+        frequency = max(value for _, value in pairs)
+        return DynamicArray([key for key, value in pairs if value == frequency]), frequency, sketch.error_bound()
+
+    raise ValueError("method must be 'space_saving' or 'count_min'")
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCountMinSketch")
+    print("--------------")
+    sketch = CountMinSketch.from_error(0.01, 0.01)
+    for i in range(1000):
+        sketch.add('key' + str(i % 10), 1 + i % 10)
+    print(sketch.get_width(), sketch.get_depth(), sketch.get_total(), sketch.error_bound())
+    print(sketch.estimate('key9'), sketch.estimate('key0'), sketch.estimate('missing'))
+
+    print("\nSpaceSaving")
+    print("-----------")
+    summary = SpaceSaving(3)
+    for key in ['a', 'b', 'a', 'c', 'a', 'd', 'b', 'a', 'e', 'b']:
+        summary.add(key)
+    print(summary.top(3), summary.estimate('a'), summary.estimate('z'))
+
+    print("\nfind_mode_streaming")
+    print("-------------------")
+    da = DynamicArray(["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"])
+    for items, kwargs in ((da, {'capacity': 10}),
+                          (iter(["2", "4", "2", "6", "8", "4", "3", "3"]), {'capacity': 10, 'method': 'count_min'}),
+                          ((str(i % 7) for i in range(1000)), {'capacity': 3})):
+        mode, frequency, error = find_mode_streaming(items, **kwargs)
+        print(f"Mode : {mode}, Frequency: {frequency} (error at most {error})")